@@ -0,0 +1,75 @@
+import nextcord
+from nextcord.ext import commands
+from datetime import datetime, timedelta
+
+from config import *
+from utils.logs import Logger
+from database.db import db
+from utils.antispam import SpamDetector
+from cogs.moderation import format_timedelta
+
+class AntiSpamCog(commands.Cog):
+    """Cog for automatic flood and spam detection"""
+    
+    def __init__(self, bot):
+        self.bot = bot
+        self.logger = Logger(bot)
+        self.detector = SpamDetector(
+            rate=ANTISPAM['RATE'],
+            burst=ANTISPAM['BURST'],
+            window=ANTISPAM['WINDOW'],
+            max_messages=ANTISPAM['MAX_MESSAGES'],
+            max_mentions=ANTISPAM['MAX_MENTIONS'],
+            duplicates=ANTISPAM['DUPLICATES'],
+            duplicate_window=ANTISPAM['DUPLICATE_WINDOW'],
+            max_users=ANTISPAM['MAX_USERS'],
+            idle_seconds=ANTISPAM['IDLE_SECONDS']
+        )
+        self.punishing = set()
+    
+    @commands.Cog.listener()
+    async def on_first_ready(self):
+        print("✅ Anti-spam system loaded")
+    
+    @commands.Cog.listener()
+    async def on_message(self, message: nextcord.Message):
+        """Check every guild message for flood"""
+        if not ANTISPAM['ENABLED'] or message.author.bot or not message.guild:
+            return
+        
+        member = message.author
+        if not isinstance(member, nextcord.Member) or any(role.id in MODERATION_ROLES for role in member.roles):
+            return
+        
+        # @everyone/@here counts as several mentions
+        mentions = len(message.raw_mentions) + len(message.raw_role_mentions) + (5 if message.mention_everyone else 0)
+        reason = self.detector.check(member.id, message.content, mentions)
+        
+        if reason and member.id not in self.punishing:
+            await self._punish(message, member, reason)
+    
+    async def _punish(self, message: nextcord.Message, member: nextcord.Member, reason: str):
+        """Timeout spammer through the regular moderation log path"""
+        self.punishing.add(member.id)
+        try:
+            duration = timedelta(seconds=ANTISPAM['TIMEOUT_SECONDS'])
+            await member.timeout(datetime.utcnow() + duration, reason=f"Анти-спам: {reason}")
+            
+            bot_member = message.guild.me
+            case_id = await db.add_case(
+                "mute", member.id, bot_member.id, f"Анти-спам: {reason}", format_timedelta(duration), {
+                    "target_username": member.name,
+                    "moderator_username": bot_member.name
+                }
+            )
+            await self.logger.log_moderation_action(
+                "mute", member, bot_member, f"Анти-спам: {reason}", format_timedelta(duration), case_id
+            )
+            print(f"✅ Anti-spam timed out {member.name}: {reason}")
+        except Exception as e:
+            print(f"❌ Failed to timeout spammer {member.name}: {e}")
+        finally:
+            self.punishing.discard(member.id)
+
+def setup(bot):
+    bot.add_cog(AntiSpamCog(bot))
\ No newline at end of file
@@ -0,0 +1,334 @@
+import nextcord
+from nextcord.ext import commands
+import re
+from typing import Dict, List, Optional
+
+from config import *
+from utils.embeds import *
+from database.db import db
+from utils.applications import approve_applications, can_review, review_application
+from utils.events import bus, ApplicationEvent
+from utils.timer_wheel import TimerWheel
+from utils.roles import normalize_group_name
+from cogs.moderation import MassActionConfirmView
+
+def board_key(group: str) -> str:
+    """Stable ASCII key of group for custom_ids"""
+    return str(GROUP_ROLES[group])
+
+class ReviewChoiceView(nextcord.ui.View):
+    """Ephemeral approve/reject for applications picked on a board"""
+    
+    def __init__(self, cog: "ApplicationsCog", group: str, user_ids: List[int]):
+        super().__init__(timeout=120)
+        self.cog = cog
+        self.group = group
+        self.user_ids = user_ids
+    
+    @nextcord.ui.button(label="Схвалити", style=nextcord.ButtonStyle.green, emoji="✅")
+    async def approve(self, button: nextcord.ui.Button, interaction: nextcord.Interaction):
+        await self._review(interaction, "approved")
+    
+    @nextcord.ui.button(label="Відхилити", style=nextcord.ButtonStyle.red, emoji="❌")
+    async def reject(self, button: nextcord.ui.Button, interaction: nextcord.Interaction):
+        await self._review(interaction, "rejected")
+    
+    async def _review(self, interaction: nextcord.Interaction, status: str):
+        if status == "approved" and not interaction.guild.get_role(GROUP_ROLES.get(self.group)):
+            await interaction.response.send_message(
+                embed=error_embed("Помилка", f"Роль групи **{self.group}** не знайдена!"),
+                ephemeral=True
+            )
+            return
+        
+        await interaction.response.defer(ephemeral=True)
+        self.stop()
+        
+        done, errors = await self.cog.review_many(interaction, self.group, self.user_ids, status)
+        status_text = "Схвалено" if status == "approved" else "Відхилено"
+        description = f"**{status_text}:** {done}"
+        if errors:
+            description += "\n" + "\n".join(f"• <@{user_id}>: {error}" for user_id, error in errors[:10])
+        
+        embed = warning_embed("Заявки розглянуто", description) if errors else success_embed("Заявки розглянуто", description)
+        await interaction.edit_original_message(embed=embed, view=None)
+
+class BoardView(nextcord.ui.View):
+    """Persistent board controls for one group; options are refreshed with the board"""
+    
+    def __init__(self, cog: "ApplicationsCog", group: str, applications: List[Dict] = None):
+        super().__init__(timeout=None)
+        self.cog = cog
+        self.group = group
+        key = board_key(group)
+        
+        options = [
+            nextcord.SelectOption(
+                label=(application.get('full_name') or application.get('username') or str(application['user_id']))[:100],
+                value=str(application['user_id']),
+                description=f"{application.get('username', '')} · {application['user_id']}"[:100]
+            )
+            for application in applications or []
+        ]
+        
+        self.select = nextcord.ui.Select(
+            custom_id=f"board:{key}:select",
+            placeholder="Оберіть заявки для розгляду",
+            min_values=1,
+            max_values=max(1, len(options)),
+            options=options or [nextcord.SelectOption(label="Немає заявок", value="0")],
+            disabled=not options
+        )
+        self.select.callback = self.on_select
+        self.add_item(self.select)
+        
+        approve_all = nextcord.ui.Button(
+            label="Схвалити всіх",
+            style=nextcord.ButtonStyle.green,
+            emoji="✅",
+            custom_id=f"board:{key}:approve_all",
+            disabled=not options
+        )
+        approve_all.callback = self.on_approve_all
+        self.add_item(approve_all)
+    
+    async def interaction_check(self, interaction: nextcord.Interaction) -> bool:
+        if not can_review(interaction.user):
+            await interaction.response.send_message(
+                embed=error_embed("Помилка доступу", "У вас немає прав для розгляду заявок."),
+                ephemeral=True
+            )
+            return False
+        return True
+    
+    async def on_select(self, interaction: nextcord.Interaction):
+        user_ids = [int(value) for value in self.select.values if value != "0"]
+        if not user_ids:
+            await interaction.response.defer()
+            return
+        
+        await interaction.response.send_message(
+            embed=info_embed(
+                f"Заявки до {self.group}",
+                "\n".join(f"• <@{user_id}>" for user_id in user_ids)
+            ),
+            view=ReviewChoiceView(self.cog, self.group, user_ids),
+            ephemeral=True
+        )
+    
+    async def on_approve_all(self, interaction: nextcord.Interaction):
+        # Bulk approval without the group role would only strip guest roles
+        if not interaction.guild.get_role(GROUP_ROLES.get(self.group)):
+            await interaction.response.send_message(
+                embed=error_embed("Помилка", f"Роль групи **{self.group}** не знайдена!"),
+                ephemeral=True
+            )
+            return
+        
+        total = await db.count_pending_applications(self.group)
+        view = MassActionConfirmView(interaction.user.id)
+        await interaction.response.send_message(
+            embed=warning_embed(
+                "Підтвердження",
+                f"Схвалити всі заявки до **{self.group}**?\n**Заявок:** {total}"
+            ),
+            view=view,
+            ephemeral=True
+        )
+        await view.wait()
+        
+        if not view.confirmed:
+            await interaction.edit_original_message(embed=info_embed("Скасовано", "Заявки не змінено."), view=None)
+            return
+        
+        done, errors = await self.cog.approve_all(interaction, self.group)
+        await interaction.edit_original_message(
+            embed=success_embed("Заявки схвалено", f"**Схвалено:** {done}\n**Помилок:** {len(errors)}"),
+            view=None
+        )
+
+class ApplicationsCog(commands.Cog):
+    """Cog for the pending application board"""
+    
+    def __init__(self, bot):
+        self.bot = bot
+        self.board_timers = TimerWheel()
+        self.boards: Dict[str, Dict] = {}  # group -> {"channel_id", "message_id"}
+        self.ready = False
+        bus.subscribe(ApplicationEvent, self.on_application_event, name="applications.board")
+    
+    def cog_unload(self):
+        bus.unsubscribe(ApplicationEvent, self.on_application_event)
+    
+    @commands.Cog.listener()
+    async def on_first_ready(self):
+        if APPLICATION_BOARD['ENABLED']:
+            await self.setup_boards()
+        print("✅ Applications system loaded")
+    
+    async def setup_boards(self):
+        """Register one persistent view per group and bring every board up to date"""
+        self.ready = True
+        self.boards = await db.get_board_messages()
+        
+        for group in GROUP_ROLES:
+            self.bot.add_view(BoardView(self, group))
+            await self.refresh_board(group)
+    
+    async def on_application_event(self, event: ApplicationEvent):
+        """Event bus subscriber: schedule a coalesced board refresh"""
+        if not APPLICATION_BOARD['ENABLED'] or not self.ready:
+            return
+        self.schedule_refresh(event.group)
+    
+    def schedule_refresh(self, group: str):
+        # Changes during the debounce window join the pending refresh instead of delaying it
+        if group in self.board_timers:
+            return
+        self.board_timers.schedule(group, APPLICATION_BOARD['DEBOUNCE'], lambda: self.refresh_board(group))
+    
+    def render_board(self, group: str, applications: List[Dict], total: int) -> nextcord.Embed:
+        embed = create_embed(f"Заявки до групи {group}")
+        
+        if not applications:
+            embed.description = "Немає заявок на розгляді."
+            return embed
+        
+        lines = [
+            f"`{i}.` <@{application['user_id']}> — {application.get('full_name', '—')} "
+            f"· <t:{int(application['applied_at'].timestamp())}:R>"
+            for i, application in enumerate(applications, 1)
+        ]
+        embed.description = "\n".join(lines)[:4096]
+        footer = f"На розгляді: {total}"
+        if total > len(applications):
+            footer += f" (показано {len(applications)})"
+        embed.set_footer(text=footer)
+        return embed
+    
+    async def refresh_board(self, group: str):
+        """Re-render the board message of group (creates it if missing)"""
+        try:
+            applications = await db.get_pending_applications_page(group, APPLICATION_BOARD['MAX_LISTED'])
+            total = await db.count_pending_applications(group)
+            embed = self.render_board(group, applications, total)
+            view = BoardView(self, group, applications)
+            
+            channel = self.bot.get_channel(CHANNELS['GROUP_APPLICATIONS'])
+            if not channel:
+                return
+            
+            board = self.boards.get(group)
+            if board:
+                try:
+                    await channel.get_partial_message(board['message_id']).edit(embed=embed, view=view)
+                    return
+                except nextcord.NotFound:
+                    pass
+            
+            message = await channel.send(embed=embed, view=view)
+            self.boards[group] = {"channel_id": channel.id, "message_id": message.id}
+            await db.set_board_message(group, channel.id, message.id)
+            
+        except Exception as e:
+            print(f"❌ Failed to refresh application board for {group}: {e}")
+    
+    async def review_many(self, interaction: nextcord.Interaction, group: str, user_ids: List[int],
+                          status: str) -> tuple:
+        """Review picked applications one by one, returns (done, [(user_id, error)])"""
+        done = 0
+        errors = []
+        for user_id in user_ids:
+            try:
+                error = await review_application(self.bot, interaction.user, user_id, group, status)
+            except Exception as e:
+                print(f"❌ Failed to review application of {user_id}: {e}")
+                error = "Сталася помилка при розгляді заявки."
+            if error:
+                errors.append((user_id, error))
+            else:
+                done += 1
+        return done, errors
+    
+    async def approve_all(self, interaction: nextcord.Interaction, group: str) -> tuple:
+        """Approve every pending application of group through the bulk pipeline"""
+        approved, errors = await approve_applications(self.bot, interaction.user, group)
+        return len(approved), errors
+    
+    @commands.group(name="applications", invoke_without_command=True)
+    @commands.has_any_role(*MODERATION_ROLES)
+    async def applications_commands(self, ctx):
+        """
+        Application management commands
+        Usage: !applications <subcommand>
+        """
+        lines = []
+        for group in GROUP_ROLES:
+            total = await db.count_pending_applications(group)
+            if total:
+                lines.append(f"**{group}:** {total}")
+        
+        embed = info_embed(
+            "Заявки на розгляді",
+            ("\n".join(lines) or "Немає заявок на розгляді.") +
+            "\n\n`!applications approve <група> [all|ID...]` - Схвалити заявки масово"
+        )
+        await ctx.send(embed=embed)
+    
+    @applications_commands.command(name="approve")
+    @commands.has_any_role(*MODERATION_ROLES)
+    async def applications_approve(self, ctx, group_name: str, *, targets: str = "all"):
+        """
+        Approve pending applications in bulk
+        Usage: !applications approve <group> [all|user_id...]
+        """
+        try:
+            group = normalize_group_name(group_name)
+            if not group:
+                await ctx.send(
+                    embed=error_embed(
+                        "Помилка",
+                        f"Група **{group_name}** не знайдена!\n"
+                        f"Доступні групи: {', '.join(GROUP_ROLES.keys())}"
+                    )
+                )
+                return
+            
+            user_ids = None
+            if targets.strip().lower() != "all":
+                user_ids = [int(match) for match in re.findall(r"\d{15,20}", targets)]
+                if not user_ids:
+                    await ctx.send(
+                        embed=error_embed("Помилка", "Використання: `!applications approve <група> [all|ID...]`")
+                    )
+                    return
+            
+            total = len(user_ids) if user_ids is not None else await db.count_pending_applications(group)
+            if not total:
+                await ctx.send(embed=info_embed("Заявки", f"Немає заявок на розгляді до **{group}**."))
+                return
+            
+            status = await ctx.send(
+                embed=info_embed("Схвалення заявок", f"**Група:** {group}\n**Заявок:** {total}\nВиконується...")
+            )
+            
+            approved, errors = await approve_applications(self.bot, ctx.author, group, user_ids)
+            
+            description = (
+                f"**Група:** {group}\n"
+                f"**Схвалено:** {len(approved)}\n"
+                f"**Помилок:** {len(errors)}"
+            )
+            if errors:
+                description += "\n" + "\n".join(f"• <@{user_id}>: {error}" for user_id, error in errors[:10])
+            
+            await status.edit(
+                embed=(warning_embed if errors else success_embed)("Схвалення заявок завершено", description)
+            )
+            
+        except Exception as e:
+            print(f"❌ Error in applications approve: {e}")
+            await ctx.send(embed=error_embed("Помилка", "Не вдалося схвалити заявки."))
+
+def setup(bot):
+    bot.add_cog(ApplicationsCog(bot))
\ No newline at end of file
@@ -0,0 +1,110 @@
+import nextcord
+from nextcord.ext import commands
+from datetime import datetime, timedelta
+import re
+from typing import Dict, List, Optional
+
+from config import *
+from utils.embeds import *
+from database.db import db
+from utils.pagination import KeysetPageSource, Paginator
+
+AUDIT_PAGE_SIZE = 10
+
+def parse_audit_query(query: str) -> Optional[Dict]:
+    """Parse 'user:@x action:prefix mod:@y from:YYYY-MM-DD to:YYYY-MM-DD' into search filters"""
+    filters = {}
+
+    for token in query.split():
+        key, sep, value = token.partition(":")
+        if not sep or not value:
+            return None
+        key = key.lower()
+
+        if key in ("user", "mod"):
+            match = re.search(r"\d{15,20}", value)
+            if not match:
+                return None
+            filters["user_id" if key == "user" else "moderator_id"] = int(match.group())
+        elif key == "action":
+            filters["action_prefix"] = value
+        elif key in ("from", "to"):
+            try:
+                date = datetime.strptime(value, "%Y-%m-%d")
+            except ValueError:
+                return None
+            if key == "from":
+                filters["since"] = date
+            else:
+                # Inclusive end date
+                filters["until"] = date + timedelta(days=1)
+        else:
+            return None
+
+    return filters
+
+def render_audit_page(rows: List[Dict], page: int) -> nextcord.Embed:
+    """Build embed for a page of log entries"""
+    embed = create_embed("Журнал аудиту")
+
+    if not rows:
+        embed.description = "Записів не знайдено."
+        return embed
+
+    lines = []
+    for row in rows:
+        line = f"<t:{int(row['timestamp'].timestamp())}:f> `{row['action']}` — <@{row['user_id']}>"
+        if row.get("moderator_id"):
+            line += f" (модератор <@{row['moderator_id']}>)"
+
+        details = row.get("details") or {}
+        if details.get("reason"):
+            line += f"\n↳ {str(details['reason'])[:100]}"
+        lines.append(line)
+
+    embed.description = "\n".join(lines)
+    return embed
+
+class AuditCog(commands.Cog):
+    """Cog for searching the audit log"""
+
+    def __init__(self, bot):
+        self.bot = bot
+
+    @commands.Cog.listener()
+    async def on_first_ready(self):
+        print("✅ Audit system loaded")
+
+    @commands.command(name="audit")
+    @commands.has_any_role(*MODERATION_ROLES)
+    async def audit(self, ctx, *, query: str = ""):
+        """
+        Search the audit log
+        Usage: !audit [user:@user] [action:prefix] [mod:@moderator] [from:YYYY-MM-DD] [to:YYYY-MM-DD]
+        """
+        try:
+            filters = parse_audit_query(query)
+            if filters is None:
+                await ctx.send(
+                    embed=error_embed(
+                        "Помилка",
+                        "Неправильний фільтр!\n"
+                        "Використовуйте: `user:@user`, `action:moderation_`, `mod:@user`, "
+                        "`from:2024-09-01`, `to:2024-09-30`"
+                    )
+                )
+                return
+
+            source = KeysetPageSource(
+                lambda after, limit: db.search_logs(**filters, after=after, limit=limit),
+                key=lambda row: (row["timestamp"], row["_id"]),
+                page_size=AUDIT_PAGE_SIZE
+            )
+            await Paginator(ctx.author.id, source, render_audit_page).send(ctx)
+
+        except Exception as e:
+            print(f"❌ Error in audit command: {e}")
+            await ctx.send(embed=error_embed("Помилка", "Не вдалося виконати пошук у журналі."))
+
+def setup(bot):
+    bot.add_cog(AuditCog(bot))
\ No newline at end of file
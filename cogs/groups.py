@@ -1,11 +1,32 @@
 import nextcord
 from nextcord.ext import commands
-from typing import Optional
+import asyncio
+import codecs
+import csv
+import io
+import tempfile
+from datetime import datetime
+from typing import List, Optional
 
 from config import *
 from utils.embeds import *
 from utils.logs import Logger
 from database.db import db
+from utils.events import bus, RoleUpdateEvent
+from utils.dm_queue import dm_service
+from utils.guild_stats import guild_stats
+from utils.group_index import group_index
+from utils.gateway import ensure_members
+from utils.pagination import ListPageSource, Paginator
+from utils.roles import consume_managed_edit, normalize_group_name, set_group_role
+from utils.rollover import RolloverRunner, parse_rollover_csv, parse_rollover_rules
+from cogs.moderation import MassActionConfirmView
+
+PARTIAL_INDEX_NOTE = "⚠️ Кеш учасників неповний: список може бути неповним."
+PARTIAL_INDEX_ERROR = (
+    "Повний список учасників недоступний у цьому профілі кешу.\n"
+    "Увімкніть `CHUNK_ON_DEMAND` або профіль із завантаженням учасників."
+)
 
 class GroupsCog(commands.Cog):
     """Cog for group management"""
@@ -13,40 +34,77 @@ class GroupsCog(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
         self.logger = Logger(bot)
+        self.rollover = RolloverRunner(bot)
+        bus.subscribe(RoleUpdateEvent, self.sync_group_role, name="groups.sync_group_role")
     
     @commands.Cog.listener()
-    async def on_ready(self):
+    async def on_first_ready(self):
+        self.build_index()
+        await self.rollover.resume_all()
         print("✅ Groups system loaded")
     
-    @commands.Cog.listener()
-    async def on_member_update(self, before, after):
-        """Auto-sync group roles with database"""
-        try:
-            # Check if group roles changed
-            before_group_roles = [role for role in before.roles if role.id in GROUP_ROLES.values()]
-            after_group_roles = [role for role in after.roles if role.id in GROUP_ROLES.values()]
-            
-            if before_group_roles != after_group_roles:
-                # Group role changed
-                if after_group_roles:
-                    # User got a group role
-                    new_group = next(name for name, role_id in GROUP_ROLES.items() 
-                                   if role_id == after_group_roles[0].id)
-                    
-                    # Ensure user exists in database
-                    user_data = await db.get_user(after.id)
-                    if not user_data:
-                        await db.add_user(after.id, after.name, new_group)
-                    else:
-                        await db.update_user_group(after.id, new_group)
-                    
-                    print(f"✅ Auto-synced {after.name} to group {new_group}")
+    def cog_unload(self):
+        bus.unsubscribe(RoleUpdateEvent, self.sync_group_role)
+        self.rollover.stop()
+    
+    def build_index(self):
+        """Build group index from the role cache of the guild with group roles"""
+        role_id = next(iter(GROUP_ROLES.values()))
+        for guild in self.bot.guilds:
+            if guild.get_role(role_id):
+                indexed = group_index.build(guild)
+                if group_index.complete:
+                    print(f"✅ Group index built: {indexed} members")
                 else:
-                    # User lost group role
-                    await db.update_user_group(after.id, None)
-                    print(f"✅ Removed {after.name} from group")
-        except Exception as e:
-            print(f"❌ Error in auto-sync: {e}")
+                    print(f"⚠️ Group index built from a partial member cache: {indexed} members")
+                return
+    
+    async def ensure_index(self, guild: nextcord.Guild) -> bool:
+        """
+        Build the index if needed; with a partial member cache, first request the
+        full member list (CHUNK_ON_DEMAND). Returns whether the index is complete.
+        """
+        if group_index.built and (group_index.complete or not CHUNK_ON_DEMAND):
+            return group_index.complete
+        
+        await ensure_members(guild)
+        group_index.build(guild)
+        return group_index.complete
+    
+    async def _members_of(self, guild: nextcord.Guild, group_name: str) -> List[int]:
+        """Group member ids from the index, sorted for stable output"""
+        await self.ensure_index(guild)
+        return sorted(group_index.members(group_name))
+    
+    @commands.Cog.listener()
+    async def on_member_remove(self, member: nextcord.Member):
+        group_index.remove(member.id)
+    
+    async def sync_group_role(self, event: RoleUpdateEvent):
+        """Event bus subscriber: auto-sync group roles with index and database"""
+        if not event.group_changed:
+            return
+        
+        after = event.member
+        group_index.set_group(after.id, event.new_group)
+        # Bot edits (transfer, approval, rollover) already wrote the database, in bulk where batched
+        if consume_managed_edit(after.id):
+            return
+        
+        if event.new_group:
+            # User got a group role
+            # Ensure user exists in database
+            user_data = await db.get_user(after.id)
+            if not user_data:
+                await db.add_user(after.id, after.name, event.new_group)
+            else:
+                await db.update_user_group(after.id, event.new_group)
+            
+            print(f"✅ Auto-synced {after.name} to group {event.new_group}")
+        else:
+            # User lost group role
+            await db.update_user_group(after.id, None)
+            print(f"✅ Removed {after.name} from group")
     
     @commands.group(name="group", invoke_without_command=True)
     async def group_commands(self, ctx):
@@ -63,7 +121,10 @@ class GroupsCog(commands.Cog):
             "`!group remove @user` - Видалити користувача з групи (Старости/Заступники)\n"
             "`!group stats` - Статистика всіх груп (Старости/Заступники)\n"
             "`!group list` - Список всіх груп\n"
-            "`!group sync` - Синхронізувати ролі з базою даних (Старости/Заступники)"
+            "`!group sync` - Синхронізувати ролі з базою даних (Старости/Заступники)\n"
+            "`!group check` - Перевірити розбіжності ролей і бази даних (Старости/Заступники)\n"
+            "`!group rollover 51>52 56>archive` або CSV - Масове перенесення груп (Старости/Заступники)\n"
+            "`!group export <група|all>` - Вивантажити список групи у CSV (Старости/Заступники)"
         )
         await ctx.send(embed=embed)
     
@@ -91,13 +152,14 @@ class GroupsCog(commands.Cog):
                 return
             
             # Get group members
-            members = await db.get_group_members(group_name)
+            members = await self._members_of(ctx.guild, group_name)
             
             # Get group role
             group_role = ctx.guild.get_role(GROUP_ROLES[group_name])
             
             embed = create_embed(
-                f"Інформація про групу {group_name}"
+                f"Інформація про групу {group_name}",
+                None if group_index.complete else PARTIAL_INDEX_NOTE
             )
             
             embed.add_field(
@@ -120,19 +182,13 @@ class GroupsCog(commands.Cog):
             
             # Show some members
             if members:
-                member_list = []
-                for member_data in members[:10]:
-                    member = ctx.guild.get_member(member_data['user_id'])
-                    if member:
-                        member_list.append(f"• {member.mention}")
-                
-                if member_list:
-                    embed.add_field(
-                        name="Учасники",
-                        value="\n".join(member_list) + 
-                              (f"\n... та ще {len(members) - 10}" if len(members) > 10 else ""),
-                        inline=False
-                    )
+                member_list = [f"• <@{user_id}>" for user_id in members[:10]]
+                embed.add_field(
+                    name="Учасники",
+                    value="\n".join(member_list) + 
+                          (f"\n... та ще {len(members) - 10}" if len(members) > 10 else ""),
+                    inline=False
+                )
             else:
                 embed.add_field(
                     name="Учасники",
@@ -169,11 +225,18 @@ class GroupsCog(commands.Cog):
                 )
                 return
             
-            # Get group members
-            members = await db.get_group_members(group_name)
+            # Page over the index; only the shown page is rendered
+            members = await self._members_of(ctx.guild, group_name)
+            source = ListPageSource(members, page_size=GROUP_MEMBERS_PAGE_SIZE)
+            complete = group_index.complete
             
-            embed = group_stats_embed(group_name, members)
-            await ctx.send(embed=embed)
+            def render(rows: list, page: int) -> nextcord.Embed:
+                embed = group_stats_embed(group_name, len(members), rows, page * source.page_size)
+                if not complete:
+                    embed.description = PARTIAL_INDEX_NOTE
+                return embed
+            
+            await Paginator(ctx.author.id, source, render).send(ctx)
             
         except Exception as e:
             print(f"❌ Error in group members: {e}")
@@ -216,24 +279,14 @@ class GroupsCog(commands.Cog):
             
             old_group = user_data.get('group') if user_data else None
             
-            # Remove all group roles
-            for role_id in GROUP_ROLES.values():
-                role = ctx.guild.get_role(role_id)
-                if role and role in member.roles:
-                    await member.remove_roles(role, reason=f"Перенесення до {group_name} модератором: {ctx.author.name}")
-            
-            # Add new group role
-            new_group_role = ctx.guild.get_role(GROUP_ROLES[group_name])
-            if not new_group_role:
+            if not ctx.guild.get_role(GROUP_ROLES[group_name]):
                 await ctx.send(embed=error_embed("Помилка", "Роль групи не знайдена!"))
                 return
             
-            await member.add_roles(new_group_role, reason=f"Перенесено до групи модератором: {ctx.author.name}")
-            
-            # Remove guest role if exists
-            guest_role = ctx.guild.get_role(ROLES['GUEST'])
-            if guest_role and guest_role in member.roles:
-                await member.remove_roles(guest_role, reason="Додано до групи")
+            # Replace group and guest roles in one edit
+            await set_group_role(
+                member, group_name, reason=f"Перенесено до {group_name} модератором: {ctx.author.name}"
+            )
             
             # Update database (ensure user exists)
             if not user_data:
@@ -242,17 +295,14 @@ class GroupsCog(commands.Cog):
                 await db.update_user_group(member.id, group_name)
             
             # Send DM to user
-            try:
-                dm_embed = success_embed(
-                    "Вас перенесено до іншої групи!",
-                    f"**Сервер:** {ctx.guild.name}\n"
-                    f"**Стара група:** {old_group or 'Немає'}\n"
-                    f"**Нова група:** {group_name}\n"
-                    f"**Модератор:** {ctx.author.name}"
-                )
-                await member.send(embed=dm_embed)
-            except:
-                pass  # Can't send DM
+            dm_embed = success_embed(
+                "Вас перенесено до іншої групи!",
+                f"**Сервер:** {ctx.guild.name}\n"
+                f"**Стара група:** {old_group or 'Немає'}\n"
+                f"**Нова група:** {group_name}\n"
+                f"**Модератор:** {ctx.author.name}"
+            )
+            dm_service.enqueue(member.id, embed=dm_embed)
             
             # Confirm
             embed = success_embed(
@@ -295,30 +345,20 @@ class GroupsCog(commands.Cog):
             
             current_group = user_data['group']
             
-            # Get and remove group role
-            group_role = ctx.guild.get_role(GROUP_ROLES[current_group])
-            if group_role and group_role in member.roles:
-                await member.remove_roles(group_role, reason=f"Видалено з групи модератором: {ctx.author.name}")
-            
-            # Add guest role
-            guest_role = ctx.guild.get_role(ROLES['GUEST'])
-            if guest_role:
-                await member.add_roles(guest_role, reason="Видалено з групи")
+            # Swap group role for guest role in one edit
+            await set_group_role(member, None, reason=f"Видалено з групи модератором: {ctx.author.name}")
             
             # Update database
             await db.update_user_group(member.id, None)
             
             # Send DM to user
-            try:
-                dm_embed = warning_embed(
-                    "Вас видалено з групи",
-                    f"**Сервер:** {ctx.guild.name}\n"
-                    f"**Група:** {current_group}\n"
-                    f"**Модератор:** {ctx.author.name}"
-                )
-                await member.send(embed=dm_embed)
-            except:
-                pass  # Can't send DM
+            dm_embed = warning_embed(
+                "Вас видалено з групи",
+                f"**Сервер:** {ctx.guild.name}\n"
+                f"**Група:** {current_group}\n"
+                f"**Модератор:** {ctx.author.name}"
+            )
+            dm_service.enqueue(member.id, embed=dm_embed)
             
             # Confirm
             embed = success_embed(
@@ -349,6 +389,11 @@ class GroupsCog(commands.Cog):
             synced = 0
             errors = 0
             
+            # Role member lists come from the member cache
+            if not await self.ensure_index(ctx.guild):
+                await ctx.send(embed=error_embed("Помилка", PARTIAL_INDEX_ERROR))
+                return
+            
             # Go through all members with group roles
             for group_name, role_id in GROUP_ROLES.items():
                 role = ctx.guild.get_role(role_id)
@@ -380,6 +425,232 @@ class GroupsCog(commands.Cog):
             print(f"❌ Error in group sync: {e}")
             await ctx.send(embed=error_embed("Помилка", "Не вдалося синхронізувати групи."))
     
+    @group_commands.command(name="check")
+    @commands.has_any_role(*MODERATION_ROLES)
+    async def group_check(self, ctx):
+        """
+        Report divergence between group roles and the database (Moderators only)
+        Usage: !group check
+        """
+        try:
+            # A partial index would report every uncached member as missing its role
+            if not await self.ensure_index(ctx.guild):
+                await ctx.send(embed=error_embed("Помилка", PARTIAL_INDEX_ERROR))
+                return
+            
+            stored = await db.get_group_assignments()
+            report = group_index.compare(stored)
+            
+            sections = [
+                ("only_roles", "Роль є, у базі немає"),
+                ("only_database", "У базі є, ролі немає"),
+                ("mismatched", "Різні групи (роль / база)")
+            ]
+            
+            if not any(report.values()):
+                await ctx.send(embed=success_embed("Перевірка груп", "Ролі та база даних збігаються."))
+                return
+            
+            embed = warning_embed(
+                "Перевірка груп",
+                "\n".join(f"**{title}:** {len(report[key])}" for key, title in sections) +
+                "\n\nВикористайте `!group sync`, щоб оновити базу даних за ролями."
+            )
+            
+            for key, title in sections:
+                entries = report[key]
+                if not entries:
+                    continue
+                lines = [
+                    f"• <@{user_id}>: {role_group or '—'} / {db_group or '—'}"
+                    for user_id, (role_group, db_group) in list(entries.items())[:10]
+                ]
+                if len(entries) > 10:
+                    lines.append(f"... та ще {len(entries) - 10}")
+                embed.add_field(name=title, value="\n".join(lines), inline=False)
+            
+            await ctx.send(embed=embed)
+            
+        except Exception as e:
+            print(f"❌ Error in group check: {e}")
+            await ctx.send(embed=error_embed("Помилка", "Не вдалося перевірити групи."))
+    
+    @group_commands.group(name="rollover", invoke_without_command=True)
+    @commands.has_any_role(*MODERATION_ROLES)
+    async def group_rollover(self, ctx, *, rules: str = ""):
+        """
+        Move many users between groups as a resumable job (Moderators only)
+        Usage: !group rollover 51>52 56>archive | !group rollover + CSV attachment (user_id,group)
+        """
+        try:
+            if ctx.message.attachments:
+                data = await ctx.message.attachments[0].read()
+                items, invalid = parse_rollover_csv(data)
+                if invalid:
+                    shown = ", ".join(map(str, invalid[:20]))
+                    await ctx.send(
+                        embed=error_embed(
+                            "Помилка",
+                            f"Неправильні рядки CSV ({len(invalid)}): {shown}\n"
+                            "Формат рядка: `user_id,група` (порожня група або `archive` - без групи)"
+                        )
+                    )
+                    return
+                source = ctx.message.attachments[0].filename
+            else:
+                mapping = parse_rollover_rules(rules)
+                if not mapping:
+                    await ctx.send(
+                        embed=error_embed(
+                            "Помилка",
+                            "Використання: `!group rollover 51>52 56>archive`\n"
+                            "або прикріпіть CSV з рядками `user_id,група`"
+                        )
+                    )
+                    return
+                
+                if not await self.ensure_index(ctx.guild):
+                    await ctx.send(embed=error_embed("Помилка", PARTIAL_INDEX_ERROR))
+                    return
+                
+                items = [
+                    {"user_id": user_id, "group": new_group}
+                    for old_group, new_group in mapping.items()
+                    for user_id in sorted(group_index.members(old_group))
+                ]
+                source = rules
+            
+            if not items:
+                await ctx.send(embed=warning_embed("Увага", "Немає користувачів для перенесення."))
+                return
+            
+            # Confirm
+            view = MassActionConfirmView(ctx.author.id)
+            confirm = await ctx.send(
+                embed=warning_embed(
+                    "Підтвердження: перенесення груп",
+                    f"**Користувачів:** {len(items)}\n"
+                    f"**Джерело:** {source[:200]}"
+                ),
+                view=view
+            )
+            await view.wait()
+            
+            if not view.confirmed:
+                await confirm.edit(embed=info_embed("Скасовано", "Перенесення груп скасовано."), view=None)
+                return
+            
+            await confirm.delete()
+            job_id = await self.rollover.create(ctx.guild, ctx.channel, ctx.author, items, source)
+            if job_id:
+                await ctx.send(
+                    embed=info_embed(
+                        "Завдання створено",
+                        f"**ID:** `{job_id}`\n"
+                        f"Скасувати: `!group rollover cancel {job_id}`"
+                    )
+                )
+            
+        except Exception as e:
+            print(f"❌ Error in group rollover: {e}")
+            await ctx.send(embed=error_embed("Помилка", "Не вдалося створити завдання перенесення."))
+    
+    @group_rollover.command(name="cancel")
+    @commands.has_any_role(*MODERATION_ROLES)
+    async def group_rollover_cancel(self, ctx, job_id: str):
+        """
+        Cancel a rollover job after its current batch (Moderators only)
+        Usage: !group rollover cancel <job_id>
+        """
+        try:
+            if await self.rollover.cancel(job_id):
+                await ctx.send(embed=success_embed("Скасовано", f"Завдання `{job_id}` буде зупинено."))
+            else:
+                await ctx.send(embed=error_embed("Помилка", f"Активне завдання `{job_id}` не знайдено."))
+            
+        except Exception as e:
+            print(f"❌ Error cancelling rollover: {e}")
+            await ctx.send(embed=error_embed("Помилка", "Не вдалося скасувати завдання."))
+    
+    async def _write_roster_csv(self, rows, buffer) -> int:
+        """Stream roster rows into a binary buffer as CSV, returns row count"""
+        # BOM so spreadsheet apps detect Cyrillic names
+        buffer.write(codecs.BOM_UTF8)
+        
+        # CSV goes to a small text chunk that is encoded into the buffer every cursor batch
+        # (TextIOWrapper over SpooledTemporaryFile needs Python 3.11+)
+        text = io.StringIO()
+        writer = csv.writer(text)
+        writer.writerow(["Група", "ID", "Нікнейм", "ПІБ", "Приєднався", "Заявку схвалено"])
+        
+        count = 0
+        for row in rows:
+            writer.writerow([
+                row.get('group'),
+                str(row['user_id']),
+                row.get('username') or "",
+                row.get('full_name') or "",
+                row['joined_at'].strftime("%Y-%m-%d") if row.get('joined_at') else "",
+                row['approved_at'].strftime("%Y-%m-%d") if row.get('approved_at') else ""
+            ])
+            count += 1
+            if count % 500 == 0:
+                buffer.write(text.getvalue().encode("utf-8"))
+                text.seek(0)
+                text.truncate()
+                # Let the event loop breathe between cursor batches
+                await asyncio.sleep(0)
+        
+        buffer.write(text.getvalue().encode("utf-8"))
+        return count
+    
+    @group_commands.command(name="export")
+    @commands.has_any_role(*MODERATION_ROLES)
+    async def group_export(self, ctx, group_name: str):
+        """
+        Export group roster with full names as CSV (Moderators only)
+        Usage: !group export <group_name|all>
+        """
+        try:
+            if group_name.lower() == "all":
+                group = None
+            else:
+                group = normalize_group_name(group_name)
+                if not group:
+                    await ctx.send(
+                        embed=error_embed(
+                            "Помилка",
+                            f"Група **{group_name}** не знайдена!\n"
+                            f"Доступні групи: {', '.join(GROUP_ROLES.keys())}, all"
+                        )
+                    )
+                    return
+            
+            rows = await db.iter_group_roster(group)
+            
+            with tempfile.SpooledTemporaryFile(max_size=EXPORT_SPOOL_BYTES) as buffer:
+                count = await self._write_roster_csv(rows, buffer)
+                buffer.seek(0)
+                
+                filename = f"{group or 'all'}-{datetime.utcnow():%Y%m%d}.csv"
+                await ctx.send(
+                    embed=success_embed(
+                        "Список групи",
+                        f"**Група:** {group or 'Усі групи'}\n"
+                        f"**Записів:** {count}"
+                    ),
+                    file=nextcord.File(buffer, filename=filename)
+                )
+            
+            await db.log_action("group_export", ctx.author.id, ctx.author.id, {
+                "group": group,
+                "rows": count
+            })
+            
+        except Exception as e:
+            print(f"❌ Error in group export: {e}")
+            await ctx.send(embed=error_embed("Помилка", "Не вдалося вивантажити список групи."))
+    
     @group_commands.command(name="stats")
     @commands.has_any_role(*MODERATION_ROLES)
     async def group_stats(self, ctx):
@@ -395,10 +666,12 @@ class GroupsCog(commands.Cog):
             
             total_members = 0
             
+            if not await self.ensure_index(ctx.guild):
+                embed.description += f"\n{PARTIAL_INDEX_NOTE}"
+            
             # Get stats for each group
             for group_name in GROUP_ROLES.keys():
-                members = await db.get_group_members(group_name)
-                member_count = len(members)
+                member_count = group_index.count(group_name)
                 total_members += member_count
                 
                 # Get role
@@ -474,16 +747,32 @@ class GroupsCog(commands.Cog):
         try:
             guild = ctx.guild
             
-            # Count members by status
-            online = len([m for m in guild.members if m.status == nextcord.Status.online])
-            idle = len([m for m in guild.members if m.status == nextcord.Status.idle])
-            dnd = len([m for m in guild.members if m.status == nextcord.Status.dnd])
-            offline = len([m for m in guild.members if m.status == nextcord.Status.offline])
+            # Counters maintained from gateway events
+            stats = guild_stats.get(guild)
+            online = stats['online']
+            idle = stats['idle']
+            dnd = stats['dnd']
+            offline = stats['offline']
             
-            # Count bots
-            bots = len([m for m in guild.members if m.bot])
+            bots = stats['bots']
             humans = guild.member_count - bots
             
+            # Bot counts need the full member list, statuses need the presences intent
+            if guild.chunked:
+                members_value = (f"**Всього:** {guild.member_count}\n"
+                                 f"**Люди:** {humans}\n"
+                                 f"**Боти:** {bots}")
+            else:
+                members_value = f"**Всього:** {guild.member_count}"
+            
+            if self.bot.intents.presences:
+                statuses_value = (f"🟢 {online}\n"
+                                  f"🟡 {idle}\n"
+                                  f"🔴 {dnd}\n"
+                                  f"⚫ {offline}")
+            else:
+                statuses_value = "Недоступно (presences вимкнено)"
+            
             embed = create_embed(
                 f"Інформація про {guild.name}",
                 f"**Власник:** {guild.owner.mention}\n"
@@ -493,18 +782,13 @@ class GroupsCog(commands.Cog):
             
             embed.add_field(
                 name="👥 Учасники",
-                value=f"**Всього:** {guild.member_count}\n"
-                      f"**Люди:** {humans}\n"
-                      f"**Боти:** {bots}",
+                value=members_value,
                 inline=True
             )
             
             embed.add_field(
                 name="📊 Статуси",
-                value=f"🟢 {online}\n"
-                      f"🟡 {idle}\n"
-                      f"🔴 {dnd}\n"
-                      f"⚫ {offline}",
+                value=statuses_value,
                 inline=True
             )
             
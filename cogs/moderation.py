@@ -1,13 +1,25 @@
 import nextcord
 from nextcord.ext import commands
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
 import re
-from typing import Optional
+import time
+import asyncio
+from typing import List, Optional, Tuple
 
 from config import *
 from utils.embeds import *
 from utils.logs import Logger
 from database.db import db
+from utils.mutes import MuteScheduler, timeout_until
+from utils.workers import RateLimiter, run_pool
+from utils.metrics import LatencyStats
+from utils.dm_queue import dm_service
+from utils.pagination import KeysetPageSource, Paginator
+from utils.gateway import ensure_members
+from utils.events import bus
+
+# How long a moderation command waits for a DM that must precede the action
+DM_TIMEOUT = 3.0
 
 def parse_time(time_string: str) -> Optional[timedelta]:
     """Parse time string to timedelta (e.g., '1h', '30m', '1d')"""
@@ -48,15 +60,90 @@ def format_timedelta(td: timedelta) -> str:
     
     return " ".join(parts) if parts else "менше хвилини"
 
+class MassActionConfirmView(nextcord.ui.View):
+    """Confirmation for mass moderation actions"""
+    
+    def __init__(self, author_id: int):
+        super().__init__(timeout=60)
+        self.author_id = author_id
+        self.confirmed = False
+    
+    async def interaction_check(self, interaction: nextcord.Interaction) -> bool:
+        return interaction.user.id == self.author_id
+    
+    @nextcord.ui.button(
+        label="Підтвердити",
+        style=nextcord.ButtonStyle.danger,
+        emoji="✅"
+    )
+    async def confirm(self, button: nextcord.ui.Button, interaction: nextcord.Interaction):
+        self.confirmed = True
+        await interaction.response.defer()
+        self.stop()
+    
+    @nextcord.ui.button(
+        label="Скасувати",
+        style=nextcord.ButtonStyle.secondary,
+        emoji="❌"
+    )
+    async def cancel(self, button: nextcord.ui.Button, interaction: nextcord.Interaction):
+        await interaction.response.defer()
+        self.stop()
+
+class ClearCancelView(nextcord.ui.View):
+    """Cancel button for a running !clear"""
+    
+    def __init__(self, author_id: int, cancelled: asyncio.Event):
+        super().__init__(timeout=None)
+        self.author_id = author_id
+        self.cancelled = cancelled
+    
+    async def interaction_check(self, interaction: nextcord.Interaction) -> bool:
+        return interaction.user.id == self.author_id
+    
+    @nextcord.ui.button(
+        label="Скасувати",
+        style=nextcord.ButtonStyle.secondary,
+        emoji="⏹️"
+    )
+    async def cancel(self, button: nextcord.ui.Button, interaction: nextcord.Interaction):
+        self.cancelled.set()
+        await interaction.response.defer()
+
 class ModerationCog(commands.Cog):
     """Cog for moderation commands"""
     
     def __init__(self, bot):
         self.bot = bot
         self.logger = Logger(bot)
+        self.mutes = MuteScheduler(bot)
+        self.latency = LatencyStats()
+    
+    def cog_unload(self):
+        self.mutes.stop()
+    
+    async def _open_case(self, action: str, target: nextcord.abc.User, moderator: nextcord.abc.User,
+                         reason: str = None, duration: str = None) -> Optional[int]:
+        """Create the case first so the log entry and confirmation can reference it"""
+        return await db.add_case(action, target.id, moderator.id, reason, duration, {
+            "target_username": target.name,
+            "moderator_username": moderator.name
+        })
+    
+    def _set_case_footer(self, embed: nextcord.Embed, case_id: Optional[int]):
+        if case_id:
+            embed.set_footer(text=f"Справа #{case_id}")
+    
+    async def _run_side_effects(self, command: str, *steps):
+        """Run independent steps concurrently; a failing step does not cancel the others"""
+        results = await asyncio.gather(*steps, return_exceptions=True)
+        for result in results:
+            if isinstance(result, Exception):
+                print(f"❌ Side effect of {command} failed: {result}")
     
     @commands.Cog.listener()
-    async def on_ready(self):
+    async def on_first_ready(self):
+        await self.mutes.load()
         print("✅ Moderation system loaded")
     
     @commands.command(name="ban")
@@ -66,6 +153,10 @@ class ModerationCog(commands.Cog):
         Ban a user from the server
         Usage: !ban @user [reason]
         """
+        with self.latency.measure("ban"):
+            await self._ban(ctx, member, reason)
+    
+    async def _ban(self, ctx, member: nextcord.Member, reason: str):
         try:
             # Check if target is moderator
             if any(role.id in MODERATION_ROLES for role in member.roles):
@@ -81,32 +172,32 @@ class ModerationCog(commands.Cog):
                 )
                 return
             
-            # Send DM to user
-            try:
-                dm_embed = error_embed(
-                    "Ви були забанені",
-                    f"**Сервер:** {ctx.guild.name}\n"
-                    f"**Причина:** {reason}\n"
-                    f"**Модератор:** {ctx.author.name}"
-                )
-                await member.send(embed=dm_embed)
-            except:
-                pass  # Can't send DM
+            # Send DM to user (must happen before the ban)
+            dm_embed = error_embed(
+                "Ви були забанені",
+                f"**Сервер:** {ctx.guild.name}\n"
+                f"**Причина:** {reason}\n"
+                f"**Модератор:** {ctx.author.name}"
+            )
+            await dm_service.send_now(member, dm_embed, timeout=DM_TIMEOUT)
             
             # Ban user
             await member.ban(reason=f"{reason} | Модератор: {ctx.author.name}")
+            case_id = await self._open_case("ban", member, ctx.author, reason)
             
-            # Log action
-            await self.logger.log_moderation_action("ban", member, ctx.author, reason)
-            
-            # Confirm
+            # Log action and confirm concurrently
             embed = success_embed(
                 "Користувач забанений",
                 f"**Користувач:** {member.mention} ({member.name})\n"
                 f"**Причина:** {reason}\n"
                 f"**Модератор:** {ctx.author.mention}"
             )
-            await ctx.send(embed=embed)
+            self._set_case_footer(embed, case_id)
+            await self._run_side_effects(
+                "ban",
+                self.logger.log_moderation_action("ban", member, ctx.author, reason, case_id=case_id),
+                ctx.send(embed=embed)
+            )
             
         except Exception as e:
             print(f"❌ Error in ban command: {e}")
@@ -124,21 +215,21 @@ class ModerationCog(commands.Cog):
             
             # Unban user
             await ctx.guild.unban(user, reason=f"{reason} | Модератор: {ctx.author.name}")
+            case_id = await self._open_case("unban", user, ctx.author, reason)
             
-            # Log action
-            await db.log_action("moderation_unban", user_id, ctx.author.id, {
-                "reason": reason,
-                "moderator_username": ctx.author.name
-            })
-            
-            # Confirm
+            # Log action and confirm concurrently
             embed = success_embed(
                 "Користувач розбанений",
                 f"**Користувач:** {user.name} (ID: {user_id})\n"
                 f"**Причина:** {reason}\n"
                 f"**Модератор:** {ctx.author.mention}"
             )
-            await ctx.send(embed=embed)
+            self._set_case_footer(embed, case_id)
+            await self._run_side_effects(
+                "unban",
+                self.logger.log_moderation_action("unban", user, ctx.author, reason, case_id=case_id),
+                ctx.send(embed=embed)
+            )
             
         except nextcord.NotFound:
             await ctx.send(embed=error_embed("Помилка", "Користувач не знайдений або не забанений."))
@@ -153,6 +244,10 @@ class ModerationCog(commands.Cog):
         Kick a user from the server
         Usage: !kick @user [reason]
         """
+        with self.latency.measure("kick"):
+            await self._kick(ctx, member, reason)
+    
+    async def _kick(self, ctx, member: nextcord.Member, reason: str):
         try:
             # Check if target is moderator
             if any(role.id in MODERATION_ROLES for role in member.roles):
@@ -168,37 +263,221 @@ class ModerationCog(commands.Cog):
                 )
                 return
             
-            # Send DM to user
-            try:
-                dm_embed = warning_embed(
-                    "Ви були викинуті",
-                    f"**Сервер:** {ctx.guild.name}\n"
-                    f"**Причина:** {reason}\n"
-                    f"**Модератор:** {ctx.author.name}"
-                )
-                await member.send(embed=dm_embed)
-            except:
-                pass  # Can't send DM
+            # Send DM to user (must happen before the kick)
+            dm_embed = warning_embed(
+                "Ви були викинуті",
+                f"**Сервер:** {ctx.guild.name}\n"
+                f"**Причина:** {reason}\n"
+                f"**Модератор:** {ctx.author.name}"
+            )
+            await dm_service.send_now(member, dm_embed, timeout=DM_TIMEOUT)
             
             # Kick user
             await member.kick(reason=f"{reason} | Модератор: {ctx.author.name}")
+            case_id = await self._open_case("kick", member, ctx.author, reason)
             
-            # Log action
-            await self.logger.log_moderation_action("kick", member, ctx.author, reason)
-            
-            # Confirm
+            # Log action and confirm concurrently
             embed = success_embed(
                 "Користувач викинутий",
                 f"**Користувач:** {member.mention} ({member.name})\n"
                 f"**Причина:** {reason}\n"
                 f"**Модератор:** {ctx.author.mention}"
             )
-            await ctx.send(embed=embed)
+            self._set_case_footer(embed, case_id)
+            await self._run_side_effects(
+                "kick",
+                self.logger.log_moderation_action("kick", member, ctx.author, reason, case_id=case_id),
+                ctx.send(embed=embed)
+            )
             
         except Exception as e:
             print(f"❌ Error in kick command: {e}")
             await ctx.send(embed=error_embed("Помилка", "Не вдалося викинути користувача."))
     
+    def _parse_mass_targets(self, ctx, args: str) -> Optional[Tuple[List[int], str]]:
+        """Parse '<ids|mentions|joined:10m>... [reason]' into target IDs and reason"""
+        tokens = args.split()
+        target_ids = []
+        
+        while tokens:
+            token = tokens[0]
+            match = re.fullmatch(r"<@!?(\d+)>|(\d{15,20})", token)
+            if match:
+                target_ids.append(int(match.group(1) or match.group(2)))
+            elif token.lower().startswith("joined:"):
+                window = parse_time(token.split(":", 1)[1])
+                if not window:
+                    return None
+                # Members who joined within the window, from the member cache
+                since = datetime.utcnow() - window
+                target_ids.extend(
+                    m.id for m in ctx.guild.members
+                    if m.joined_at and m.joined_at.replace(tzinfo=None) >= since
+                )
+            else:
+                break
+            tokens.pop(0)
+        
+        reason = " ".join(tokens) or "Не вказана"
+        return list(dict.fromkeys(target_ids)), reason
+    
+    def _filter_mass_targets(self, ctx, target_ids: List[int], require_member: bool) -> Tuple[List[int], int]:
+        """Drop moderators, higher roles, the author and the bot"""
+        targets = []
+        skipped = 0
+        
+        for user_id in target_ids:
+            member = ctx.guild.get_member(user_id)
+            
+            if user_id in (ctx.author.id, self.bot.user.id):
+                skipped += 1
+            elif member is None and require_member:
+                skipped += 1
+            elif member and (any(role.id in MODERATION_ROLES for role in member.roles)
+                             or member.top_role >= ctx.author.top_role):
+                skipped += 1
+            else:
+                targets.append(user_id)
+        
+        return targets, skipped
+    
+    async def _mass_action(self, ctx, action: str, args: str):
+        """Ban or kick many users through a rate-limited worker pool"""
+        action_name = "Масовий бан" if action == "ban" else "Масовий кік"
+        
+        # joined:<window> reads the member cache, which may be partial (lean gateway profile)
+        if "joined:" in args.lower() and not await ensure_members(ctx.guild):
+            await ctx.send(
+                embed=warning_embed(
+                    "Увага",
+                    "Кеш учасників неповний: `joined:` враховує лише учасників, "
+                    "що приєдналися після запуску бота."
+                )
+            )
+        
+        parsed = self._parse_mass_targets(ctx, args)
+        if not parsed or not parsed[0]:
+            await ctx.send(
+                embed=error_embed(
+                    "Помилка",
+                    f"Використання: `!mass{action} <ID або @user...> [причина]`\n"
+                    f"або `!mass{action} joined:10m [причина]`"
+                )
+            )
+            return
+        
+        target_ids, reason = parsed
+        targets, skipped = self._filter_mass_targets(ctx, target_ids, require_member=action == "kick")
+        
+        if not targets:
+            await ctx.send(embed=error_embed("Помилка", "Немає користувачів, до яких можна застосувати дію."))
+            return
+        
+        if len(targets) > MASS_MODERATION['MAX_TARGETS']:
+            await ctx.send(
+                embed=error_embed(
+                    "Помилка",
+                    f"Забагато користувачів ({len(targets)}). Максимум: {MASS_MODERATION['MAX_TARGETS']}."
+                )
+            )
+            return
+        
+        # Confirm
+        view = MassActionConfirmView(ctx.author.id)
+        status = await ctx.send(
+            embed=warning_embed(
+                f"Підтвердження: {action_name}",
+                f"**Користувачів:** {len(targets)}\n"
+                f"**Пропущено:** {skipped} (модератори, вищі ролі)\n"
+                f"**Причина:** {reason}"
+            ),
+            view=view
+        )
+        await view.wait()
+        
+        if not view.confirmed:
+            await status.edit(embed=info_embed("Скасовано", "Масову дію скасовано."), view=None)
+            return
+        
+        audit_reason = f"{reason} | Масова дія, модератор: {ctx.author.name}"
+        
+        async def worker(user_id: int):
+            if action == "ban":
+                await ctx.guild.ban(nextcord.Object(id=user_id), reason=audit_reason)
+            else:
+                await ctx.guild.kick(nextcord.Object(id=user_id), reason=audit_reason)
+        
+        last_update = time.monotonic()
+        
+        async def on_progress(done: int, total: int):
+            nonlocal last_update
+            # Throttle status edits, they share the rate limit with the actions
+            if done < total and time.monotonic() - last_update < 2:
+                return
+            last_update = time.monotonic()
+            await status.edit(
+                embed=info_embed(f"{action_name}: виконується", f"Оброблено **{done}/{total}**"),
+                view=None
+            )
+        
+        succeeded, failed = await run_pool(
+            targets,
+            worker,
+            concurrency=MASS_MODERATION['CONCURRENCY'],
+            limiter=RateLimiter(MASS_MODERATION['RATE'], MASS_MODERATION['PER']),
+            on_progress=on_progress
+        )
+        
+        for user_id, error in failed:
+            print(f"❌ Mass {action} failed for {user_id}: {error}")
+        
+        # One reserved case range, one aggregated log entry and one bulk audit insert
+        first_case = await db.add_cases(action, succeeded, ctx.author.id, reason, {
+            "mass": True,
+            "moderator_username": ctx.author.name
+        })
+        await self.logger.log_mass_moderation(
+            action, ctx.author, succeeded, [user_id for user_id, _ in failed], reason, first_case
+        )
+        
+        await status.edit(
+            embed=success_embed(
+                f"{action_name} завершено",
+                f"**Успішно:** {len(succeeded)}\n"
+                f"**Помилок:** {len(failed)}\n"
+                f"**Пропущено:** {skipped}\n"
+                f"**Причина:** {reason}\n"
+                f"**Модератор:** {ctx.author.mention}"
+            ),
+            view=None
+        )
+    
+    @commands.command(name="massban")
+    @commands.has_any_role(*MODERATION_ROLES)
+    async def mass_ban(self, ctx, *, args: str):
+        """
+        Ban many users at once
+        Usage: !massban <user_id...> [reason] | !massban joined:10m [reason]
+        """
+        try:
+            await self._mass_action(ctx, "ban", args)
+        except Exception as e:
+            print(f"❌ Error in massban command: {e}")
+            await ctx.send(embed=error_embed("Помилка", "Не вдалося виконати масовий бан."))
+    
+    @commands.command(name="masskick")
+    @commands.has_any_role(*MODERATION_ROLES)
+    async def mass_kick(self, ctx, *, args: str):
+        """
+        Kick many users at once
+        Usage: !masskick <user_id...> [reason] | !masskick joined:10m [reason]
+        """
+        try:
+            await self._mass_action(ctx, "kick", args)
+        except Exception as e:
+            print(f"❌ Error in masskick command: {e}")
+            await ctx.send(embed=error_embed("Помилка", "Не вдалося виконати масовий кік."))
+    
     @commands.command(name="mute")
     @commands.has_any_role(*MODERATION_ROLES)
     async def mute_user(self, ctx, member: nextcord.Member, duration: str, *, reason: str = "Не вказана"):
@@ -207,6 +486,10 @@ class ModerationCog(commands.Cog):
         Usage: !mute @user <duration> [reason]
         Duration examples: 1h, 30m, 1d, 2h30m
         """
+        with self.latency.measure("mute"):
+            await self._mute(ctx, member, duration, reason)
+    
+    async def _mute(self, ctx, member: nextcord.Member, duration: str, reason: str):
         try:
             # Check if target is moderator
             if any(role.id in MODERATION_ROLES for role in member.roles):
@@ -229,32 +512,21 @@ class ModerationCog(commands.Cog):
             # Calculate unmute time
             unmute_time = datetime.utcnow() + duration_delta
             
-            # Timeout user (Discord native timeout)
-            await member.timeout(unmute_time, reason=f"{reason} | Модератор: {ctx.author.name}")
-            
-            # Save to database
-            await db.update_user_mute(member.id, unmute_time)
+            # Timeout user (Discord native timeout, re-applied in chunks past 28 days)
+            timeout_end = timeout_until(unmute_time)
+            await member.timeout(timeout_end, reason=f"{reason} | Модератор: {ctx.author.name}")
             
-            # Send DM to user
-            try:
-                dm_embed = warning_embed(
-                    "Вас заглушено",
-                    f"**Сервер:** {ctx.guild.name}\n"
-                    f"**Тривалість:** {format_timedelta(duration_delta)}\n"
-                    f"**До:** <t:{int(unmute_time.timestamp())}:F>\n"
-                    f"**Причина:** {reason}\n"
-                    f"**Модератор:** {ctx.author.name}"
-                )
-                await member.send(embed=dm_embed)
-            except:
-                pass  # Can't send DM
+            self.mutes.schedule(member.id, unmute_time, timeout_end)
+            case_id = await self._open_case("mute", member, ctx.author, reason, format_timedelta(duration_delta))
             
-            # Log action
-            await self.logger.log_moderation_action(
-                "mute", member, ctx.author, reason, format_timedelta(duration_delta)
+            dm_embed = warning_embed(
+                "Вас заглушено",
+                f"**Сервер:** {ctx.guild.name}\n"
+                f"**Тривалість:** {format_timedelta(duration_delta)}\n"
+                f"**До:** <t:{int(unmute_time.timestamp())}:F>\n"
+                f"**Причина:** {reason}\n"
+                f"**Модератор:** {ctx.author.name}"
             )
-            
-            # Confirm
             embed = success_embed(
                 "Користувач заглушений",
                 f"**Користувач:** {member.mention} ({member.name})\n"
@@ -263,7 +535,18 @@ class ModerationCog(commands.Cog):
                 f"**Причина:** {reason}\n"
                 f"**Модератор:** {ctx.author.mention}"
             )
-            await ctx.send(embed=embed)
+            self._set_case_footer(embed, case_id)
+            
+            # DM in background; save to database, log and confirm concurrently
+            dm_service.enqueue(member.id, embed=dm_embed)
+            await self._run_side_effects(
+                "mute",
+                db.update_user_mute(member.id, unmute_time),
+                self.logger.log_moderation_action(
+                    "mute", member, ctx.author, reason, format_timedelta(duration_delta), case_id
+                ),
+                ctx.send(embed=embed)
+            )
             
         except Exception as e:
             print(f"❌ Error in mute command: {e}")
@@ -276,34 +559,34 @@ class ModerationCog(commands.Cog):
         Unmute a user
         Usage: !unmute @user
         """
+        with self.latency.measure("unmute"):
+            await self._unmute(ctx, member)
+    
+    async def _unmute(self, ctx, member: nextcord.Member):
         try:
             # Remove timeout
             await member.timeout(None, reason=f"Розглушено модератором: {ctx.author.name}")
+            self.mutes.cancel(member.id)
             
-            # Update database
-            await db.update_user_mute(member.id, None)
-            
-            # Send DM to user
-            try:
-                dm_embed = success_embed(
-                    "Вас розглушено",
-                    f"**Сервер:** {ctx.guild.name}\n"
-                    f"**Модератор:** {ctx.author.name}"
-                )
-                await member.send(embed=dm_embed)
-            except:
-                pass  # Can't send DM
-            
-            # Log action
-            await self.logger.log_moderation_action("unmute", member, ctx.author)
-            
-            # Confirm
+            dm_embed = success_embed(
+                "Вас розглушено",
+                f"**Сервер:** {ctx.guild.name}\n"
+                f"**Модератор:** {ctx.author.name}"
+            )
             embed = success_embed(
                 "Користувач розглушений",
                 f"**Користувач:** {member.mention} ({member.name})\n"
                 f"**Модератор:** {ctx.author.mention}"
             )
-            await ctx.send(embed=embed)
+            
+            # DM in background; update database, log and confirm concurrently
+            dm_service.enqueue(member.id, embed=dm_embed)
+            await self._run_side_effects(
+                "unmute",
+                db.update_user_mute(member.id, None),
+                self.logger.log_moderation_action("unmute", member, ctx.author),
+                ctx.send(embed=embed)
+            )
             
         except Exception as e:
             print(f"❌ Error in unmute command: {e}")
@@ -316,6 +599,10 @@ class ModerationCog(commands.Cog):
         Warn a user
         Usage: !warn @user [reason]
         """
+        with self.latency.measure("warn"):
+            await self._warn(ctx, member, reason)
+    
+    async def _warn(self, ctx, member: nextcord.Member, reason: str):
         try:
             # Check if target is moderator
             if any(role.id in MODERATION_ROLES for role in member.roles):
@@ -324,43 +611,266 @@ class ModerationCog(commands.Cog):
                 )
                 return
             
-            # Add warning to database
-            await db.add_warning(member.id, reason, ctx.author.id)
-            
-            # Get total warnings
-            user_data = await db.get_user(member.id)
-            total_warnings = user_data.get('warnings', 1) if user_data else 1
+            # Add warning to database (returns the new total)
+            total_warnings = await db.add_warning(member.id, reason, ctx.author.id)
+            if total_warnings is None:
+                await ctx.send(embed=error_embed("Помилка", "Не вдалося зберегти попередження."))
+                return
             
-            # Send DM to user
-            try:
-                dm_embed = warning_embed(
-                    "Ви отримали попередження",
-                    f"**Сервер:** {ctx.guild.name}\n"
-                    f"**Причина:** {reason}\n"
-                    f"**Модератор:** {ctx.author.name}\n"
-                    f"**Всього попереджень:** {total_warnings}"
-                )
-                await member.send(embed=dm_embed)
-            except:
-                pass  # Can't send DM
+            case_id = await self._open_case("warn", member, ctx.author, reason)
+            active_warnings = await self._active_warnings(member.id, total_warnings)
+            step = self._escalation_step(active_warnings)
             
-            # Log action
-            await self.logger.log_moderation_action("warn", member, ctx.author, reason)
+            counts = f"**Всього попереджень:** {total_warnings}"
+            if WARNING_POLICY['EXPIRE_DAYS']:
+                counts += f"\n**Активних попереджень:** {active_warnings}"
+            if step:
+                counts += f"\n**Наслідок:** {self._describe_step(step)}"
             
-            # Confirm
+            dm_embed = warning_embed(
+                "Ви отримали попередження",
+                f"**Сервер:** {ctx.guild.name}\n"
+                f"**Причина:** {reason}\n"
+                f"**Модератор:** {ctx.author.name}\n"
+                f"{counts}"
+            )
             embed = warning_embed(
                 "Попередження видано",
                 f"**Користувач:** {member.mention} ({member.name})\n"
                 f"**Причина:** {reason}\n"
                 f"**Модератор:** {ctx.author.mention}\n"
-                f"**Всього попереджень:** {total_warnings}"
+                f"{counts}"
+            )
+            self._set_case_footer(embed, case_id)
+            
+            if step and step[0] == "kick":
+                # DM must arrive before the kick
+                await dm_service.send_now(member, dm_embed, timeout=DM_TIMEOUT)
+            else:
+                dm_service.enqueue(member.id, embed=dm_embed)
+            
+            # Log and confirm concurrently
+            await self._run_side_effects(
+                "warn",
+                self.logger.log_moderation_action("warn", member, ctx.author, reason, case_id=case_id),
+                ctx.send(embed=embed)
             )
-            await ctx.send(embed=embed)
+            
+            if step:
+                await self._escalate(ctx, member, step, active_warnings)
             
         except Exception as e:
             print(f"❌ Error in warn command: {e}")
             await ctx.send(embed=error_embed("Помилка", "Не вдалося видати попередження."))
     
+    async def _active_warnings(self, user_id: int, total_warnings: int) -> int:
+        """Warnings that still count towards escalation"""
+        expire_days = WARNING_POLICY['EXPIRE_DAYS']
+        if not expire_days:
+            return total_warnings
+        
+        # Below the first threshold in total means below it in active count too: skip the query
+        if not WARNING_POLICY['STEPS'] or total_warnings < min(WARNING_POLICY['STEPS']):
+            return total_warnings
+        
+        since = datetime.utcnow() - timedelta(days=expire_days)
+        return await db.count_active_warnings(user_id, since)
+    
+    def _escalation_step(self, active_warnings: int) -> Optional[Tuple[str, Optional[str]]]:
+        """Highest policy step reached by the active warning count"""
+        reached = [threshold for threshold in WARNING_POLICY['STEPS'] if threshold <= active_warnings]
+        return WARNING_POLICY['STEPS'][max(reached)] if reached else None
+    
+    def _describe_step(self, step: Tuple[str, Optional[str]]) -> str:
+        action, duration = step
+        if action == "mute":
+            return f"заглушення на {format_timedelta(parse_time(duration))}"
+        if action == "kick":
+            return "викидання з сервера"
+        return action
+    
+    async def _escalate(self, ctx, member: nextcord.Member, step: Tuple[str, Optional[str]], active_warnings: int):
+        """Apply the policy step on behalf of the bot"""
+        action, duration = step
+        reason = f"Автоматично: {active_warnings} активних попереджень"
+        
+        try:
+            if action == "mute":
+                duration_delta = parse_time(duration)
+                unmute_time = datetime.utcnow() + duration_delta
+                timeout_end = timeout_until(unmute_time)
+                await member.timeout(timeout_end, reason=reason)
+                self.mutes.schedule(member.id, unmute_time, timeout_end)
+                case_id = await self._open_case("mute", member, ctx.guild.me, reason, format_timedelta(duration_delta))
+                
+                await self._run_side_effects(
+                    "escalation",
+                    db.update_user_mute(member.id, unmute_time),
+                    self.logger.log_moderation_action(
+                        "mute", member, ctx.guild.me, reason, format_timedelta(duration_delta), case_id
+                    )
+                )
+            elif action == "kick":
+                await member.kick(reason=reason)
+                case_id = await self._open_case("kick", member, ctx.guild.me, reason)
+                await self.logger.log_moderation_action("kick", member, ctx.guild.me, reason, case_id=case_id)
+            else:
+                print(f"❌ Unknown escalation action: {action}")
+                return
+            
+            print(f"✅ Escalated {member.name}: {action} ({reason})")
+            
+        except Exception as e:
+            print(f"❌ Failed to escalate warnings for {member.name}: {e}")
+            await ctx.send(
+                embed=error_embed("Помилка", f"Не вдалося автоматично застосувати покарання до {member.mention}.")
+            )
+    
+    def _case_embed(self, case: dict) -> nextcord.Embed:
+        action_names = {
+            "ban": "Бан",
+            "kick": "Кік",
+            "mute": "Мут",
+            "unban": "Розбан",
+            "warn": "Попередження"
+        }
+        details = case.get('details', {})
+        
+        embed = info_embed(f"Справа #{case['case_id']}: {action_names.get(case['action'], case['action'])}")
+        embed.add_field(
+            name="Користувач",
+            value=f"<@{case['user_id']}> ({details.get('target_username', case['user_id'])})",
+            inline=True
+        )
+        embed.add_field(
+            name="Модератор",
+            value=f"<@{case['moderator_id']}> ({details.get('moderator_username', case['moderator_id'])})",
+            inline=True
+        )
+        if case.get('duration'):
+            embed.add_field(name="Тривалість", value=case['duration'], inline=True)
+        embed.add_field(name="Причина", value=case.get('reason') or "Не вказана", inline=False)
+        embed.add_field(name="Дата", value=f"<t:{int(case['created_at'].timestamp())}:F>", inline=True)
+        
+        if case.get('edited_at'):
+            embed.add_field(
+                name="Змінено",
+                value=f"<@{case['edited_by']}>, <t:{int(case['edited_at'].timestamp())}:R>",
+                inline=True
+            )
+        return embed
+    
+    @commands.group(name="case", invoke_without_command=True)
+    @commands.has_any_role(*MODERATION_ROLES)
+    async def case_commands(self, ctx, case_id: int):
+        """
+        View moderation case
+        Usage: !case <id>
+        """
+        try:
+            case = await db.get_case(case_id)
+            if not case:
+                await ctx.send(embed=error_embed("Помилка", f"Справу #{case_id} не знайдено."))
+                return
+            
+            await ctx.send(embed=self._case_embed(case))
+            
+        except Exception as e:
+            print(f"❌ Error in case command: {e}")
+            await ctx.send(embed=error_embed("Помилка", "Не вдалося отримати справу."))
+    
+    @case_commands.command(name="edit")
+    @commands.has_any_role(*MODERATION_ROLES)
+    async def case_edit(self, ctx, case_id: int, *, reason: str):
+        """
+        Change moderation case reason
+        Usage: !case edit <id> <reason>
+        """
+        try:
+            case = await db.update_case_reason(case_id, reason, ctx.author.id)
+            if not case:
+                await ctx.send(embed=error_embed("Помилка", f"Справу #{case_id} не знайдено."))
+                return
+            
+            await db.log_action("moderation_case_edit", case['user_id'], ctx.author.id, {
+                "case_id": case_id,
+                "reason": reason,
+                "moderator_username": ctx.author.name
+            })
+            await ctx.send(embed=self._case_embed(case))
+            
+        except Exception as e:
+            print(f"❌ Error in case edit command: {e}")
+            await ctx.send(embed=error_embed("Помилка", "Не вдалося змінити справу."))
+    
+    @commands.command(name="modlatency")
+    @commands.has_any_role(*MODERATION_ROLES)
+    async def moderation_latency(self, ctx):
+        """
+        Show end-to-end latency of moderation commands
+        Usage: !modlatency
+        """
+        summary = self.latency.summary()
+        if not summary:
+            await ctx.send(embed=info_embed("Затримка модерації", "Ще немає даних."))
+            return
+        
+        embed = info_embed("Затримка модерації", "Час виконання команд від виклику до завершення:")
+        for command, stats in sorted(summary.items()):
+            embed.add_field(
+                name=f"!{command}",
+                value=f"**Викликів:** {stats['count']}\n"
+                      f"**Середня:** {stats['avg_ms']:.0f}ms\n"
+                      f"**p95:** {stats['p95_ms']:.0f}ms\n"
+                      f"**Макс:** {stats['max_ms']:.0f}ms",
+                inline=True
+            )
+        await ctx.send(embed=embed)
+    
+    @commands.command(name="dmstats")
+    @commands.has_any_role(*MODERATION_ROLES)
+    async def dm_stats(self, ctx):
+        """
+        Show DM delivery statistics
+        Usage: !dmstats
+        """
+        stats = dm_service.stats
+        embed = info_embed(
+            "Доставка особистих повідомлень",
+            f"**Доставлено:** {stats['delivered']}\n"
+            f"**Не доставлено:** {stats['failed']}\n"
+            f"**У черзі:** {dm_service.queued}\n"
+            f"**Повторних спроб:** {stats['retried']}\n"
+            f"**Пропущено (закриті ОП):** {stats['skipped_closed']}\n"
+            f"**Дублікатів:** {stats['deduplicated']}\n"
+            f"**Відкинуто (черга повна):** {stats['dropped']}"
+        )
+        await ctx.send(embed=embed)
+    
+    @commands.command(name="eventstats")
+    @commands.has_any_role(*MODERATION_ROLES)
+    async def event_stats(self, ctx):
+        """
+        Show event bus subscriber statistics
+        Usage: !eventstats
+        """
+        stats = bus.stats()
+        if not stats:
+            await ctx.send(embed=info_embed("Шина подій", "Немає підписників."))
+            return
+        
+        embed = info_embed("Шина подій", "Обробка подій підписниками:")
+        for name, subscriber in sorted(stats.items()):
+            embed.add_field(
+                name=name,
+                value=f"**Викликів:** {subscriber['calls']}\n"
+                      f"**Помилок:** {subscriber['errors']}\n"
+                      f"**Середня:** {subscriber['avg_ms']:.1f}ms\n"
+                      f"**Макс:** {subscriber['max_ms']:.1f}ms",
+                inline=True
+            )
+        await ctx.send(embed=embed)
+    
     @commands.command(name="warnings")
     @commands.has_any_role(*MODERATION_ROLES)
     async def view_warnings(self, ctx, member: nextcord.Member):
@@ -369,9 +879,9 @@ class ModerationCog(commands.Cog):
         Usage: !warnings @user
         """
         try:
-            warnings = await db.get_user_warnings(member.id)
+            total = await db.count_user_warnings(member.id)
             
-            if not warnings:
+            if not total:
                 await ctx.send(
                     embed=info_embed(
                         "Попередження",
@@ -380,65 +890,220 @@ class ModerationCog(commands.Cog):
                 )
                 return
             
-            embed = create_embed(
-                f"Попередження користувача {member.name}",
-                f"**Всього попереджень:** {len(warnings)}"
-            )
-            embed.set_thumbnail(url=member.display_avatar.url)
+            page_size = 5
             
-            # Show last 5 warnings
-            for i, warning in enumerate(warnings[:5], 1):
-                moderator = ctx.guild.get_member(warning['moderator_id'])
-                mod_name = moderator.name if moderator else "Невідомий"
-                timestamp = warning['timestamp']
-                
-                embed.add_field(
-                    name=f"Попередження #{i}",
-                    value=f"**Причина:** {warning['reason']}\n"
-                          f"**Модератор:** {mod_name}\n"
-                          f"**Дата:** <t:{int(timestamp.timestamp())}:R>",
-                    inline=False
+            def render(warnings: list, page: int) -> nextcord.Embed:
+                embed = create_embed(
+                    f"Попередження користувача {member.name}",
+                    f"**Всього попереджень:** {total}"
                 )
+                embed.set_thumbnail(url=member.display_avatar.url)
+                
+                for i, warning in enumerate(warnings, page * page_size + 1):
+                    moderator = ctx.guild.get_member(warning['moderator_id'])
+                    mod_name = moderator.name if moderator else "Невідомий"
+                    timestamp = warning['timestamp']
+                    
+                    embed.add_field(
+                        name=f"Попередження #{i}",
+                        value=f"**Причина:** {warning['reason']}\n"
+                              f"**Модератор:** {mod_name}\n"
+                              f"**Дата:** <t:{int(timestamp.timestamp())}:R>",
+                        inline=False
+                    )
+                return embed
             
-            if len(warnings) > 5:
-                embed.set_footer(text=f"Показано 5 з {len(warnings)} попереджень")
-            
-            await ctx.send(embed=embed)
+            source = KeysetPageSource(
+                lambda after, limit: db.get_user_warnings_page(member.id, after, limit),
+                key=lambda warning: (warning['timestamp'], warning['_id']),
+                page_size=page_size,
+                total=total
+            )
+            await Paginator(ctx.author.id, source, render).send(ctx)
             
         except Exception as e:
             print(f"❌ Error viewing warnings: {e}")
             await ctx.send(embed=error_embed("Помилка", "Не вдалося отримати попередження."))
     
+    def _parse_clear_filters(self, args: str) -> Optional[dict]:
+        """Parse '!clear' filters: user:@x regex:<pattern> attachments bots after:<date|1h> before:<date|1h>"""
+        filters = {}
+        
+        for token in args.split():
+            key, _, value = token.partition(":")
+            key = key.lower()
+            
+            if key == "attachments":
+                filters["attachments"] = True
+            elif key == "bots":
+                filters["bots"] = True
+            elif key == "user" and value:
+                match = re.search(r"\d{15,20}", value)
+                if not match:
+                    return None
+                filters.setdefault("authors", set()).add(int(match.group()))
+            elif key == "regex" and value:
+                try:
+                    filters["regex"] = re.compile(value, re.IGNORECASE)
+                except re.error:
+                    return None
+            elif key in ("after", "before") and value:
+                moment = self._parse_moment(value)
+                if moment is None:
+                    return None
+                filters[key] = moment
+            else:
+                return None
+        
+        return filters
+    
+    def _parse_moment(self, value: str) -> Optional[datetime]:
+        """YYYY-MM-DD or a duration ago (e.g. 2h), as aware UTC datetime"""
+        try:
+            return datetime.strptime(value, "%Y-%m-%d").replace(tzinfo=timezone.utc)
+        except ValueError:
+            pass
+        delta = parse_time(value)
+        return nextcord.utils.utcnow() - delta if delta else None
+    
+    def _clear_matches(self, message: nextcord.Message, filters: dict) -> bool:
+        if "authors" in filters and message.author.id not in filters["authors"]:
+            return False
+        if filters.get("bots") and not message.author.bot:
+            return False
+        if filters.get("attachments") and not message.attachments:
+            return False
+        if "regex" in filters and not filters["regex"].search(message.content or ""):
+            return False
+        return True
+    
     @commands.command(name="clear")
     @commands.has_any_role(*MODERATION_ROLES)
-    async def clear_messages(self, ctx, amount: int):
+    async def clear_messages(self, ctx, amount: int, *, filters: str = ""):
         """
         Delete messages in channel
-        Usage: !clear <amount>
+        Usage: !clear <amount> [user:@user] [regex:<pattern>] [attachments] [bots] [after:<date|1h>] [before:<date|1h>]
         """
         try:
-            if amount < 1 or amount > 100:
+            if amount < 1 or amount > CLEAR['MAX_AMOUNT']:
                 await ctx.send(
-                    embed=error_embed("Помилка", "Кількість повідомлень має бути від 1 до 100!")
+                    embed=error_embed("Помилка", f"Кількість повідомлень має бути від 1 до {CLEAR['MAX_AMOUNT']}!")
                 )
                 return
             
-            # Delete messages
-            deleted = await ctx.channel.purge(limit=amount + 1)  # +1 for command message
-            
-            # Send confirmation (will auto-delete)
-            embed = success_embed(
-                "Повідомлення видалено",
-                f"Видалено **{len(deleted) - 1}** повідомлень."
-            )
-            msg = await ctx.send(embed=embed)
+            parsed = self._parse_clear_filters(filters)
+            if parsed is None:
+                await ctx.send(
+                    embed=error_embed(
+                        "Помилка",
+                        "Неправильний фільтр! Доступні: `user:@user`, `regex:<шаблон>`, "
+                        "`attachments`, `bots`, `after:2024-09-01` або `after:2h`, `before:...`"
+                    )
+                )
+                return
             
-            # Auto-delete after 5 seconds
-            await msg.delete(delay=5)
+            await self._clear(ctx, amount, parsed)
             
         except Exception as e:
             print(f"❌ Error in clear command: {e}")
             await ctx.send(embed=error_embed("Помилка", "Не вдалося видалити повідомлення."))
+    
+    async def _clear(self, ctx, amount: int, filters: dict):
+        """Stream channel history, bulk-delete recent matches, single-delete old ones"""
+        cancelled = asyncio.Event()
+        view = ClearCancelView(ctx.author.id, cancelled)
+        status = await ctx.send(embed=info_embed("Очищення каналу", "Сканування історії..."), view=view)
+        
+        try:
+            await ctx.message.delete()
+        except nextcord.HTTPException:
+            pass
+        
+        # Bulk delete only accepts messages younger than 14 days
+        bulk_cutoff = nextcord.utils.utcnow() - timedelta(days=14) + timedelta(minutes=5)
+        single_limiter = RateLimiter(CLEAR['OLD_RATE'], CLEAR['OLD_PER'])
+        
+        recent = []
+        scanned = 0
+        matched = 0
+        deleted = 0
+        last_update = time.monotonic()
+        
+        async def flush_recent():
+            nonlocal deleted
+            if not recent:
+                return
+            try:
+                await ctx.channel.delete_messages(recent)
+                deleted += len(recent)
+            except nextcord.HTTPException as e:
+                print(f"❌ Bulk delete failed: {e}")
+            recent.clear()
+        
+        async def report(final: bool = False):
+            nonlocal last_update
+            if not final and time.monotonic() - last_update < 2:
+                return
+            last_update = time.monotonic()
+            await status.edit(
+                embed=info_embed(
+                    "Очищення каналу",
+                    f"**Переглянуто:** {scanned}\n"
+                    f"**Знайдено:** {matched}/{amount}\n"
+                    f"**Видалено:** {deleted}"
+                )
+            )
+        
+        history = ctx.channel.history(
+            limit=CLEAR['SCAN_LIMIT'],
+            before=filters.get("before") or ctx.message,
+            after=filters.get("after"),
+            oldest_first=False
+        )
+        
+        async for message in history:
+            if cancelled.is_set():
+                break
+            
+            scanned += 1
+            if message.id == status.id or not self._clear_matches(message, filters):
+                continue
+            
+            matched += 1
+            if message.created_at > bulk_cutoff:
+                recent.append(message)
+                if len(recent) == 100:
+                    await flush_recent()
+                    await report()
+            else:
+                # Too old for bulk delete: rate-limited single delete
+                await single_limiter.acquire()
+                try:
+                    await message.delete()
+                    deleted += 1
+                except nextcord.HTTPException as e:
+                    print(f"❌ Failed to delete old message {message.id}: {e}")
+                await report()
+            
+            if matched >= amount:
+                break
+        
+        if not cancelled.is_set():
+            await flush_recent()
+        
+        view.stop()
+        title = "Очищення скасовано" if cancelled.is_set() else "Повідомлення видалено"
+        await status.edit(
+            embed=success_embed(
+                title,
+                f"Видалено **{deleted}** повідомлень (переглянуто {scanned})."
+            ),
+            view=None
+        )
+        
+        # Auto-delete after 5 seconds
+        await status.delete(delay=5)
+    
     @commands.command(name="rules")
     async def rules_command(self, ctx):
         """
@@ -0,0 +1,35 @@
+import nextcord
+from nextcord.ext import commands
+
+from config import *
+from utils.guild_stats import guild_stats
+
+class StatsCog(commands.Cog):
+    """Cog feeding the shared guild statistics from gateway events"""
+    
+    def __init__(self, bot):
+        self.bot = bot
+        guild_stats.recount_interval = GUILD_STATS_RECOUNT
+    
+    def cog_unload(self):
+        guild_stats.stop()
+    
+    @commands.Cog.listener()
+    async def on_first_ready(self):
+        guild_stats.start(self.bot)
+        print("✅ Guild stats loaded")
+    
+    @commands.Cog.listener()
+    async def on_member_join(self, member: nextcord.Member):
+        guild_stats.member_join(member)
+    
+    @commands.Cog.listener()
+    async def on_member_remove(self, member: nextcord.Member):
+        guild_stats.member_remove(member)
+    
+    @commands.Cog.listener()
+    async def on_presence_update(self, before: nextcord.Member, after: nextcord.Member):
+        guild_stats.presence_update(before, after)
+
+def setup(bot):
+    bot.add_cog(StatsCog(bot))
\ No newline at end of file
@@ -429,7 +429,7 @@ class VoiceCog(commands.Cog):
         self.temp_channels: Dict[int, Dict] = {}
     
     @commands.Cog.listener()
-    async def on_ready(self):
+    async def on_first_ready(self):
         """Load existing voice channels from database and restore views"""
         print("🔄 Loading voice channels...")
         
@@ -1,11 +1,18 @@
+import asyncio
 import nextcord
 from nextcord.ext import commands
 from typing import Optional
+from datetime import datetime, timedelta
 
 from config import *
 from utils.embeds import *
 from utils.logs import Logger
 from database.db import db
+from utils.applications import can_review, review_application
+from utils.events import bus, ApplicationEvent
+from utils.batching import Batcher
+from utils import funnel
+from cogs.moderation import format_timedelta
 
 class RulesView(nextcord.ui.View):
     """Persistent view for rules acceptance"""
@@ -44,6 +51,8 @@ class RulesView(nextcord.ui.View):
             
             # Add user to database
             await db.add_user(interaction.user.id, interaction.user.name)
+            await db.set_rules_accepted(interaction.user.id)
+            await funnel.record({"accepted": 1}, {"join_accept": [funnel.seconds_between(interaction.user.joined_at)]})
             
             # Send success message
             embed = success_embed(
@@ -156,27 +165,37 @@ class GroupApplicationModal(nextcord.ui.Modal):
                 return
             
             # Add application to database
-            success = await db.add_application(
+            application_id = await db.add_application(
                 interaction.user.id,
                 interaction.user.name,
                 self.group_name,
                 full_name
             )
             
-            if not success:
+            if not application_id:
                 await interaction.response.send_message(
                     embed=error_embed("Помилка", "У вас вже є активна заявка. Зачекайте розгляду."),
                     ephemeral=True
                 )
                 return
             
+            # Users from before funnel tracking have no acceptance time: counted, not timed
+            user_data = await db.get_user(interaction.user.id) or {}
+            await funnel.record(
+                {"applied": 1},
+                {"accept_apply": [funnel.seconds_between(user_data.get('accepted_rules_at'))]}
+            )
+            
+            # Board mode: the group's board message picks the application up
+            bus.publish(ApplicationEvent(interaction.user.id, self.group_name, "pending"))
+            
             # Send application to review channel
             review_channel = interaction.guild.get_channel(CHANNELS['GROUP_APPLICATIONS'])
-            if review_channel:
+            if review_channel and not APPLICATION_BOARD['ENABLED']:
                 embed = group_application_embed(interaction.user, self.group_name, full_name)
                 
-                # Create review buttons
-                view = ApplicationReviewView(interaction.user.id, self.group_name)
+                # Review buttons carry the application id; WelcomeCog.on_interaction handles clicks
+                view = ApplicationReviewView(application_id)
                 
                 # Ping appropriate moderators
                 ping_roles = []
@@ -195,6 +214,8 @@ class GroupApplicationModal(nextcord.ui.Modal):
                     embed=embed,
                     view=view
                 )
+                # Nothing to keep per application: drop the view from the view store
+                view.stop()
             
             # Confirm to user
             await interaction.response.send_message(
@@ -218,113 +239,86 @@ class GroupApplicationModal(nextcord.ui.Modal):
             )
 
 class ApplicationReviewView(nextcord.ui.View):
-    """View for reviewing group applications"""
+    """Review buttons with the application id in custom_id (app:<action>:<id>)"""
     
-    def __init__(self, user_id: int, group: str):
+    def __init__(self, application_id: str, disabled: bool = False):
         super().__init__(timeout=None)
-        self.user_id = user_id
-        self.group = group
+        
+        buttons = [
+            ("approve", "Схвалити", nextcord.ButtonStyle.green, "✅"),
+            ("reject", "Відхилити", nextcord.ButtonStyle.red, "❌")
+        ]
+        for action, label, style, emoji in buttons:
+            self.add_item(nextcord.ui.Button(
+                label=label,
+                style=style,
+                emoji=emoji,
+                custom_id=f"app:{action}:{application_id}",
+                disabled=disabled
+            ))
+
+class WelcomeCog(commands.Cog):
+    """Cog for welcome system and authorization"""
     
-    @nextcord.ui.button(
-        label="Схвалити",
-        style=nextcord.ButtonStyle.green,
-        emoji="✅"
-    )
-    async def approve_application(self, button: nextcord.ui.Button, interaction: nextcord.Interaction):
-        """Approve group application"""
-        await self._handle_review(interaction, "approved")
+    def __init__(self, bot):
+        self.bot = bot
+        self.logger = Logger(bot)
+        self.joins = Batcher(self._flush_joins, JOIN_BATCH['MAX_SIZE'], JOIN_BATCH['MAX_DELAY'])
     
-    @nextcord.ui.button(
-        label="Відхилити",
-        style=nextcord.ButtonStyle.red,
-        emoji="❌"
-    )
-    async def reject_application(self, button: nextcord.ui.Button, interaction: nextcord.Interaction):
-        """Reject group application"""
-        await self._handle_review(interaction, "rejected")
+    def cog_unload(self):
+        # Write out joins that are still waiting
+        asyncio.create_task(self.joins.drain())
+    
+    @commands.Cog.listener()
+    async def on_interaction(self, interaction: nextcord.Interaction):
+        """Dispatch review buttons of every application message, old or new"""
+        if interaction.type != nextcord.InteractionType.component:
+            return
+        
+        custom_id = (interaction.data or {}).get("custom_id", "")
+        if not custom_id.startswith("app:"):
+            return
+        
+        _, action, application_id = custom_id.split(":", 2)
+        status = {"approve": "approved", "reject": "rejected"}.get(action)
+        if status:
+            await self._handle_review(interaction, application_id, status)
     
-    async def _handle_review(self, interaction: nextcord.Interaction, status: str):
+    async def _handle_review(self, interaction: nextcord.Interaction, application_id: str, status: str):
         """Handle application review"""
         try:
             # Check if user has moderation permissions
-            user_roles = [role.id for role in interaction.user.roles]
-            if not any(role in MODERATION_ROLES for role in user_roles):
+            if not can_review(interaction.user):
                 await interaction.response.send_message(
                     embed=error_embed("Помилка доступу", "У вас немає прав для розгляду заявок."),
                     ephemeral=True
                 )
                 return
             
-            # Get the applicant
-            applicant = interaction.guild.get_member(self.user_id)
-            if not applicant:
-                await interaction.response.send_message(
-                    embed=error_embed("Помилка", "Користувач не знайдений на сервері."),
-                    ephemeral=True
-                )
-                return
-            
-            # Update application status in database
-            success = await db.update_application_status(
-                self.user_id, 
-                self.group, 
-                status, 
-                interaction.user.id
-            )
+            # Review runs role edits, database writes and logging: acknowledge within Discord's 3 seconds first
+            await interaction.response.defer()
             
-            if not success:
-                await interaction.response.send_message(
-                    embed=error_embed("Помилка", "Не вдалося оновити статус заявки."),
+            application = await db.get_application(application_id)
+            if not application:
+                await interaction.followup.send(
+                    embed=error_embed("Помилка", "Заявку не знайдено."),
                     ephemeral=True
                 )
                 return
             
-            if status == "approved":
-                # Remove other group roles first (якщо є)
-                for role_id in GROUP_ROLES.values():
-                    role = interaction.guild.get_role(role_id)
-                    if role and role in applicant.roles:
-                        await applicant.remove_roles(role, reason=f"Переміщення до {self.group}")
-                
-                # Add group role
-                group_role = interaction.guild.get_role(GROUP_ROLES[self.group])
-                if group_role:
-                    await applicant.add_roles(group_role, reason=f"Заявка схвалена {interaction.user.name}")
-                    
-                    # Ensure user exists in database, then update group
-                    user_data = await db.get_user(self.user_id)
-                    if not user_data:
-                        await db.add_user(self.user_id, applicant.name, self.group)
-                    else:
-                        await db.update_user_group(self.user_id, self.group)
-                
-                # Remove guest role
-                guest_role = interaction.guild.get_role(ROLES['GUEST'])
-                if guest_role and guest_role in applicant.roles:
-                    await applicant.remove_roles(guest_role, reason="Додано до групи")
-                
-                # Send DM to user
-                try:
-                    embed = success_embed(
-                        "Заявка схвалена!",
-                        f"Вітаємо! Ваша заявка до групи **{self.group}** була схвалена.\n"
-                        f"Тепер ви маєте доступ до всіх каналів групи."
-                    )
-                    await applicant.send(embed=embed)
-                except:
-                    pass  # Can't send DM
+            if application['status'] != "pending":
+                # Already handled elsewhere (board, bulk approval): just retire the buttons
+                view = ApplicationReviewView(application_id, disabled=True)
+                await interaction.edit_original_message(view=view)
+                view.stop()
+                return
             
-            else:  # rejected
-                # Send DM to user
-                try:
-                    embed = error_embed(
-                        "Заявка відхилена",
-                        f"На жаль, ваша заявка до групи **{self.group}** була відхилена.\n"
-                        f"Для отримання додаткової інформації звертайтеся до адміністрації."
-                    )
-                    await applicant.send(embed=embed)
-                except:
-                    pass  # Can't send DM
+            error = await review_application(
+                interaction.client, interaction.user, application['user_id'], application['group'], status
+            )
+            if error:
+                await interaction.followup.send(embed=error_embed("Помилка", error), ephemeral=True)
+                return
             
             # Update embed and disable buttons
             status_text = "схвалена" if status == "approved" else "відхилена"
@@ -339,17 +333,9 @@ class ApplicationReviewView(nextcord.ui.View):
             )
             embed.color = 0x00FF00 if status == "approved" else 0xFF0000
             
-            # Disable all buttons
-            for item in self.children:
-                item.disabled = True
-            
-            await interaction.response.edit_message(embed=embed, view=self)
-            
-            # Log the review
-            logger = Logger(interaction.client)
-            await logger.log_application_reviewed(
-                self.user_id, self.group, status, interaction.user
-            )
+            view = ApplicationReviewView(application_id, disabled=True)
+            await interaction.edit_original_message(embed=embed, view=view)
+            view.stop()
             
         except Exception as e:
             print(f"❌ Error in application review: {e}")
@@ -366,17 +352,10 @@ class ApplicationReviewView(nextcord.ui.View):
                     embed=error_embed("Помилка", "Сталася помилка при розгляді заявки."),
                     ephemeral=True
                 )
-
-class WelcomeCog(commands.Cog):
-    """Cog for welcome system and authorization"""
-    
-    def __init__(self, bot):
-        self.bot = bot
-        self.logger = Logger(bot)
     
     @commands.Cog.listener()
-    async def on_ready(self):
-        """Setup persistent views when bot is ready"""
+    async def on_first_ready(self):
+        """Setup persistent views once, on the first ready"""
         print("🔄 Setting up persistent views...")
         
         # Add persistent views
@@ -388,15 +367,16 @@ class WelcomeCog(commands.Cog):
     @commands.Cog.listener()
     async def on_member_join(self, member):
         """Handle new member join"""
-        try:
-            # Add to database
-            await db.add_user(member.id, member.name)
-            
-            # Log join
-            await self.logger.log_user_join(member)
-            
-        except Exception as e:
-            print(f"❌ Error handling member join: {e}")
+        # Join waves are written and logged in batches
+        self.joins.add(member)
+    
+    async def _flush_joins(self, members: list):
+        """Add a batch of joined members to the database and log them"""
+        # The same member may rejoin within one batch
+        members = list({member.id: member for member in members}.values())
+        await db.bulk_add_users([(member.id, member.name) for member in members])
+        await funnel.record({"joined": len(members)})
+        await self.logger.log_user_joins(members)
     
     @commands.Cog.listener() 
     async def on_member_remove(self, member):
@@ -406,6 +386,71 @@ class WelcomeCog(commands.Cog):
         except Exception as e:
             print(f"❌ Error handling member leave: {e}")
     
+    @commands.command(name="joinstats")
+    @commands.has_any_role(*MODERATION_ROLES)
+    async def join_stats(self, ctx):
+        """
+        Show join ingestion statistics
+        Usage: !joinstats
+        """
+        stats = self.joins.summary()
+        embed = info_embed(
+            "Обробка приєднань",
+            f"**Приєднань:** {stats['items']}\n"
+            f"**Пакетів запису:** {stats['batches']}\n"
+            f"**Середній пакет:** {stats['avg_batch']:.1f}\n"
+            f"**Найбільший пакет:** {stats['max_batch']}\n"
+            f"**Очікують запису:** {len(self.joins)}\n"
+            f"**Помилок:** {stats['errors']}\n"
+            f"**Час запису:** {stats['flush_time'] * 1000:.0f}ms"
+        )
+        await ctx.send(embed=embed)
+    
+    @commands.command(name="funnel")
+    @commands.has_any_role(*MODERATION_ROLES)
+    async def funnel_stats(self, ctx, days: int = 7):
+        """
+        Show onboarding funnel for the last days (from daily counters)
+        Usage: !funnel [днів]
+        """
+        days = max(1, min(days, 90))
+        today = datetime.utcnow()
+        summary = funnel.summarize(await db.get_funnel_days(
+            funnel.day_key(today - timedelta(days=days - 1)),
+            funnel.day_key(today)
+        ))
+        counts = summary['counts']
+        
+        def share(stage: str, base: str) -> str:
+            return f" ({counts[stage] / counts[base] * 100:.0f}%)" if counts[base] else ""
+        
+        embed = info_embed(
+            f"Воронка адаптації за {days} дн.",
+            f"**Приєдналися:** {counts['joined']}\n"
+            f"**Погодились з правилами:** {counts['accepted']}{share('accepted', 'joined')}\n"
+            f"**Подали заявку:** {counts['applied']}{share('applied', 'accepted')}\n"
+            f"**Схвалено:** {counts['approved']}{share('approved', 'applied')}\n"
+            f"**Відхилено:** {counts['rejected']}{share('rejected', 'applied')}"
+        )
+        
+        names = {
+            "join_accept": "Приєднання → правила",
+            "accept_apply": "Правила → заявка",
+            "apply_review": "Заявка → розгляд"
+        }
+        for transition in funnel.TRANSITIONS:
+            stats = summary['latency'][transition]
+            if not stats['count']:
+                value = "Немає даних"
+            else:
+                value = (f"**Вибірка:** {stats['count']}\n"
+                         f"**Середнє:** {format_timedelta(stats['avg'])}\n"
+                         f"**Медіана:** ≤ {stats['p50']}\n"
+                         f"**p90:** ≤ {stats['p90']}")
+            embed.add_field(name=names[transition], value=value, inline=True)
+        
+        await ctx.send(embed=embed)
+    
     @commands.command(name="setup_rules")
     @commands.has_any_role(*MODERATION_ROLES)
     async def setup_rules_message(self, ctx):
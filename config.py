@@ -44,9 +44,113 @@ GROUP_ROLES = {
     'ІП-о51': ROLES['IP_O51']
 }
 
+# Reverse mapping: role ID -> group name
+ROLE_GROUPS = {role_id: name for name, role_id in GROUP_ROLES.items()}
+
 # Moderation roles (who can use moderation commands)
 MODERATION_ROLES = [ROLES['STAROSTA'], ROLES['ZASTUPNYK']]
 
+# Mass moderation (raid response)
+MASS_MODERATION = {
+    'MAX_TARGETS': 500,
+    'CONCURRENCY': 4,  # Parallel ban/kick requests
+    'RATE': 5,  # Requests per PER seconds, shared by all workers
+    'PER': 1.0
+}
+
+# Warning escalation: highest step reached by the active warning count is applied
+WARNING_POLICY = {
+    'EXPIRE_DAYS': 30,  # Warnings older than this stop counting (None = never expire)
+    'STEPS': {
+        3: ('mute', '1h'),
+        5: ('kick', None)
+    }
+}
+
+# !clear limits
+CLEAR = {
+    'MAX_AMOUNT': 10000,  # Messages deleted per command
+    'SCAN_LIMIT': 50000,  # Messages of history scanned per command
+    'OLD_RATE': 1,  # Single deletes (older than 14 days) per OLD_PER seconds
+    'OLD_PER': 1.2
+}
+
+# Automatic anti-spam
+ANTISPAM = {
+    'ENABLED': True,
+    'RATE': 1.0,  # Sustained messages per second
+    'BURST': 8,  # Messages allowed in a quick burst
+    'WINDOW': 30,  # Sliding window, seconds
+    'MAX_MESSAGES': 20,  # Messages per window
+    'MAX_MENTIONS': 10,  # Mentions per window
+    'DUPLICATES': 4,  # Identical messages allowed within DUPLICATE_WINDOW
+    'DUPLICATE_WINDOW': 60,
+    'TIMEOUT_SECONDS': 600,  # Timeout applied when triggered
+    'MAX_USERS': 10000,  # Tracked users before oldest are evicted
+    'IDLE_SECONDS': 300  # Users idle this long are evicted
+}
+
+# Application review board: one live message per group instead of a message per application
+APPLICATION_BOARD = {
+    'ENABLED': False,
+    'DEBOUNCE': 5,  # Seconds to coalesce board edits after changes
+    'MAX_LISTED': 25  # Applications shown per board (select menu limit)
+}
+
+# Bulk application approval
+APPLICATIONS_BULK = {
+    'CONCURRENCY': 3,  # Parallel role edits
+    'RATE': 5,  # Role edits per PER seconds
+    'PER': 1.0
+}
+
+# Group rollover jobs (semester reassignment)
+ROLLOVER = {
+    'BATCH_SIZE': 50,  # Members per checkpoint
+    'CONCURRENCY': 3,  # Parallel role edits
+    'RATE': 5,  # Role edits per PER seconds
+    'PER': 1.0
+}
+
+# Join-wave ingestion: joins are written and logged in batches
+JOIN_BATCH = {
+    'MAX_SIZE': 100,  # Flush as soon as this many joins are waiting
+    'MAX_DELAY': 3.0  # Seconds after the first waiting join
+}
+
+# Listings
+GROUP_MEMBERS_PAGE_SIZE = 20
+EXPORT_SPOOL_BYTES = 1024 * 1024  # Roster exports spill to a temp file above this size
+
+# Gateway intents and member cache profile (the GATEWAY_PROFILE env variable overrides it).
+# Profiles vary presences and startup chunking only. Member cache flags stay at joined + voice:
+# voice channels need voice members, and reviews, rollover and mass actions look members up
+# with get_member, so members seen since startup must stay cached.
+GATEWAY_PROFILE = "standard"
+GATEWAY_PROFILES = {
+    # Everything, presences included (status counts in !serverinfo)
+    'full': {'PRESENCES': True, 'CHUNK_AT_STARTUP': True},
+    # No presences: the largest share of gateway traffic and memory; full member list kept
+    'standard': {'PRESENCES': False, 'CHUNK_AT_STARTUP': True},
+    # Only members seen since startup (joins, voice, events); commands fetch the rest on demand
+    'lean': {'PRESENCES': False, 'CHUNK_AT_STARTUP': False}
+}
+CHUNK_ON_DEMAND = True  # Request the full member list when a command needs it and the cache is partial
+
+# Guild statistics
+GUILD_STATS_RECOUNT = 600  # Seconds between full member recounts (corrects counter drift)
+
+# Logging
+EDIT_LOG_DEBOUNCE = 30  # Seconds to collapse repeated edits of one message
+
+# Local JSONL audit log (in addition to the LOG channel and MongoDB)
+AUDIT_LOG = {
+    'ENABLED': True,
+    'DIR': 'audit_logs',
+    'MAX_BYTES': 10 * 1024 * 1024,  # Rotate segment at 10 MB
+    'ROTATE_SECONDS': 86400  # ...or once a day
+}
+
 # Welcome message for rules channel
 RULES_MESSAGE = f"""
 {AXOLOTL_EMOJI} **Ласкаво просимо на сервер потоку ІП-5x!** {AXOLOTL_EMOJI}
@@ -1,15 +1,17 @@
 import os
-from pymongo import MongoClient
+import re
+from pymongo import MongoClient, ReturnDocument, UpdateOne
+from bson import ObjectId
 from datetime import datetime
 import asyncio
-from typing import Optional, Dict, List
+from typing import Optional, Dict, List, Tuple
 
 class Database:
     def __init__(self):
         self.client = None
         self.db = None
         
-    async def connect(self):
+    async def connect(self) -> bool:
         """Connect to MongoDB"""
         try:
             mongodb_uri = os.getenv('MONGODB_URI', 'mongodb://localhost:27017/')
@@ -18,22 +20,29 @@ class Database:
             self.client = MongoClient(mongodb_uri)
             self.db = self.client[database_name]
             
-            # Test connection
-            self.client.admin.command('ping')
+            # Test connection in a thread so startup can load cogs meanwhile
+            await asyncio.to_thread(self.client.admin.command, 'ping')
             print("✅ Successfully connected to MongoDB")
-            
-            # Create indexes
-            await self._create_indexes()
+            return True
             
         except Exception as e:
             print(f"❌ Failed to connect to MongoDB: {e}")
+            return False
+    
+    async def create_indexes(self):
+        """Ensure indexes in a thread (create_index is a no-op for existing ones)"""
+        await asyncio.to_thread(self._create_indexes)
             
-    async def _create_indexes(self):
+    def _create_indexes(self):
         """Create database indexes for better performance"""
         try:
             # Users collection indexes
             self.db.users.create_index("user_id", unique=True)
             self.db.users.create_index("group")
+            self.db.users.create_index(
+                "muted_until",
+                partialFilterExpression={"muted_until": {"$type": "date"}}
+            )
             
             # Voice channels collection indexes  
             self.db.voice_channels.create_index("channel_id", unique=True)
@@ -43,28 +52,54 @@ class Database:
             self.db.applications.create_index("user_id")
             self.db.applications.create_index("group")
             self.db.applications.create_index("status")
+            self.db.applications.create_index([("user_id", 1), ("status", 1), ("reviewed_at", -1)])
+            self.db.applications.create_index([("status", 1), ("group", 1), ("applied_at", 1)])
+            
+            # Application board messages
+            self.db.boards.create_index("group", unique=True)
+            
+            # Cases collection indexes
+            self.db.cases.create_index("case_id", unique=True)
+            self.db.cases.create_index([("user_id", 1), ("case_id", -1)])
+            
+            # Warnings collection indexes (history and decaying count per user)
+            self.db.warnings.create_index([("user_id", 1), ("timestamp", -1)])
+            
+            # Jobs collection indexes (resume on startup)
+            self.db.jobs.create_index("status")
+            
+            # Logs collection indexes (audit search, newest first with _id tie-break)
+            self.db.logs.create_index([("timestamp", -1), ("_id", -1)])
+            self.db.logs.create_index([("user_id", 1), ("timestamp", -1), ("_id", -1)])
+            self.db.logs.create_index([("action", 1), ("timestamp", -1), ("_id", -1)])
+            self.db.logs.create_index([("moderator_id", 1), ("timestamp", -1), ("_id", -1)])
             
             print("✅ Database indexes created successfully")
         except Exception as e:
             print(f"❌ Failed to create indexes: {e}")
 
     # User Management
+    def _new_user_fields(self, group: str = None) -> Dict:
+        """Defaults written only when the user document is created"""
+        fields = {
+            "joined_at": datetime.utcnow(),
+            "warnings": 0,
+            "muted_until": None
+        }
+        if group is None:
+            fields.update({"group": None, "is_guest": True})
+        return fields
+    
     async def add_user(self, user_id: int, username: str, group: str = None) -> bool:
-        """Add new user to database"""
+        """Add new user to database; a returning user keeps group, warnings and mute"""
         try:
-            user_data = {
-                "user_id": user_id,
-                "username": username,
-                "group": group,
-                "joined_at": datetime.utcnow(),
-                "is_guest": group is None,
-                "warnings": 0,
-                "muted_until": None
-            }
+            update = {"username": username}
+            if group is not None:
+                update.update({"group": group, "is_guest": False})
             
             result = self.db.users.update_one(
                 {"user_id": user_id},
-                {"$set": user_data},
+                {"$set": update, "$setOnInsert": self._new_user_fields(group)},
                 upsert=True
             )
             return True
@@ -72,6 +107,37 @@ class Database:
             print(f"❌ Failed to add user {user_id}: {e}")
             return False
     
+    async def bulk_add_users(self, users: List[Tuple[int, str]]) -> bool:
+        """Add many (user_id, username) pairs in one bulk write"""
+        if not users:
+            return True
+        try:
+            defaults = self._new_user_fields()
+            self.db.users.bulk_write([
+                UpdateOne(
+                    {"user_id": user_id},
+                    {"$set": {"username": username}, "$setOnInsert": defaults},
+                    upsert=True
+                )
+                for user_id, username in users
+            ], ordered=False)
+            return True
+        except Exception as e:
+            print(f"❌ Failed to bulk add {len(users)} users: {e}")
+            return False
+    
+    async def set_rules_accepted(self, user_id: int) -> bool:
+        """Remember when user accepted the rules"""
+        try:
+            self.db.users.update_one(
+                {"user_id": user_id},
+                {"$set": {"accepted_rules_at": datetime.utcnow()}}
+            )
+            return True
+        except Exception as e:
+            print(f"❌ Failed to set rules acceptance for user {user_id}: {e}")
+            return False
+    
     async def get_user(self, user_id: int) -> Optional[Dict]:
         """Get user from database"""
         try:
@@ -106,6 +172,73 @@ class Database:
             print(f"❌ Failed to get group members for {group}: {e}")
             return []
     
+    async def get_group_assignments(self) -> Dict[int, str]:
+        """Map user_id -> group for every user with a group"""
+        try:
+            cursor = self.db.users.find({"group": {"$ne": None}}, {"user_id": 1, "group": 1, "_id": 0})
+            return {user_data['user_id']: user_data['group'] for user_data in cursor}
+        except Exception as e:
+            print(f"❌ Failed to get group assignments: {e}")
+            return {}
+    
+    async def iter_group_roster(self, group: str = None, batch_size: int = 500):
+        """
+        Cursor over group members joined with the full name of their latest approved application.
+        Rows are streamed in batches, never materialised as a list.
+        """
+        try:
+            match = {"group": group} if group else {"group": {"$ne": None}}
+            pipeline = [
+                {"$match": match},
+                {"$sort": {"group": 1, "user_id": 1}},
+                {"$lookup": {
+                    "from": "applications",
+                    "let": {"user_id": "$user_id", "group": "$group"},
+                    "pipeline": [
+                        {"$match": {"$expr": {"$and": [
+                            {"$eq": ["$user_id", "$$user_id"]},
+                            {"$eq": ["$status", "approved"]},
+                            {"$eq": ["$group", "$$group"]}
+                        ]}}},
+                        {"$sort": {"reviewed_at": -1}},
+                        {"$limit": 1},
+                        {"$project": {"_id": 0, "full_name": 1, "reviewed_at": 1}}
+                    ],
+                    "as": "application"
+                }},
+                {"$project": {
+                    "_id": 0,
+                    "group": 1,
+                    "user_id": 1,
+                    "username": 1,
+                    "joined_at": 1,
+                    "full_name": {"$arrayElemAt": ["$application.full_name", 0]},
+                    "approved_at": {"$arrayElemAt": ["$application.reviewed_at", 0]}
+                }}
+            ]
+            return self.db.users.aggregate(pipeline, batchSize=batch_size, allowDiskUse=True)
+        except Exception as e:
+            print(f"❌ Failed to export roster for {group or 'all groups'}: {e}")
+            return iter(())
+    
+    async def bulk_update_user_groups(self, assignments: List[Tuple[int, Optional[str]]]) -> bool:
+        """Set group for many users in one bulk write (None makes user a guest)"""
+        if not assignments:
+            return True
+        try:
+            self.db.users.bulk_write([
+                UpdateOne(
+                    {"user_id": user_id},
+                    {"$set": {"group": group, "is_guest": group is None}},
+                    upsert=True
+                )
+                for user_id, group in assignments
+            ], ordered=False)
+            return True
+        except Exception as e:
+            print(f"❌ Failed to bulk update user groups: {e}")
+            return False
+    
     async def update_user_mute(self, user_id: int, mute_until: datetime) -> bool:
         """Update user mute status"""
         try:
@@ -117,6 +250,29 @@ class Database:
         except Exception as e:
             print(f"❌ Failed to update mute for user {user_id}: {e}")
             return False
+    
+    async def get_pending_mutes(self) -> List[Dict]:
+        """Get all users with a stored mute deadline"""
+        try:
+            return list(self.db.users.find(
+                {"muted_until": {"$type": "date"}},
+                {"_id": 0, "user_id": 1, "muted_until": 1}
+            ))
+        except Exception as e:
+            print(f"❌ Failed to get pending mutes: {e}")
+            return []
+    
+    async def clear_user_mute(self, user_id: int, muted_until: datetime) -> bool:
+        """Clear mute only if it was not changed since it was scheduled"""
+        try:
+            result = self.db.users.update_one(
+                {"user_id": user_id, "muted_until": muted_until},
+                {"$set": {"muted_until": None}}
+            )
+            return result.modified_count > 0
+        except Exception as e:
+            print(f"❌ Failed to clear mute for user {user_id}: {e}")
+            return False
 
     # Voice Channel Management
     async def add_voice_channel(self, channel_id: int, owner_id: int, channel_name: str) -> bool:
@@ -176,8 +332,8 @@ class Database:
             return False
 
     # Applications Management
-    async def add_application(self, user_id: int, username: str, group: str, full_name: str) -> bool:
-        """Add group application"""
+    async def add_application(self, user_id: int, username: str, group: str, full_name: str) -> Optional[str]:
+        """Add group application, returns its id"""
         try:
             # Check if user already has pending application
             existing = self.db.applications.find_one({
@@ -186,7 +342,7 @@ class Database:
             })
             
             if existing:
-                return False
+                return None
             
             app_data = {
                 "user_id": user_id,
@@ -200,10 +356,18 @@ class Database:
             }
             
             result = self.db.applications.insert_one(app_data)
-            return result.inserted_id is not None
+            return str(result.inserted_id)
         except Exception as e:
             print(f"❌ Failed to add application for user {user_id}: {e}")
-            return False
+            return None
+    
+    async def get_application(self, application_id: str) -> Optional[Dict]:
+        """Get application by id"""
+        try:
+            return self.db.applications.find_one({"_id": ObjectId(application_id)})
+        except Exception as e:
+            print(f"❌ Failed to get application {application_id}: {e}")
+            return None
     
     async def get_pending_applications(self, group: str = None) -> List[Dict]:
         """Get pending applications"""
@@ -216,25 +380,110 @@ class Database:
             print(f"❌ Failed to get pending applications: {e}")
             return []
     
-    async def update_application_status(self, user_id: int, group: str, status: str, reviewed_by: int) -> bool:
-        """Update application status"""
+    async def get_pending_applications_page(self, group: str, limit: int = 25) -> List[Dict]:
+        """Oldest pending applications of group"""
+        try:
+            cursor = self.db.applications.find(
+                {"status": "pending", "group": group},
+                {"user_id": 1, "username": 1, "full_name": 1, "applied_at": 1}
+            ).sort("applied_at", 1).limit(limit)
+            return list(cursor)
+        except Exception as e:
+            print(f"❌ Failed to get pending applications for {group}: {e}")
+            return []
+    
+    async def count_pending_applications(self, group: str) -> int:
+        """Count pending applications of group"""
+        try:
+            return self.db.applications.count_documents({"status": "pending", "group": group})
+        except Exception as e:
+            print(f"❌ Failed to count pending applications for {group}: {e}")
+            return 0
+    
+    async def claim_applications(self, group: str, user_ids: List[int], reviewed_by: int) -> Tuple[Optional[ObjectId], List[Dict]]:
+        """
+        Approve still-pending applications of users in one update.
+        Returns (claim id, claimed applications); applications reviewed meanwhile are not claimed.
+        """
+        if not user_ids:
+            return None, []
+        try:
+            claim = ObjectId()
+            self.db.applications.update_many(
+                {"user_id": {"$in": user_ids}, "group": group, "status": "pending"},
+                {"$set": {
+                    "status": "approved",
+                    "reviewed_at": datetime.utcnow(),
+                    "reviewed_by": reviewed_by,
+                    "claim": claim
+                }}
+            )
+            claimed = list(self.db.applications.find(
+                {"claim": claim},
+                {"user_id": 1, "applied_at": 1, "reviewed_at": 1}
+            ))
+            return claim, claimed
+        except Exception as e:
+            print(f"❌ Failed to approve applications for {group}: {e}")
+            return None, []
+    
+    async def release_applications(self, claim: ObjectId, user_ids: List[int]) -> bool:
+        """Return claimed applications of users to pending (their approval failed)"""
+        if not user_ids:
+            return True
+        try:
+            self.db.applications.update_many(
+                {"claim": claim, "user_id": {"$in": user_ids}},
+                {
+                    "$set": {"status": "pending", "reviewed_at": None, "reviewed_by": None},
+                    "$unset": {"claim": ""}
+                }
+            )
+            return True
+        except Exception as e:
+            print(f"❌ Failed to release {len(user_ids)} claimed applications: {e}")
+            return False
+    
+    async def get_board_messages(self) -> Dict[str, Dict]:
+        """Map group -> stored board message"""
         try:
-            result = self.db.applications.update_one(
+            return {board['group']: board for board in self.db.boards.find()}
+        except Exception as e:
+            print(f"❌ Failed to get board messages: {e}")
+            return {}
+    
+    async def set_board_message(self, group: str, channel_id: int, message_id: int) -> bool:
+        """Remember board message of group"""
+        try:
+            self.db.boards.update_one(
+                {"group": group},
+                {"$set": {"channel_id": channel_id, "message_id": message_id}},
+                upsert=True
+            )
+            return True
+        except Exception as e:
+            print(f"❌ Failed to save board message for {group}: {e}")
+            return False
+    
+    async def update_application_status(self, user_id: int, group: str, status: str, reviewed_by: int) -> Optional[Dict]:
+        """Update application status, returns the reviewed application (None if nothing was pending)"""
+        try:
+            return self.db.applications.find_one_and_update(
                 {"user_id": user_id, "group": group, "status": "pending"},
                 {"$set": {
                     "status": status,
                     "reviewed_at": datetime.utcnow(),
                     "reviewed_by": reviewed_by
-                }}
+                }},
+                return_document=ReturnDocument.AFTER
             )
-            return result.modified_count > 0
         except Exception as e:
             print(f"❌ Failed to update application status: {e}")
-            return False
+            return None
 
     # Moderation
-    async def add_warning(self, user_id: int, reason: str, moderator_id: int) -> bool:
-        """Add warning to user"""
+    async def add_warning(self, user_id: int, reason: str, moderator_id: int) -> Optional[int]:
+        """Add warning to user, returns the new total warning count"""
         try:
             # Add to warnings collection
             warning_data = {
@@ -245,15 +494,113 @@ class Database:
             }
             self.db.warnings.insert_one(warning_data)
             
-            # Increment warning count in users collection
-            self.db.users.update_one(
+            # Increment warning count in users collection and read it back atomically
+            user_data = self.db.users.find_one_and_update(
                 {"user_id": user_id},
-                {"$inc": {"warnings": 1}}
+                {"$inc": {"warnings": 1}},
+                projection={"warnings": 1, "_id": 0},
+                upsert=True,
+                return_document=ReturnDocument.AFTER
             )
-            return True
+            return user_data["warnings"]
         except Exception as e:
             print(f"❌ Failed to add warning for user {user_id}: {e}")
-            return False
+            return None
+    
+    async def count_active_warnings(self, user_id: int, since: datetime) -> int:
+        """Count user's warnings issued after since"""
+        try:
+            return self.db.warnings.count_documents({"user_id": user_id, "timestamp": {"$gte": since}})
+        except Exception as e:
+            print(f"❌ Failed to count warnings for user {user_id}: {e}")
+            return 0
+    
+    async def next_sequence(self, name: str, count: int = 1) -> Optional[int]:
+        """Atomically reserve count sequential numbers, returns the first one"""
+        try:
+            counter = self.db.counters.find_one_and_update(
+                {"_id": name},
+                {"$inc": {"value": count}},
+                upsert=True,
+                return_document=ReturnDocument.AFTER
+            )
+            return counter["value"] - count + 1
+        except Exception as e:
+            print(f"❌ Failed to reserve sequence {name}: {e}")
+            return None
+    
+    async def add_case(self, action: str, user_id: int, moderator_id: int, reason: str = None,
+                       duration: str = None, details: Dict = None) -> Optional[int]:
+        """Create moderation case, returns its number"""
+        try:
+            case_id = await self.next_sequence("cases")
+            if case_id is None:
+                return None
+            
+            self.db.cases.insert_one({
+                "case_id": case_id,
+                "action": action,
+                "user_id": user_id,
+                "moderator_id": moderator_id,
+                "reason": reason,
+                "duration": duration,
+                "details": details or {},
+                "created_at": datetime.utcnow()
+            })
+            return case_id
+        except Exception as e:
+            print(f"❌ Failed to create {action} case for user {user_id}: {e}")
+            return None
+    
+    async def add_cases(self, action: str, user_ids: List[int], moderator_id: int, reason: str = None,
+                        details: Dict = None) -> Optional[int]:
+        """Create one case per user from a single reserved range, returns the first number"""
+        if not user_ids:
+            return None
+        try:
+            first_id = await self.next_sequence("cases", len(user_ids))
+            if first_id is None:
+                return None
+            
+            now = datetime.utcnow()
+            self.db.cases.insert_many([{
+                "case_id": first_id + i,
+                "action": action,
+                "user_id": user_id,
+                "moderator_id": moderator_id,
+                "reason": reason,
+                "duration": None,
+                "details": details or {},
+                "created_at": now
+            } for i, user_id in enumerate(user_ids)], ordered=False)
+            return first_id
+        except Exception as e:
+            print(f"❌ Failed to create {action} cases: {e}")
+            return None
+    
+    async def get_case(self, case_id: int) -> Optional[Dict]:
+        """Get moderation case by number"""
+        try:
+            return self.db.cases.find_one({"case_id": case_id})
+        except Exception as e:
+            print(f"❌ Failed to get case {case_id}: {e}")
+            return None
+    
+    async def update_case_reason(self, case_id: int, reason: str, editor_id: int) -> Optional[Dict]:
+        """Change case reason, returns the updated case"""
+        try:
+            return self.db.cases.find_one_and_update(
+                {"case_id": case_id},
+                {"$set": {
+                    "reason": reason,
+                    "edited_by": editor_id,
+                    "edited_at": datetime.utcnow()
+                }},
+                return_document=ReturnDocument.AFTER
+            )
+        except Exception as e:
+            print(f"❌ Failed to update case {case_id}: {e}")
+            return None
     
     async def get_user_warnings(self, user_id: int) -> List[Dict]:
         """Get all warnings for user"""
@@ -262,6 +609,30 @@ class Database:
         except Exception as e:
             print(f"❌ Failed to get warnings for user {user_id}: {e}")
             return []
+    
+    async def count_user_warnings(self, user_id: int) -> int:
+        """Count all warnings of user"""
+        try:
+            return self.db.warnings.count_documents({"user_id": user_id})
+        except Exception as e:
+            print(f"❌ Failed to count warnings for user {user_id}: {e}")
+            return 0
+    
+    async def get_user_warnings_page(self, user_id: int, after: tuple = None, limit: int = 10) -> List[Dict]:
+        """User's warnings newest first, after a (timestamp, _id) keyset cursor"""
+        try:
+            query = {"user_id": user_id}
+            if after:
+                timestamp, last_id = after
+                query["$or"] = [
+                    {"timestamp": {"$lt": timestamp}},
+                    {"timestamp": timestamp, "_id": {"$lt": last_id}}
+                ]
+            cursor = self.db.warnings.find(query).sort([("timestamp", -1), ("_id", -1)]).limit(limit)
+            return list(cursor)
+        except Exception as e:
+            print(f"❌ Failed to get warnings for user {user_id}: {e}")
+            return []
 
     # Logging
     async def log_action(self, action: str, user_id: int, moderator_id: int = None, details: Dict = None) -> bool:
@@ -280,6 +651,128 @@ class Database:
         except Exception as e:
             print(f"❌ Failed to log action: {e}")
             return False
+    
+    async def log_actions(self, entries: List[Dict]) -> bool:
+        """Log many actions with one insert"""
+        if not entries:
+            return True
+        try:
+            now = datetime.utcnow()
+            log_data = [{
+                "action": entry["action"],
+                "user_id": entry["user_id"],
+                "moderator_id": entry.get("moderator_id"),
+                "details": entry.get("details") or {},
+                "timestamp": now
+            } for entry in entries]
+            
+            result = self.db.logs.insert_many(log_data, ordered=False)
+            return len(result.inserted_ids) == len(log_data)
+        except Exception as e:
+            print(f"❌ Failed to log actions: {e}")
+            return False
+    
+    async def search_logs(self, user_id: int = None, action_prefix: str = None,
+                          moderator_id: int = None, since: datetime = None,
+                          until: datetime = None, after: tuple = None,
+                          limit: int = 10) -> List[Dict]:
+        """Search logs newest first; after is the (timestamp, _id) keyset cursor of the previous page"""
+        try:
+            query = {}
+            if user_id is not None:
+                query["user_id"] = user_id
+            if action_prefix:
+                # Anchored regex is served as an index range scan
+                query["action"] = {"$regex": f"^{re.escape(action_prefix)}"}
+            if moderator_id is not None:
+                query["moderator_id"] = moderator_id
+            
+            if since or until:
+                query["timestamp"] = {}
+                if since:
+                    query["timestamp"]["$gte"] = since
+                if until:
+                    query["timestamp"]["$lt"] = until
+            
+            if after:
+                timestamp, last_id = after
+                query["$or"] = [
+                    {"timestamp": {"$lt": timestamp}},
+                    {"timestamp": timestamp, "_id": {"$lt": last_id}}
+                ]
+            
+            cursor = self.db.logs.find(query).sort([("timestamp", -1), ("_id", -1)]).limit(limit)
+            return list(cursor)
+        except Exception as e:
+            print(f"❌ Failed to search logs: {e}")
+            return []
+
+    # Onboarding funnel (one pre-aggregated document per UTC day)
+    async def increment_funnel(self, day: str, increments: Dict[str, float]) -> bool:
+        """Add to daily funnel counters with one upsert"""
+        try:
+            self.db.funnel.update_one({"_id": day}, {"$inc": increments}, upsert=True)
+            return True
+        except Exception as e:
+            print(f"❌ Failed to update funnel counters for {day}: {e}")
+            return False
+    
+    async def get_funnel_days(self, first_day: str, last_day: str) -> List[Dict]:
+        """Daily funnel documents in the inclusive day range"""
+        try:
+            return list(self.db.funnel.find({"_id": {"$gte": first_day, "$lte": last_day}}))
+        except Exception as e:
+            print(f"❌ Failed to get funnel counters: {e}")
+            return []
+
+    # Jobs
+    async def create_job(self, job_type: str, data: Dict) -> Optional[str]:
+        """Create background job, returns its id"""
+        try:
+            now = datetime.utcnow()
+            job = {
+                "type": job_type,
+                "status": "running",
+                "cursor": 0,
+                "created_at": now,
+                "updated_at": now,
+                **data
+            }
+            return str(self.db.jobs.insert_one(job).inserted_id)
+        except Exception as e:
+            print(f"❌ Failed to create {job_type} job: {e}")
+            return None
+    
+    async def get_job(self, job_id: str) -> Optional[Dict]:
+        """Get job by id"""
+        try:
+            return self.db.jobs.find_one({"_id": ObjectId(job_id)})
+        except Exception as e:
+            print(f"❌ Failed to get job {job_id}: {e}")
+            return None
+    
+    async def get_jobs(self, job_type: str, status: str) -> List[Dict]:
+        """Get jobs of type with status"""
+        try:
+            return list(self.db.jobs.find({"type": job_type, "status": status}))
+        except Exception as e:
+            print(f"❌ Failed to get {job_type} jobs: {e}")
+            return []
+    
+    async def update_job(self, job_id: str, fields: Dict, increments: Dict = None, status: str = None) -> bool:
+        """Checkpoint job: set fields and increment counters in one update (only in status, if given)"""
+        try:
+            update = {"$set": {**fields, "updated_at": datetime.utcnow()}}
+            if increments:
+                update["$inc"] = increments
+            query = {"_id": ObjectId(job_id)}
+            if status:
+                query["status"] = status
+            result = self.db.jobs.update_one(query, update)
+            return result.matched_count > 0
+        except Exception as e:
+            print(f"❌ Failed to update job {job_id}: {e}")
+            return False
 
 # Global database instance
 db = Database()
\ No newline at end of file
@@ -3,31 +3,136 @@ from nextcord.ext import commands
 import os
 from dotenv import load_dotenv
 import asyncio
+import time
 
-from config import COMMAND_PREFIX
+from config import COMMAND_PREFIX, AUDIT_LOG, GATEWAY_PROFILES
 from database.db import db
-from utils.logs import Logger
+from utils.logs import Logger, close_sinks, register_sink
+from utils.audit_sink import JsonlAuditSink
+from utils.dm_queue import dm_service
+from utils.events import bus, RoleUpdateEvent
+from utils.gateway import (
+    build_intents, build_member_cache_flags, cache_report, format_bytes, profile_name, rss_bytes
+)
 
 # Load environment variables
 load_dotenv()
 
-# Bot intents
-intents = nextcord.Intents.all()
+# Bot intents and member cache from the gateway profile
+gateway_profile = profile_name()
+profile = GATEWAY_PROFILES[gateway_profile]
+intents = build_intents(profile)
 
 # Initialize bot
 bot = commands.Bot(
     command_prefix=COMMAND_PREFIX,
     intents=intents,
-    help_command=None  # We use custom help command
+    member_cache_flags=build_member_cache_flags(),
+    chunk_guilds_at_startup=profile['CHUNK_AT_STARTUP'],
+    help_command=None,  # We use custom help command
+    activity=nextcord.Game(name="🦎 Керую потоком ІП-5x")  # Sent on every (re)identify
 )
 
+COGS = [
+    'cogs.welcome',
+    'cogs.voice',
+    'cogs.moderation',
+    'cogs.groups',
+    'cogs.audit',
+    'cogs.antispam',
+    'cogs.stats',
+    'cogs.applications'
+]
+
 # Global logger instance
 logger = None
+startup_timings = {}  # step -> seconds
+startup_rss = None
+first_ready_done = False
+
+async def timed(step: str, coro):
+    """Await coro and record its wall time under step"""
+    started = time.perf_counter()
+    try:
+        return await coro
+    finally:
+        startup_timings[step] = time.perf_counter() - started
+
+async def prepare_database():
+    """Connect, then ensure indexes; both block in a thread, off the event loop"""
+    if await timed("db.connect", db.connect()):
+        await timed("db.indexes", db.create_indexes())
+
+async def load_cogs():
+    """Load cogs; their state is hydrated later, on the first ready"""
+    print("\n🔄 Loading cogs...")
+    for cog in COGS:
+        started = time.perf_counter()
+        try:
+            bot.load_extension(cog)
+            print(f"✅ Loaded: {cog}")
+        except Exception as e:
+            print(f"❌ Failed to load {cog}: {e}")
+        startup_timings[cog] = time.perf_counter() - started
+
+async def startup():
+    """Run once before login: services, then database and cogs concurrently"""
+    global logger, startup_rss
+    started = time.perf_counter()
+    
+    # Initialize logger
+    logger = Logger(bot)
+    
+    # Background DM delivery
+    dm_service.start(bot)
+    
+    # Local audit log alongside the LOG channel
+    if AUDIT_LOG['ENABLED']:
+        register_sink(JsonlAuditSink(
+            AUDIT_LOG['DIR'],
+            max_bytes=AUDIT_LOG['MAX_BYTES'],
+            rotate_seconds=AUDIT_LOG['ROTATE_SECONDS']
+        ))
+    
+    # Cog loading does not need the database; cog hydration waits for first_ready
+    await asyncio.gather(
+        timed("database", prepare_database()),
+        timed("cogs", load_cogs())
+    )
+    startup_timings["total"] = time.perf_counter() - started
+    
+    print("\n⏱️ Startup steps:")
+    for step, seconds in startup_timings.items():
+        print(f"   {step:<24} {seconds * 1000:8.1f}ms")
+    
+    startup_rss = rss_bytes()
+    print(f"📦 RSS before login: {format_bytes(startup_rss)}")
+
+def print_cache_report():
+    """Cache sizes and memory of the active gateway profile, for comparing profiles"""
+    caches = cache_report(bot)
+    rss = rss_bytes()
+    print(f"\n📦 Gateway profile: {gateway_profile} "
+          f"(presences {'on' if intents.presences else 'off'}, "
+          f"chunk at startup {'on' if profile['CHUNK_AT_STARTUP'] else 'off'})")
+    print(f"   Guilds: {caches['guilds']} ({caches['chunked']} fully chunked)")
+    print(f"   Members cached: {caches['members']} of {caches['member_count']}")
+    print(f"   Users cached: {caches['users']}")
+    print(f"   Messages cached: {caches['messages']}")
+    if rss is not None and startup_rss is not None:
+        print(f"   RSS: {format_bytes(rss)} ({(rss - startup_rss) / (1 << 20):+.1f} MB since login)")
+    else:
+        print(f"   RSS: {format_bytes(rss)}")
 
 @bot.event
 async def on_ready():
-    """Bot startup event"""
-    global logger
+    """Fires after every fresh gateway session; hydration runs only on the first one"""
+    global first_ready_done
+    
+    if first_ready_done:
+        print(f"🔄 Gateway session re-established as {bot.user.name}")
+        return
+    first_ready_done = True
     
     print("=" * 50)
     print(f"🦎 Bot logged in as {bot.user.name}")
@@ -35,42 +140,26 @@ async def on_ready():
     print(f"🔧 Nextcord version: {nextcord.__version__}")
     print("=" * 50)
     
-    # Connect to database
-    await db.connect()
-    
-    # Initialize logger
-    logger = Logger(bot)
-    
-    # Load cogs
-    print("\n🔄 Loading cogs...")
-    cogs = [
-        'cogs.welcome',
-        'cogs.voice',
-        'cogs.moderation',
-        'cogs.groups'
-    ]
-    
-    for cog in cogs:
-        try:
-            bot.load_extension(cog)
-            print(f"✅ Loaded: {cog}")
-        except Exception as e:
-            print(f"❌ Failed to load {cog}: {e}")
+    # Cogs hydrate from the cache and database in on_first_ready listeners
+    bot.dispatch("first_ready")
+    print_cache_report()
     
     print("\n✅ Bot is ready!")
     print("=" * 50)
-    
-    # Set bot status
-    await bot.change_presence(
-        activity=nextcord.Game(name="🦎 Керую потоком ІП-5x")
-    )
 
 @bot.event
 async def on_member_update(before, after):
-    """Handle member role updates"""
-    if before.roles != after.roles:
-        if logger:
-            await logger.log_role_update(after, before.roles, after.roles)
+    """Diff role changes once and publish them to the event bus"""
+    event = RoleUpdateEvent.from_member_update(before, after)
+    if event:
+        bus.publish(event)
+
+async def log_role_update(event: RoleUpdateEvent):
+    """Event bus subscriber: log role changes"""
+    if logger:
+        await logger.log_role_update(event.member, event.before_roles, event.after_roles)
+
+bus.subscribe(RoleUpdateEvent, log_role_update, name="logger.role_update")
 
 @bot.event
 async def on_message_delete(message):
@@ -81,7 +170,8 @@ async def on_message_delete(message):
 @bot.event
 async def on_message_edit(before, after):
     """Handle message edits"""
-    if logger and not before.author.bot:
+    # Embed unfurls and pin changes also fire edits; skip them before the logger
+    if logger and not before.author.bot and before.content != after.content:
         await logger.log_message_edit(before, after)
 
 @bot.event
@@ -264,8 +354,12 @@ if __name__ == "__main__":
     else:
         try:
             print("🚀 Starting bot...")
+            bot.loop.run_until_complete(startup())
             bot.run(token)
         except nextcord.LoginFailure:
             print("❌ Failed to login: Invalid token")
         except Exception as e:
-            print(f"❌ Failed to start bot: {e}")
\ No newline at end of file
+            print(f"❌ Failed to start bot: {e}")
+        finally:
+            # Queued audit records are written and the open segment closed
+            close_sinks()
\ No newline at end of file
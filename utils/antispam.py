@@ -0,0 +1,152 @@
+import time
+from collections import OrderedDict
+from typing import Optional
+
+class _UserState:
+    """Per-user counters, all fixed size"""
+    __slots__ = (
+        "tokens", "updated",
+        "window_start", "current", "previous",
+        "mentions_current", "mentions_previous",
+        "hashes", "hash_times", "hash_index"
+    )
+
+    def __init__(self, now: float, burst: int, duplicates: int):
+        self.tokens = float(burst)
+        self.updated = now
+        self.window_start = now
+        self.current = 0
+        self.previous = 0
+        self.mentions_current = 0
+        self.mentions_previous = 0
+        self.hashes = [0] * duplicates
+        self.hash_times = [0.0] * duplicates
+        self.hash_index = 0
+
+class SpamDetector:
+    """
+    O(1) per-message flood detection: token bucket for bursts, sliding window
+    counters for message and mention rate, ring of recent content hashes for duplicates.
+    Idle users are evicted so memory stays bounded.
+    """
+
+    def __init__(self, rate: float = 1.0, burst: int = 8, window: float = 30.0,
+                 max_messages: int = 20, max_mentions: int = 10, duplicates: int = 4,
+                 duplicate_window: float = 60.0, max_users: int = 10000, idle_seconds: float = 300.0):
+        self.rate = rate
+        self.burst = burst
+        self.window = window
+        self.max_messages = max_messages
+        self.max_mentions = max_mentions
+        self.duplicates = duplicates
+        self.duplicate_window = duplicate_window
+        self.max_users = max_users
+        self.idle_seconds = idle_seconds
+        self._users: "OrderedDict[int, _UserState]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._users)
+
+    def check(self, user_id: int, content: str, mentions: int = 0, now: float = None) -> Optional[str]:
+        """Register message, returns reason if the user is spamming"""
+        now = time.monotonic() if now is None else now
+        state = self._state(user_id, now)
+
+        # Token bucket: short bursts
+        state.tokens = min(self.burst, state.tokens + (now - state.updated) * self.rate)
+        state.updated = now
+        state.tokens -= 1
+
+        # Sliding window counters: previous window weighted by its remaining overlap
+        elapsed = now - state.window_start
+        if elapsed >= self.window:
+            full_windows = int(elapsed // self.window)
+            state.previous = state.current if full_windows == 1 else 0
+            state.mentions_previous = state.mentions_current if full_windows == 1 else 0
+            state.current = 0
+            state.mentions_current = 0
+            state.window_start += full_windows * self.window
+            elapsed = now - state.window_start
+
+        weight = 1 - elapsed / self.window
+        state.current += 1
+        state.mentions_current += mentions
+        messages = state.previous * weight + state.current
+        mention_count = state.mentions_previous * weight + state.mentions_current
+
+        # Duplicate content: ring of recent hashes
+        content_hash = hash(" ".join(content.lower().split())) if content else 0
+        repeats = 1
+        if content_hash:
+            for i in range(self.duplicates):
+                if state.hashes[i] == content_hash and now - state.hash_times[i] <= self.duplicate_window:
+                    repeats += 1
+            state.hashes[state.hash_index] = content_hash
+            state.hash_times[state.hash_index] = now
+            state.hash_index = (state.hash_index + 1) % self.duplicates
+
+        if mention_count > self.max_mentions:
+            reason = "Масові згадки"
+        elif content_hash and repeats > self.duplicates:
+            reason = "Повторення однакових повідомлень"
+        elif state.tokens < 0 or messages > self.max_messages:
+            reason = "Флуд повідомленнями"
+        else:
+            return None
+
+        # Start over so one flood triggers one action
+        del self._users[user_id]
+        return reason
+
+    def forget(self, user_id: int):
+        self._users.pop(user_id, None)
+
+    def _state(self, user_id: int, now: float) -> _UserState:
+        state = self._users.get(user_id)
+        if state is None:
+            state = _UserState(now, self.burst, self.duplicates)
+            self._users[user_id] = state
+            self._evict(now)
+        else:
+            self._users.move_to_end(user_id)
+        return state
+
+    def _evict(self, now: float):
+        """Drop least recently active users: over capacity or idle (amortised O(1))"""
+        while len(self._users) > self.max_users:
+            self._users.popitem(last=False)
+
+        for _ in range(2):
+            if not self._users:
+                return
+            oldest = next(iter(self._users.values()))
+            if now - oldest.updated < self.idle_seconds:
+                return
+            self._users.popitem(last=False)
+
+def benchmark(messages: int = 200_000, users: int = 2_000):
+    """Measure per-message overhead: python -m utils.antispam"""
+    import random
+
+    detector = SpamDetector()
+    contents = [f"повідомлення номер {i} про лабораторну" for i in range(500)]
+    events = [
+        (random.randrange(users), random.choice(contents), random.random() < 0.05)
+        for _ in range(messages)
+    ]
+
+    # Simulate 5000 messages per second
+    now = 0.0
+    triggered = 0
+    started = time.perf_counter()
+    for user_id, content, mention in events:
+        now += 0.0002
+        if detector.check(user_id, content, 1 if mention else 0, now):
+            triggered += 1
+    elapsed = time.perf_counter() - started
+
+    print(f"{messages:,} messages from {users:,} users: {elapsed / messages * 1e6:.2f} µs/message")
+    print(f"Triggered: {triggered}, tracked users: {len(detector)}")
+
+if __name__ == "__main__":
+    benchmark()
\ No newline at end of file
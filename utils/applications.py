@@ -0,0 +1,152 @@
+from typing import List, Optional, Tuple
+
+import nextcord
+
+from config import APPLICATIONS_BULK, GROUP_ROLES, MODERATION_ROLES
+from database.db import db
+from utils.dm_queue import dm_service
+from utils.embeds import error_embed, success_embed
+from utils.events import bus, ApplicationEvent
+from utils import funnel
+from utils.logs import Logger
+from utils.roles import set_group_role
+from utils.workers import RateLimiter, run_pool
+
+def can_review(member: nextcord.Member) -> bool:
+    """Starostas and deputies review applications"""
+    return any(role.id in MODERATION_ROLES for role in member.roles)
+
+async def review_application(client, reviewer: nextcord.Member, user_id: int, group: str,
+                             status: str) -> Optional[str]:
+    """
+    Approve or reject a pending application: status, roles, database, DM, log.
+    An applicant who left the server is still marked reviewed; only roles and DM are skipped.
+    Returns error text for the reviewer, None on success.
+    """
+    guild = reviewer.guild
+    applicant = guild.get_member(user_id)
+    if status == "approved" and not guild.get_role(GROUP_ROLES.get(group)):
+        return "Роль групи не знайдена!"
+
+    # Update application status in database
+    application = await db.update_application_status(user_id, group, status, reviewer.id)
+    if not application:
+        return "Не вдалося оновити статус заявки."
+
+    await funnel.record(
+        {status: 1},
+        {"apply_review": [funnel.seconds_between(application['applied_at'], application['reviewed_at'])]}
+    )
+
+    if status == "approved":
+        # Replace other group roles and the guest role in one edit
+        if applicant:
+            await set_group_role(applicant, group, reason=f"Заявка схвалена {reviewer.name}")
+
+            # Ensure user exists in database, then update group
+            user_data = await db.get_user(user_id)
+            if not user_data:
+                await db.add_user(user_id, applicant.name, group)
+            else:
+                await db.update_user_group(user_id, group)
+
+        embed = success_embed(
+            "Заявка схвалена!",
+            f"Вітаємо! Ваша заявка до групи **{group}** була схвалена.\n"
+            f"Тепер ви маєте доступ до всіх каналів групи."
+        )
+    else:
+        embed = error_embed(
+            "Заявка відхилена",
+            f"На жаль, ваша заявка до групи **{group}** була відхилена.\n"
+            f"Для отримання додаткової інформації звертайтеся до адміністрації."
+        )
+    if applicant:
+        dm_service.enqueue(applicant.id, embed=embed)
+
+    bus.publish(ApplicationEvent(user_id, group, status))
+
+    logger = Logger(client)
+    await logger.log_application_reviewed(user_id, group, status, reviewer)
+    return None
+
+async def approve_applications(client, reviewer: nextcord.Member, group: str,
+                               user_ids: List[int] = None) -> Tuple[List[int], List[Tuple[int, str]]]:
+    """
+    Approve pending applications of group (all, or only user_ids) in bulk:
+    one update_many claims the still-pending applications, then pooled single-call role edits
+    for claimed ones only, one bulk_write, queued DMs, one log entry.
+    Claims of members whose role edit failed go back to pending.
+    Returns (approved user ids, [(user_id, error)]).
+    """
+    guild = reviewer.guild
+    pending = await db.get_pending_applications(group)
+    if user_ids is not None:
+        wanted = set(user_ids)
+        pending = [application for application in pending if application['user_id'] in wanted]
+
+    # Without the group role the edits would only strip the guest role: fail the batch before claiming
+    if not guild.get_role(GROUP_ROLES.get(group)):
+        return [], [(application['user_id'], "Роль групи не знайдена!") for application in pending]
+
+    errors = []
+    members = []
+    for application in pending:
+        member = guild.get_member(application['user_id'])
+        if member:
+            members.append(member)
+        else:
+            errors.append((application['user_id'], "Користувач не знайдений на сервері."))
+
+    if user_ids is not None:
+        found = {application['user_id'] for application in pending}
+        errors.extend((user_id, "Немає заявки на розгляді.") for user_id in user_ids if user_id not in found)
+
+    # Claim first: applications reviewed through buttons or the board meanwhile stay untouched
+    claim, claimed = await db.claim_applications(group, [member.id for member in members], reviewer.id)
+    claimed_ids = {application['user_id'] for application in claimed}
+    for member in members:
+        if member.id not in claimed_ids:
+            errors.append((member.id, "Заявку вже розглянуто або не вдалося оновити."))
+    members = [member for member in members if member.id in claimed_ids]
+
+    async def worker(member: nextcord.Member):
+        await set_group_role(member, group, reason=f"Заявка схвалена {reviewer.name}")
+
+    succeeded, failed = await run_pool(
+        members,
+        worker,
+        concurrency=APPLICATIONS_BULK['CONCURRENCY'],
+        limiter=RateLimiter(APPLICATIONS_BULK['RATE'], APPLICATIONS_BULK['PER'])
+    )
+    for member, error in failed:
+        print(f"❌ Failed to approve application of {member.name}: {error}")
+        errors.append((member.id, "Не вдалося видати роль."))
+    await db.release_applications(claim, [member.id for member, _ in failed])
+
+    approved = [member.id for member in succeeded]
+    await db.bulk_update_user_groups([(user_id, group) for user_id in approved])
+
+    reviewed = {application['user_id']: application for application in claimed}
+    await funnel.record(
+        {"approved": len(approved)},
+        {"apply_review": [
+            funnel.seconds_between(reviewed[user_id]['applied_at'], reviewed[user_id]['reviewed_at'])
+            for user_id in approved
+        ]}
+    )
+
+    embed = success_embed(
+        "Заявка схвалена!",
+        f"Вітаємо! Ваша заявка до групи **{group}** була схвалена.\n"
+        f"Тепер ви маєте доступ до всіх каналів групи."
+    )
+    for user_id in approved:
+        dm_service.enqueue(user_id, embed=embed)
+        bus.publish(ApplicationEvent(user_id, group, "approved"))
+
+    if approved or errors:
+        logger = Logger(client)
+        await logger.log_applications_bulk_approved(group, reviewer, approved, [user_id for user_id, _ in errors])
+
+    return approved, errors
\ No newline at end of file
@@ -0,0 +1,134 @@
+import gzip
+import json
+import os
+import queue
+import shutil
+import threading
+import time
+from datetime import datetime
+from typing import Dict, List
+
+class JsonlAuditSink:
+    """Append-only newline-delimited JSON audit log written on a dedicated thread"""
+
+    def __init__(self, directory: str, max_bytes: int = 10 * 1024 * 1024,
+                 rotate_seconds: int = 86400, batch_size: int = 256, flush_interval: float = 1.0):
+        self.directory = directory
+        self.path = os.path.join(directory, "audit.jsonl")
+        self.max_bytes = max_bytes
+        self.rotate_seconds = rotate_seconds
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+
+        self.written = 0
+        self.dropped = 0
+
+        self._queue: "queue.Queue[Dict]" = queue.Queue(maxsize=100_000)
+        self._closed = threading.Event()
+        self._file = None
+        self._opened_at = 0.0
+        self._thread = threading.Thread(target=self._run, name="audit-sink", daemon=True)
+        self._thread.start()
+
+    def write(self, record: Dict):
+        """Queue record for writing; never blocks the event loop"""
+        try:
+            self._queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+    def close(self, timeout: float = 5.0):
+        """Flush queued records and stop the writer thread"""
+        self._closed.set()
+        self._thread.join(timeout)
+
+    def _run(self):
+        """Writer thread: drain queue in batches"""
+        os.makedirs(self.directory, exist_ok=True)
+        self._open()
+
+        while not (self._closed.is_set() and self._queue.empty()):
+            batch = self._next_batch()
+            if batch:
+                self._write_batch(batch)
+            if self._should_rotate():
+                self._rotate()
+
+        self._file.close()
+
+    def _next_batch(self) -> List[Dict]:
+        """Wait up to flush_interval for the first record, then take what is queued"""
+        try:
+            batch = [self._queue.get(timeout=self.flush_interval)]
+        except queue.Empty:
+            return []
+
+        while len(batch) < self.batch_size:
+            try:
+                batch.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+        return batch
+
+    def _write_batch(self, batch: List[Dict]):
+        lines = "".join(json.dumps(record, ensure_ascii=False, default=str) + "\n" for record in batch)
+        try:
+            self._file.write(lines)
+            self._file.flush()
+            self.written += len(batch)
+        except Exception as e:
+            print(f"❌ Failed to write audit records: {e}")
+
+    def _open(self):
+        self._file = open(self.path, "a", encoding="utf-8")
+        self._opened_at = time.time()
+
+    def _should_rotate(self) -> bool:
+        if self._file.tell() >= self.max_bytes:
+            return True
+        return self._file.tell() > 0 and time.time() - self._opened_at >= self.rotate_seconds
+
+    def _rotate(self):
+        """Move current segment aside, gzip it and start a new one"""
+        try:
+            self._file.close()
+            stamp = datetime.utcnow().strftime("%Y%m%d-%H%M%S-%f")
+            segment = os.path.join(self.directory, f"audit-{stamp}.jsonl")
+            os.replace(self.path, segment)
+
+            with open(segment, "rb") as source, gzip.open(segment + ".gz", "wb") as target:
+                shutil.copyfileobj(source, target)
+            os.remove(segment)
+        except Exception as e:
+            print(f"❌ Failed to rotate audit log: {e}")
+        finally:
+            self._open()
+
+def benchmark(records: int = 100_000):
+    """Measure sink throughput: python -m utils.audit_sink"""
+    import tempfile
+
+    with tempfile.TemporaryDirectory() as directory:
+        sink = JsonlAuditSink(directory, max_bytes=8 * 1024 * 1024)
+        record = {
+            "action": "moderation_warn",
+            "user_id": 123456789012345678,
+            "moderator_id": 876543210987654321,
+            "details": {"reason": "Флуд у загальному каналі"},
+            "timestamp": datetime.utcnow()
+        }
+
+        started = time.perf_counter()
+        for _ in range(records):
+            sink.write(record)
+        enqueued = time.perf_counter() - started
+        sink.close(timeout=60)
+        total = time.perf_counter() - started
+
+        segments = len([name for name in os.listdir(directory) if name.endswith(".gz")])
+        print(f"Enqueue: {records / enqueued:,.0f} records/s ({enqueued / records * 1e6:.2f} µs/record)")
+        print(f"Written: {sink.written:,} records in {total:.2f}s ({sink.written / total:,.0f} records/s)")
+        print(f"Dropped: {sink.dropped}, rotated segments: {segments}")
+
+if __name__ == "__main__":
+    benchmark()
\ No newline at end of file
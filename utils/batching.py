@@ -0,0 +1,118 @@
+import asyncio
+import time
+from typing import Awaitable, Callable, Dict, List
+
+class Batcher:
+    """
+    Collects items and hands them to flush(items) together: as soon as max_size items
+    are waiting, or max_delay seconds after the first waiting item.
+    """
+
+    def __init__(self, flush: Callable[[List], Awaitable], max_size: int = 100, max_delay: float = 2.0):
+        self.flush = flush
+        self.max_size = max_size
+        self.max_delay = max_delay
+        self._items: List = []
+        self._timer = None
+        self._running = set()
+        self._started = None
+
+        self.stats = {
+            "items": 0,
+            "batches": 0,
+            "max_batch": 0,
+            "errors": 0,
+            "flush_time": 0.0
+        }
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def add(self, item):
+        """Queue item without waiting for the flush"""
+        if self._started is None:
+            self._started = time.monotonic()
+        self._items.append(item)
+        self.stats["items"] += 1
+
+        if len(self._items) >= self.max_size:
+            self._flush_pending()
+        elif self._timer is None:
+            self._timer = asyncio.get_running_loop().call_later(self.max_delay, self._flush_pending)
+
+    async def drain(self):
+        """Flush waiting items and wait for running flushes"""
+        self._flush_pending()
+        if self._running:
+            await asyncio.gather(*self._running, return_exceptions=True)
+
+    def summary(self) -> Dict:
+        """Counters plus ingest rate (items/s since the first item) and average batch size"""
+        elapsed = time.monotonic() - self._started if self._started else 0.0
+        batches = self.stats["batches"]
+        return {
+            **self.stats,
+            "items_per_second": self.stats["items"] / elapsed if elapsed else 0.0,
+            "avg_batch": self.stats["items"] / batches if batches else 0.0
+        }
+
+    def _flush_pending(self):
+        if self._timer:
+            self._timer.cancel()
+            self._timer = None
+        if not self._items:
+            return
+
+        items, self._items = self._items, []
+        task = asyncio.create_task(self._flush(items))
+        self._running.add(task)
+        task.add_done_callback(self._running.discard)
+
+    async def _flush(self, items: List):
+        started = time.perf_counter()
+        try:
+            await self.flush(items)
+        except Exception as e:
+            self.stats["errors"] += 1
+            print(f"❌ Batch flush of {len(items)} items failed: {e}")
+        finally:
+            self.stats["batches"] += 1
+            self.stats["max_batch"] = max(self.stats["max_batch"], len(items))
+            self.stats["flush_time"] += time.perf_counter() - started
+
+async def _storm(joins: int, per_second: float, round_trip: float, per_item: float, batched: bool) -> Dict:
+    """Simulate a join storm against a blocking store (like sync pymongo on the event loop)"""
+    async def write(items):
+        time.sleep(round_trip + per_item * len(items))
+
+    started = time.perf_counter()
+    if batched:
+        batcher = Batcher(write, max_size=100, max_delay=1.0)
+        for i in range(joins):
+            batcher.add(i)
+            if i % 100 == 99:
+                await asyncio.sleep(100 / per_second)
+        await batcher.drain()
+        calls = batcher.stats["batches"]
+    else:
+        # One write per join, like the old on_member_join
+        pending = set()
+        for i in range(joins):
+            pending.add(asyncio.create_task(write([i])))
+            if i % 100 == 99:
+                await asyncio.sleep(100 / per_second)
+        await asyncio.gather(*pending)
+        calls = joins
+    elapsed = time.perf_counter() - started
+    return {"elapsed": elapsed, "calls": calls, "rate": joins / elapsed}
+
+def benchmark(joins: int = 2000, per_second: float = 1000, round_trip: float = 0.002, per_item: float = 0.00002):
+    """Measure ingest rate under a synthetic join storm: python -m utils.batching"""
+    for batched in (False, True):
+        result = asyncio.run(_storm(joins, per_second, round_trip, per_item, batched))
+        label = "batched" if batched else "per-join"
+        print(f"{label:>9}: {joins:,} joins in {result['elapsed']:.2f}s, "
+              f"{result['rate']:,.0f} joins/s, {result['calls']:,} store calls")
+
+if __name__ == "__main__":
+    benchmark()
\ No newline at end of file
@@ -0,0 +1,182 @@
+import asyncio
+import time
+from typing import Dict, Optional, Set, Tuple
+
+import nextcord
+
+class DMService:
+    """Background DM delivery: bounded queue, per-recipient dedup, retries, closed-DM cache"""
+
+    def __init__(self, maxsize: int = 1000, workers: int = 2, max_attempts: int = 4,
+                 closed_ttl: float = 6 * 3600):
+        self.maxsize = maxsize
+        self.workers = workers
+        self.max_attempts = max_attempts
+        self.closed_ttl = closed_ttl
+
+        self.bot = None
+        self._queue: Optional[asyncio.Queue] = None
+        self._tasks = []
+        self._requeues = set()
+        self._pending: Set[Tuple[int, str]] = set()
+        self._closed: Dict[int, float] = {}  # user_id -> monotonic expiry
+        self._retrying = 0
+
+        self.stats = {
+            "delivered": 0,
+            "failed": 0,
+            "retried": 0,
+            "dropped": 0,
+            "deduplicated": 0,
+            "skipped_closed": 0
+        }
+
+    @property
+    def started(self) -> bool:
+        return self._queue is not None
+
+    @property
+    def queued(self) -> int:
+        return (self._queue.qsize() if self._queue else 0) + self._retrying
+
+    def start(self, bot):
+        """Start delivery workers (idempotent)"""
+        if self.started:
+            return
+        self.bot = bot
+        self._queue = asyncio.Queue(maxsize=self.maxsize)
+        self._tasks = [asyncio.create_task(self._worker()) for _ in range(self.workers)]
+
+    def stop(self):
+        for task in self._tasks:
+            task.cancel()
+        self._tasks = []
+        self._queue = None
+
+    def is_closed(self, user_id: int) -> bool:
+        """User recently rejected DMs"""
+        expires = self._closed.get(user_id)
+        if expires is None:
+            return False
+        if expires < time.monotonic():
+            del self._closed[user_id]
+            return False
+        return True
+
+    def enqueue(self, user_id: int, embed: nextcord.Embed = None, content: str = None,
+                dedup_key: str = None) -> bool:
+        """Queue DM without waiting; False if dropped, duplicate or DMs are closed"""
+        if self.is_closed(user_id):
+            self.stats["skipped_closed"] += 1
+            return False
+
+        if dedup_key is None:
+            dedup_key = str(hash((content, embed.title if embed else None, embed.description if embed else None)))
+        key = (user_id, dedup_key)
+
+        if key in self._pending:
+            self.stats["deduplicated"] += 1
+            return False
+
+        if not self.started:
+            print("❌ DM service is not started")
+            self.stats["dropped"] += 1
+            return False
+
+        try:
+            self._queue.put_nowait({"key": key, "user_id": user_id, "embed": embed, "content": content, "attempt": 0})
+        except asyncio.QueueFull:
+            self.stats["dropped"] += 1
+            return False
+
+        self._pending.add(key)
+        return True
+
+    async def send_now(self, user: nextcord.abc.Messageable, embed: nextcord.Embed = None,
+                       content: str = None, timeout: float = 3.0) -> bool:
+        """Send DM inline when it has to precede another action (e.g. a ban)"""
+        if self.is_closed(user.id):
+            self.stats["skipped_closed"] += 1
+            return False
+
+        try:
+            await asyncio.wait_for(user.send(content=content, embed=embed), timeout)
+            self.stats["delivered"] += 1
+            return True
+        except nextcord.Forbidden:
+            self._mark_closed(user.id)
+        except Exception:
+            pass
+        self.stats["failed"] += 1
+        return False
+
+    def _mark_closed(self, user_id: int):
+        self._closed[user_id] = time.monotonic() + self.closed_ttl
+
+    async def _worker(self):
+        while True:
+            item = await self._queue.get()
+            try:
+                await self._deliver(item)
+            except Exception as e:
+                print(f"❌ DM worker error: {e}")
+            finally:
+                self._queue.task_done()
+
+    async def _deliver(self, item: Dict):
+        user_id = item["user_id"]
+
+        if self.is_closed(user_id):
+            self._pending.discard(item["key"])
+            self.stats["skipped_closed"] += 1
+            return
+
+        try:
+            user = self.bot.get_user(user_id) or await self.bot.fetch_user(user_id)
+            await user.send(content=item["content"], embed=item["embed"])
+        except nextcord.Forbidden:
+            # DMs closed or no shared server: do not retry
+            self._mark_closed(user_id)
+            self._fail(item)
+        except nextcord.NotFound:
+            self._fail(item)
+        except nextcord.HTTPException as e:
+            if e.status == 429 or e.status >= 500:
+                self._retry(item, getattr(e, "retry_after", None))
+            else:
+                self._fail(item)
+        except (asyncio.TimeoutError, OSError):
+            self._retry(item)
+        else:
+            self._pending.discard(item["key"])
+            self.stats["delivered"] += 1
+
+    def _fail(self, item: Dict):
+        self._pending.discard(item["key"])
+        self.stats["failed"] += 1
+
+    def _retry(self, item: Dict, retry_after: float = None):
+        """Re-queue with exponential backoff"""
+        item["attempt"] += 1
+        if item["attempt"] >= self.max_attempts:
+            self._fail(item)
+            return
+
+        self.stats["retried"] += 1
+        delay = max(retry_after or 0, 2 ** item["attempt"])
+        self._retrying += 1
+        task = asyncio.create_task(self._requeue(item, delay))
+        self._requeues.add(task)
+        task.add_done_callback(self._requeues.discard)
+
+    async def _requeue(self, item: Dict, delay: float):
+        try:
+            await asyncio.sleep(delay)
+            await self._queue.put(item)
+        except Exception:
+            self._fail(item)
+        finally:
+            self._retrying -= 1
+
+# Global DM service instance
+dm_service = DMService()
\ No newline at end of file
@@ -96,18 +96,22 @@ def voice_control_embed(channel_name: str, owner: nextcord.Member) -> nextcord.E
     return embed
 
 def moderation_embed(action: str, user: nextcord.Member, moderator: nextcord.Member, 
-                    reason: str = None, duration: str = None) -> nextcord.Embed:
+                    reason: str = None, duration: str = None, case_id: int = None) -> nextcord.Embed:
     """Create moderation action embed"""
     action_names = {
         "ban": "Бан",
         "kick": "Кік",
         "mute": "Мут",
         "unmute": "Розмут",
+        "unban": "Розбан",
         "warn": "Попередження"
     }
     
     embed = create_embed(f"Дія модерації: {action_names.get(action, action)}")
     
+    if case_id:
+        embed.set_footer(text=f"Справа #{case_id}")
+    
     embed.add_field(name="Користувач", value=f"{user.mention} ({user.name})", inline=True)
     embed.add_field(name="Модератор", value=f"{moderator.mention} ({moderator.name})", inline=True)
     
@@ -149,17 +153,14 @@ def user_info_embed(user: nextcord.Member, user_data: dict = None) -> nextcord.E
     embed.set_thumbnail(url=user.display_avatar.url)
     return embed
 
-def group_stats_embed(group: str, members: list) -> nextcord.Embed:
-    """Create group statistics embed"""
+def group_stats_embed(group: str, total: int, members: list, start: int = 0) -> nextcord.Embed:
+    """Create group statistics embed for one page of member ids"""
     embed = create_embed(f"Статистика групи {group}")
     
-    embed.add_field(name="Кількість учасників", value=str(len(members)), inline=True)
+    embed.add_field(name="Кількість учасників", value=str(total), inline=True)
     
     if members:
-        member_list = "\n".join([f"• <@{member['user_id']}>" for member in members[:10]])
-        if len(members) > 10:
-            member_list += f"\n... та ще {len(members) - 10} учасників"
-        
+        member_list = "\n".join([f"{start + i}. <@{user_id}>" for i, user_id in enumerate(members, 1)])
         embed.add_field(name="Учасники", value=member_list, inline=False)
     else:
         embed.add_field(name="Учасники", value="Немає учасників", inline=False)
@@ -179,7 +180,19 @@ def help_embed() -> nextcord.Embed:
               "`!kick @user [причина]` - Викинути користувача\n"
               "`!mute @user <час> [причина]` - Заглушити користувача\n"
               "`!unmute @user` - Розглушити користувача\n"
-              "`!warn @user [причина]` - Дати попередження",
+              "`!warn @user [причина]` - Дати попередження\n"
+              "`!massban <ID...|joined:10m> [причина]` - Масовий бан\n"
+              "`!masskick <ID...|joined:10m> [причина]` - Масовий кік\n"
+              "`!clear <кількість> [user:@user] [regex:...] [attachments] [bots] [after:...] [before:...]` - Очистити повідомлення\n"
+              "`!case <id>` - Переглянути справу модерації\n"
+              "`!case edit <id> <причина>` - Змінити причину справи\n"
+              "`!applications approve <група> [all|ID...]` - Схвалити заявки масово\n"
+              "`!modlatency` - Затримка команд модерації\n"
+              "`!dmstats` - Статистика доставки ОП\n"
+              "`!eventstats` - Статистика шини подій\n"
+              "`!joinstats` - Статистика обробки приєднань\n"
+              "`!funnel [днів]` - Воронка адаптації новачків\n"
+              "`!audit [user:@user] [action:...] [mod:@user] [from:дата] [to:дата]` - Пошук у журналі",
         inline=False
     )
     
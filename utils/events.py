@@ -0,0 +1,119 @@
+import asyncio
+import time
+from dataclasses import dataclass, field
+from typing import Callable, Dict, FrozenSet, List, Optional, Tuple, Type
+
+import nextcord
+
+from config import ROLE_GROUPS
+
+@dataclass
+class RoleUpdateEvent:
+    """Member role change, diffed once for all subscribers"""
+    member: nextcord.Member
+    before_roles: List[nextcord.Role]
+    after_roles: List[nextcord.Role]
+    added_role_ids: FrozenSet[int] = field(default_factory=frozenset)
+    removed_role_ids: FrozenSet[int] = field(default_factory=frozenset)
+    old_group: Optional[str] = None
+    new_group: Optional[str] = None
+
+    @property
+    def group_changed(self) -> bool:
+        return self.old_group != self.new_group
+
+    @classmethod
+    def from_member_update(cls, before: nextcord.Member, after: nextcord.Member) -> Optional["RoleUpdateEvent"]:
+        """Build event from on_member_update, None if roles did not change"""
+        before_ids = {role.id for role in before.roles}
+        after_ids = {role.id for role in after.roles}
+
+        if before_ids == after_ids:
+            return None
+
+        return cls(
+            member=after,
+            before_roles=before.roles,
+            after_roles=after.roles,
+            added_role_ids=frozenset(after_ids - before_ids),
+            removed_role_ids=frozenset(before_ids - after_ids),
+            old_group=_member_group(before.roles),
+            new_group=_member_group(after.roles)
+        )
+
+def _member_group(roles: List[nextcord.Role]) -> Optional[str]:
+    """Group name of the first group role in role list"""
+    for role in roles:
+        group = ROLE_GROUPS.get(role.id)
+        if group:
+            return group
+    return None
+
+@dataclass
+class ApplicationEvent:
+    """Group application submitted or reviewed"""
+    user_id: int
+    group: str
+    status: str  # pending, approved or rejected
+
+class EventBus:
+    """Internal pub/sub: every subscriber runs in its own task"""
+
+    def __init__(self):
+        self._subscribers: Dict[Type, List[Tuple[str, Callable]]] = {}
+        self._stats: Dict[str, Dict] = {}
+        self._running = set()
+
+    def subscribe(self, event_type: Type, handler: Callable, name: str = None):
+        """Register async handler for event type"""
+        name = name or getattr(handler, "__qualname__", repr(handler))
+        self._subscribers.setdefault(event_type, []).append((name, handler))
+        self._stats.setdefault(name, {"calls": 0, "errors": 0, "total_time": 0.0, "max_time": 0.0})
+
+    def unsubscribe(self, event_type: Type, handler: Callable):
+        """Remove handler from event type"""
+        self._subscribers[event_type] = [
+            (name, subscriber) for name, subscriber in self._subscribers.get(event_type, [])
+            if subscriber != handler
+        ]
+
+    def publish(self, event) -> int:
+        """Fan event out to subscribers without waiting for them"""
+        subscribers = self._subscribers.get(type(event), [])
+        for name, handler in subscribers:
+            task = asyncio.create_task(self._deliver(name, handler, event))
+            self._running.add(task)
+            task.add_done_callback(self._running.discard)
+        return len(subscribers)
+
+    async def _deliver(self, name: str, handler: Callable, event):
+        """Run one subscriber and record its latency and errors"""
+        stats = self._stats[name]
+        started = time.perf_counter()
+
+        try:
+            await handler(event)
+        except Exception as e:
+            stats["errors"] += 1
+            print(f"❌ Event subscriber {name} failed: {e}")
+        finally:
+            elapsed = time.perf_counter() - started
+            stats["calls"] += 1
+            stats["total_time"] += elapsed
+            stats["max_time"] = max(stats["max_time"], elapsed)
+
+    def stats(self) -> Dict[str, Dict]:
+        """Per-subscriber counters with average latency in milliseconds"""
+        result = {}
+        for name, stats in self._stats.items():
+            calls = stats["calls"]
+            result[name] = {
+                "calls": calls,
+                "errors": stats["errors"],
+                "avg_ms": (stats["total_time"] / calls * 1000) if calls else 0.0,
+                "max_ms": stats["max_time"] * 1000
+            }
+        return result
+
+# Global event bus instance
+bus = EventBus()
\ No newline at end of file
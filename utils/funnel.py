@@ -0,0 +1,104 @@
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from database.db import db
+
+# Onboarding stages in funnel order
+STAGES = ("joined", "accepted", "applied", "approved", "rejected")
+
+# Timed transitions between stages
+TRANSITIONS = ("join_accept", "accept_apply", "apply_review")
+
+# Latency histogram: (upper bound in seconds, bucket key); the last bucket is open-ended
+BUCKETS: List[Tuple[float, str]] = [
+    (60, "1m"),
+    (5 * 60, "5m"),
+    (15 * 60, "15m"),
+    (3600, "1h"),
+    (6 * 3600, "6h"),
+    (86400, "1d"),
+    (3 * 86400, "3d"),
+    (7 * 86400, "7d"),
+    (float("inf"), "more")
+]
+
+def bucket_of(seconds: float) -> str:
+    """Histogram bucket key for a latency"""
+    for bound, key in BUCKETS:
+        if seconds <= bound:
+            return key
+    return BUCKETS[-1][1]
+
+def day_key(moment: datetime = None) -> str:
+    """Daily counter document id (UTC date)"""
+    return (moment or datetime.utcnow()).strftime("%Y-%m-%d")
+
+def funnel_increments(counts: Dict[str, int],
+                      latencies: Dict[str, Iterable[float]] = None) -> Dict[str, float]:
+    """Flatten stage counts and transition latencies (None samples are skipped) into one $inc document"""
+    increments: Dict[str, float] = {}
+    for stage, count in counts.items():
+        if count:
+            increments[f"counts.{stage}"] = count
+
+    for transition, samples in (latencies or {}).items():
+        for seconds in samples:
+            if seconds is None:
+                continue
+            seconds = max(0.0, seconds)
+            prefix = f"latency.{transition}"
+            increments[f"{prefix}.count"] = increments.get(f"{prefix}.count", 0) + 1
+            increments[f"{prefix}.total"] = increments.get(f"{prefix}.total", 0.0) + seconds
+            key = f"{prefix}.buckets.{bucket_of(seconds)}"
+            increments[key] = increments.get(key, 0) + 1
+    return increments
+
+async def record(counts: Dict[str, int], latencies: Dict[str, Iterable[float]] = None,
+                 moment: datetime = None) -> bool:
+    """Add stage transitions to today's counters with one upsert"""
+    increments = funnel_increments(counts, latencies)
+    if not increments:
+        return True
+    return await db.increment_funnel(day_key(moment), increments)
+
+def seconds_between(start: Optional[datetime], end: datetime = None) -> Optional[float]:
+    """Seconds from start to end (now); aware datetimes from Discord are treated as UTC"""
+    if start is None:
+        return None
+    end = end or datetime.utcnow()
+    return (end.replace(tzinfo=None) - start.replace(tzinfo=None)).total_seconds()
+
+def _percentile(buckets: Dict[str, int], count: int, fraction: float) -> Optional[str]:
+    """Bucket key holding the given fraction of samples"""
+    seen = 0
+    for _, key in BUCKETS:
+        seen += buckets.get(key, 0)
+        if seen >= count * fraction:
+            return key
+    return None
+
+def summarize(days: List[Dict]) -> Dict:
+    """Merge daily documents: total counts and per-transition count, average, p50/p90 bucket"""
+    counts = {stage: 0 for stage in STAGES}
+    merged = {transition: {"count": 0, "total": 0.0, "buckets": {}} for transition in TRANSITIONS}
+
+    for day in days:
+        for stage, value in day.get("counts", {}).items():
+            counts[stage] = counts.get(stage, 0) + value
+        for transition, stats in day.get("latency", {}).items():
+            target = merged.setdefault(transition, {"count": 0, "total": 0.0, "buckets": {}})
+            target["count"] += stats.get("count", 0)
+            target["total"] += stats.get("total", 0.0)
+            for key, value in stats.get("buckets", {}).items():
+                target["buckets"][key] = target["buckets"].get(key, 0) + value
+
+    latency = {}
+    for transition, stats in merged.items():
+        count = stats["count"]
+        latency[transition] = {
+            "count": count,
+            "avg": timedelta(seconds=stats["total"] / count) if count else None,
+            "p50": _percentile(stats["buckets"], count, 0.5) if count else None,
+            "p90": _percentile(stats["buckets"], count, 0.9) if count else None
+        }
+    return {"counts": counts, "latency": latency}
\ No newline at end of file
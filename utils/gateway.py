@@ -0,0 +1,71 @@
+import os
+import sys
+from typing import Dict, Optional
+
+import nextcord
+
+from config import CHUNK_ON_DEMAND, GATEWAY_PROFILE, GATEWAY_PROFILES
+from utils.guild_stats import guild_stats
+
+def profile_name() -> str:
+    """Active profile: GATEWAY_PROFILE env variable, then config"""
+    name = os.getenv('GATEWAY_PROFILE', GATEWAY_PROFILE)
+    if name not in GATEWAY_PROFILES:
+        print(f"❌ Unknown gateway profile {name}, using {GATEWAY_PROFILE}")
+        name = GATEWAY_PROFILE
+    return name
+
+def build_intents(profile: Dict) -> nextcord.Intents:
+    """Only the events the cogs listen to"""
+    intents = nextcord.Intents.default()
+    intents.members = True  # joins, leaves, role changes
+    intents.message_content = True  # prefix commands, anti-spam, edit logs
+    intents.presences = profile['PRESENCES']
+
+    # Nothing handles these
+    intents.typing = False
+    intents.invites = False
+    intents.webhooks = False
+    intents.integrations = False
+    return intents
+
+def build_member_cache_flags() -> nextcord.MemberCacheFlags:
+    """Joined + voice in every profile (see GATEWAY_PROFILES)"""
+    return nextcord.MemberCacheFlags(joined=True, voice=True)
+
+async def ensure_members(guild: nextcord.Guild) -> bool:
+    """Full member list in the cache: request it when partial and CHUNK_ON_DEMAND is set"""
+    if not guild.chunked and CHUNK_ON_DEMAND:
+        await guild.chunk()
+        # Bot counts were taken from the partial cache
+        guild_stats.recount(guild)
+    return guild.chunked
+
+def rss_bytes() -> Optional[int]:
+    """Resident set size of the process (current on Linux, peak elsewhere)"""
+    try:
+        with open("/proc/self/statm") as statm:
+            return int(statm.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        pass
+    try:
+        import resource
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # Bytes on macOS, kilobytes elsewhere
+        return peak if sys.platform == "darwin" else peak * 1024
+    except (ImportError, OSError):
+        return None
+
+def format_bytes(value: Optional[int]) -> str:
+    return f"{value / (1 << 20):.1f} MB" if value is not None else "невідомо"
+
+def cache_report(bot) -> Dict[str, int]:
+    """Sizes of the caches that grow with the guild"""
+    return {
+        "guilds": len(bot.guilds),
+        "chunked": sum(1 for guild in bot.guilds if guild.chunked),
+        "members": sum(len(guild.members) for guild in bot.guilds),
+        "member_count": sum(guild.member_count or 0 for guild in bot.guilds),
+        "users": len(bot.users),
+        "messages": len(bot.cached_messages)
+    }
\ No newline at end of file
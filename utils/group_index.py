@@ -0,0 +1,83 @@
+from typing import Dict, Optional, Set
+
+import nextcord
+
+from config import GROUP_ROLES
+
+class GroupIndex:
+    """Group membership from the role cache: group -> member ids and member id -> group"""
+
+    def __init__(self):
+        self._members: Dict[str, Set[int]] = {group: set() for group in GROUP_ROLES}
+        self._groups: Dict[int, str] = {}
+        self.built = False
+        self.complete = False  # Built from the full member list, not a partial cache
+
+    def build(self, guild: nextcord.Guild) -> int:
+        """Rebuild from group role members, returns number of indexed members"""
+        members = {group: set() for group in GROUP_ROLES}
+        groups = {}
+
+        for group, role_id in GROUP_ROLES.items():
+            role = guild.get_role(role_id)
+            if not role:
+                continue
+            for member in role.members:
+                # Several group roles: first configured group wins, like the database sync
+                if member.id not in groups:
+                    groups[member.id] = group
+                    members[group].add(member.id)
+
+        self._members = members
+        self._groups = groups
+        self.built = True
+        self.complete = guild.chunked
+        return len(groups)
+
+    def set_group(self, user_id: int, group: Optional[str]):
+        """Move member to group (None removes them from all groups)"""
+        old = self._groups.pop(user_id, None)
+        if old:
+            self._members[old].discard(user_id)
+        if group:
+            self._groups[user_id] = group
+            self._members.setdefault(group, set()).add(user_id)
+
+    def remove(self, user_id: int):
+        self.set_group(user_id, None)
+
+    def group_of(self, user_id: int) -> Optional[str]:
+        return self._groups.get(user_id)
+
+    def members(self, group: str) -> Set[int]:
+        """Member ids of group (read only)"""
+        return self._members.get(group, set())
+
+    def count(self, group: str) -> int:
+        return len(self._members.get(group, ()))
+
+    def counts(self) -> Dict[str, int]:
+        return {group: len(ids) for group, ids in self._members.items()}
+
+    def compare(self, stored: Dict[int, str]) -> Dict[str, Dict[int, tuple]]:
+        """
+        Divergence from persisted assignments (user_id -> group):
+        only_roles, only_database and mismatched, each user_id -> (role group, database group)
+        """
+        report = {"only_roles": {}, "only_database": {}, "mismatched": {}}
+
+        for user_id, group in self._groups.items():
+            stored_group = stored.get(user_id)
+            if stored_group is None:
+                report["only_roles"][user_id] = (group, None)
+            elif stored_group != group:
+                report["mismatched"][user_id] = (group, stored_group)
+
+        for user_id, stored_group in stored.items():
+            if user_id not in self._groups:
+                report["only_database"][user_id] = (None, stored_group)
+
+        return report
+
+# Global group index instance
+group_index = GroupIndex()
\ No newline at end of file
@@ -0,0 +1,96 @@
+import asyncio
+from typing import Dict
+
+import nextcord
+
+STATUSES = ("online", "idle", "dnd", "offline")
+
+class GuildStats:
+    """Per-guild member counters kept up to date from gateway events; reads are O(1)"""
+
+    def __init__(self, recount_interval: float = 600):
+        self.recount_interval = recount_interval
+        self.bot = None
+        self._counts: Dict[int, Dict[str, int]] = {}
+        self._task = None
+
+    @property
+    def started(self) -> bool:
+        return self._task is not None
+
+    def start(self, bot):
+        """Count every guild once and start the periodic recount (idempotent)"""
+        if self.started:
+            return
+        self.bot = bot
+        for guild in bot.guilds:
+            self.recount(guild)
+        self._task = asyncio.create_task(self._run())
+
+    def stop(self):
+        if self._task:
+            self._task.cancel()
+            self._task = None
+
+    def get(self, guild: nextcord.Guild) -> Dict[str, int]:
+        """Counters for guild: bots, online, idle, dnd, offline"""
+        counts = self._counts.get(guild.id)
+        if counts is None:
+            counts = self.recount(guild)
+        return counts
+
+    def recount(self, guild: nextcord.Guild) -> Dict[str, int]:
+        """Single pass over the member cache; corrects any drift"""
+        counts = dict.fromkeys(STATUSES, 0)
+        counts["bots"] = 0
+        for member in guild.members:
+            counts[self._status(member)] += 1
+            if member.bot:
+                counts["bots"] += 1
+        self._counts[guild.id] = counts
+        return counts
+
+    def member_join(self, member: nextcord.Member):
+        counts = self._counts.get(member.guild.id)
+        if counts is None:
+            return
+        counts[self._status(member)] += 1
+        if member.bot:
+            counts["bots"] += 1
+
+    def member_remove(self, member: nextcord.Member):
+        counts = self._counts.get(member.guild.id)
+        if counts is None:
+            return
+        status = self._status(member)
+        counts[status] = max(0, counts[status] - 1)
+        if member.bot:
+            counts["bots"] = max(0, counts["bots"] - 1)
+
+    def presence_update(self, before: nextcord.Member, after: nextcord.Member):
+        counts = self._counts.get(after.guild.id)
+        if counts is None:
+            return
+        old, new = self._status(before), self._status(after)
+        if old != new:
+            counts[old] = max(0, counts[old] - 1)
+            counts[new] += 1
+
+    def _status(self, member: nextcord.Member) -> str:
+        # Invisible members are reported as offline; anything unknown counts as offline too
+        status = str(member.status)
+        return status if status in STATUSES else "offline"
+
+    async def _run(self):
+        while True:
+            await asyncio.sleep(self.recount_interval)
+            for guild in self.bot.guilds:
+                try:
+                    self.recount(guild)
+                except Exception as e:
+                    print(f"❌ Failed to recount stats for {guild.name}: {e}")
+                # Yield between guilds so a big recount does not block the loop
+                await asyncio.sleep(0)
+
+# Global guild stats instance
+guild_stats = GuildStats()
\ No newline at end of file
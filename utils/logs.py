@@ -1,13 +1,34 @@
 import nextcord
 from datetime import datetime
-from typing import Optional
+from typing import Dict, Optional
 from utils.embeds import create_embed, moderation_embed
-from config import CHANNELS
+from config import CHANNELS, EDIT_LOG_DEBOUNCE
 from database.db import db
+from utils.timer_wheel import TimerWheel
+
+# Extra audit sinks (objects with write(record)), registered at startup
+audit_sinks = []
+
+def register_sink(sink):
+    """Add audit sink that receives every logged event"""
+    audit_sinks.append(sink)
+
+def close_sinks():
+    """Flush and close registered sinks (on shutdown)"""
+    while audit_sinks:
+        sink = audit_sinks.pop()
+        close = getattr(sink, "close", None)
+        if close:
+            try:
+                close()
+            except Exception as e:
+                print(f"❌ Failed to close audit sink: {e}")
 
 class Logger:
     def __init__(self, bot):
         self.bot = bot
+        self.pending_edits: Dict[int, Dict] = {}
+        self.edit_timers = TimerWheel()
     
     async def get_log_channel(self) -> Optional[nextcord.TextChannel]:
         """Get the log channel"""
@@ -18,8 +39,28 @@ class Logger:
             print(f"❌ Failed to get log channel: {e}")
             return None
     
+    def _audit(self, action: str, user_id: int, moderator_id: int = None, details: dict = None):
+        """Write event to audit sinks, independent of the LOG channel"""
+        if not audit_sinks:
+            return
+        
+        record = {
+            "action": action,
+            "user_id": user_id,
+            "moderator_id": moderator_id,
+            "details": details or {},
+            "timestamp": datetime.utcnow().isoformat()
+        }
+        for sink in audit_sinks:
+            try:
+                sink.write(record)
+            except Exception as e:
+                print(f"❌ Failed to write audit sink: {e}")
+    
     async def log_user_join(self, member: nextcord.Member):
         """Log when user joins the server"""
+        self._audit("user_join", member.id, details={"username": member.name})
+        
         channel = await self.get_log_channel()
         if not channel:
             return
@@ -43,8 +84,49 @@ class Logger:
         except Exception as e:
             print(f"❌ Failed to log user join: {e}")
     
+    async def log_user_joins(self, members: list):
+        """Log a wave of joins as one entry"""
+        if len(members) == 1:
+            await self.log_user_join(members[0])
+            return
+        
+        for member in members:
+            self._audit("user_join", member.id, details={"username": member.name})
+        
+        channel = await self.get_log_channel()
+        if channel:
+            mentions = " ".join(member.mention for member in members[:50])
+            if len(members) > 50:
+                mentions += f" ... та ще {len(members) - 50}"
+            
+            embed = create_embed(
+                "Користувачі приєдналися",
+                f"**Кількість:** {len(members)}\n"
+                f"**Перший:** <t:{int(members[0].joined_at.timestamp())}:T>\n"
+                f"**Останній:** <t:{int(members[-1].joined_at.timestamp())}:T>",
+                0x00FF00
+            )
+            embed.add_field(name="Користувачі", value=mentions[:1024], inline=False)
+            
+            try:
+                await channel.send(embed=embed)
+            except Exception as e:
+                print(f"❌ Failed to log user joins: {e}")
+        
+        # One bulk insert instead of a log document per member
+        await db.log_actions([{
+            "action": "user_join",
+            "user_id": member.id,
+            "details": {
+                "username": member.name,
+                "discriminator": member.discriminator
+            }
+        } for member in members])
+    
     async def log_user_leave(self, member: nextcord.Member):
         """Log when user leaves the server"""
+        self._audit("user_leave", member.id, details={"username": member.name})
+        
         channel = await self.get_log_channel()
         if not channel:
             return
@@ -74,16 +156,21 @@ class Logger:
     
     async def log_role_update(self, member: nextcord.Member, before_roles, after_roles):
         """Log role changes"""
-        channel = await self.get_log_channel()
-        if not channel:
-            return
-        
         added_roles = [role for role in after_roles if role not in before_roles]
         removed_roles = [role for role in before_roles if role not in after_roles]
         
         if not added_roles and not removed_roles:
             return
         
+        self._audit("role_update", member.id, details={
+            "added_roles": [role.name for role in added_roles],
+            "removed_roles": [role.name for role in removed_roles]
+        })
+        
+        channel = await self.get_log_channel()
+        if not channel:
+            return
+        
         description = f"**Користувач:** {member.mention} ({member.name})\n"
         
         if added_roles:
@@ -108,6 +195,11 @@ class Logger:
     
     async def log_voice_channel_create(self, channel: nextcord.VoiceChannel, owner: nextcord.Member):
         """Log temporary voice channel creation"""
+        self._audit("voice_create", owner.id, details={
+            "channel_id": channel.id,
+            "channel_name": channel.name
+        })
+        
         log_channel = await self.get_log_channel()
         if not log_channel:
             return
@@ -131,6 +223,8 @@ class Logger:
     
     async def log_voice_channel_delete(self, channel_name: str, owner_id: int):
         """Log temporary voice channel deletion"""
+        self._audit("voice_delete", owner_id, details={"channel_name": channel_name})
+        
         log_channel = await self.get_log_channel()
         if not log_channel:
             return
@@ -152,27 +246,87 @@ class Logger:
     
     async def log_moderation_action(self, action: str, target: nextcord.Member, 
                                    moderator: nextcord.Member, reason: str = None, 
-                                   duration: str = None):
+                                   duration: str = None, case_id: int = None):
         """Log moderation actions"""
+        self._audit(f"moderation_{action}", target.id, moderator.id, {
+            "reason": reason,
+            "duration": duration,
+            "case_id": case_id
+        })
+        
         channel = await self.get_log_channel()
         if not channel:
             return
         
-        embed = moderation_embed(action, target, moderator, reason, duration)
+        embed = moderation_embed(action, target, moderator, reason, duration, case_id)
         
         try:
             await channel.send(embed=embed)
             await db.log_action(f"moderation_{action}", target.id, moderator.id, {
                 "reason": reason,
                 "duration": duration,
+                "case_id": case_id,
                 "target_username": target.name,
                 "moderator_username": moderator.name
             })
         except Exception as e:
             print(f"❌ Failed to log moderation action: {e}")
     
+    async def log_mass_moderation(self, action: str, moderator: nextcord.Member, 
+                                  succeeded: list, failed: list, reason: str = None,
+                                  first_case: int = None):
+        """Log mass moderation action as one entry"""
+        self._audit(f"moderation_mass_{action}", moderator.id, moderator.id, {
+            "reason": reason,
+            "first_case": first_case,
+            "succeeded": succeeded,
+            "failed": failed
+        })
+        
+        channel = await self.get_log_channel()
+        if not channel:
+            return
+        
+        action_names = {"ban": "Масовий бан", "kick": "Масовий кік"}
+        targets = " ".join(f"<@{user_id}>" for user_id in succeeded[:50])
+        if len(succeeded) > 50:
+            targets += f" ... та ще {len(succeeded) - 50}"
+        
+        embed = create_embed(
+            f"Дія модерації: {action_names.get(action, action)}",
+            f"**Модератор:** {moderator.mention} ({moderator.name})\n"
+            f"**Причина:** {reason or 'Не вказана'}\n"
+            f"**Успішно:** {len(succeeded)}\n"
+            f"**Помилок:** {len(failed)}",
+            0xFF0000
+        )
+        if targets:
+            embed.add_field(name="Користувачі", value=targets[:1024], inline=False)
+        if first_case and succeeded:
+            embed.set_footer(text=f"Справи #{first_case}–#{first_case + len(succeeded) - 1}")
+        
+        try:
+            await channel.send(embed=embed)
+        except Exception as e:
+            print(f"❌ Failed to log mass moderation: {e}")
+        
+        # One bulk insert instead of a log document per target
+        await db.log_actions([{
+            "action": f"moderation_{action}",
+            "user_id": user_id,
+            "moderator_id": moderator.id,
+            "details": {
+                "reason": reason,
+                "mass": True,
+                "case_id": first_case + i if first_case else None,
+                "moderator_username": moderator.name
+            }
+        } for i, user_id in enumerate(succeeded)])
+    
     async def log_application_submitted(self, user: nextcord.Member, group: str, full_name: str):
         """Log group application submission"""
+        self._audit("application_submitted", user.id, details={"group": group, "full_name": full_name})
+        
         channel = await self.get_log_channel()
         if not channel:
             return
@@ -198,6 +352,8 @@ class Logger:
     async def log_application_reviewed(self, user_id: int, group: str, status: str, 
                                      reviewer: nextcord.Member):
         """Log application review"""
+        self._audit("application_reviewed", user_id, reviewer.id, {"group": group, "status": status})
+        
         channel = await self.get_log_channel()
         if not channel:
             return
@@ -223,10 +379,56 @@ class Logger:
         except Exception as e:
             print(f"❌ Failed to log application review: {e}")
     
+    async def log_applications_bulk_approved(self, group: str, reviewer: nextcord.Member,
+                                             approved: list, failed: list):
+        """Log bulk approval as one entry"""
+        self._audit("applications_bulk_approved", reviewer.id, reviewer.id, {
+            "group": group,
+            "approved": approved,
+            "failed": failed
+        })
+        
+        channel = await self.get_log_channel()
+        if channel:
+            users = " ".join(f"<@{user_id}>" for user_id in approved[:50])
+            if len(approved) > 50:
+                users += f" ... та ще {len(approved) - 50}"
+            
+            embed = create_embed(
+                "Заявки схвалено масово",
+                f"**Група:** {group}\n"
+                f"**Схвалено:** {len(approved)}\n"
+                f"**Помилок:** {len(failed)}\n"
+                f"**Переглянув:** {reviewer.mention}",
+                0x00FF00
+            )
+            if users:
+                embed.add_field(name="Користувачі", value=users[:1024], inline=False)
+            
+            try:
+                await channel.send(embed=embed)
+            except Exception as e:
+                print(f"❌ Failed to log bulk approval: {e}")
+        
+        # One bulk insert instead of a log document per application
+        await db.log_actions([{
+            "action": "application_reviewed",
+            "user_id": user_id,
+            "moderator_id": reviewer.id,
+            "details": {"group": group, "status": "approved", "bulk": True}
+        } for user_id in approved])
+    
     async def log_message_delete(self, message: nextcord.Message):
         """Log deleted messages"""
         if message.author.bot:
             return
+        
+        self._audit("message_delete", message.author.id, details={
+            "channel_id": message.channel.id,
+            "message_id": message.id,
+            "content": message.content,
+            "attachments": [att.filename for att in message.attachments]
+        })
             
         channel = await self.get_log_channel()
         if not channel:
@@ -250,35 +452,72 @@ class Logger:
             print(f"❌ Failed to log message deletion: {e}")
     
     async def log_message_edit(self, before: nextcord.Message, after: nextcord.Message):
-        """Log edited messages"""
+        """Collect message edit; repeated edits are logged once after EDIT_LOG_DEBOUNCE"""
         if before.author.bot or before.content == after.content:
             return
-            
+        
+        pending = self.pending_edits.get(after.id)
+        if pending is None:
+            pending = {
+                "author": before.author,
+                "channel": before.channel,
+                "original": before.content,
+                "edits": 0
+            }
+            self.pending_edits[after.id] = pending
+        
+        pending["final"] = after.content
+        pending["edits"] += 1
+        
+        self.edit_timers.schedule(
+            after.id, EDIT_LOG_DEBOUNCE, lambda: self._flush_message_edit(after.id)
+        )
+    
+    async def _flush_message_edit(self, message_id: int):
+        """Log collapsed edits of one message"""
+        pending = self.pending_edits.pop(message_id, None)
+        if not pending or pending["original"] == pending["final"]:
+            return
+        
+        self._audit("message_edit", pending["author"].id, details={
+            "channel_id": pending["channel"].id,
+            "message_id": message_id,
+            "before": pending["original"],
+            "after": pending["final"],
+            "edits": pending["edits"]
+        })
+        
         channel = await self.get_log_channel()
         if not channel:
             return
         
+        original = pending["original"]
+        final = pending["final"]
+        
         embed = create_embed(
             "Повідомлення відредаговано",
-            f"**Автор:** {before.author.mention} ({before.author.name})\n"
-            f"**Канал:** {before.channel.mention}",
+            f"**Автор:** {pending['author'].mention} ({pending['author'].name})\n"
+            f"**Канал:** {pending['channel'].mention}",
             0xFFFF00
         )
         
-        if before.content:
+        if original:
             embed.add_field(
                 name="До редагування",
-                value=before.content[:1000] + ("..." if len(before.content) > 1000 else ""),
+                value=original[:1000] + ("..." if len(original) > 1000 else ""),
                 inline=False
             )
         
-        if after.content:
+        if final:
             embed.add_field(
                 name="Після редагування", 
-                value=after.content[:1000] + ("..." if len(after.content) > 1000 else ""),
+                value=final[:1000] + ("..." if len(final) > 1000 else ""),
                 inline=False
             )
         
+        if pending["edits"] > 1:
+            embed.set_footer(text=f"Редагувань: {pending['edits']}")
+        
         try:
             await channel.send(embed=embed)
         except Exception as e:
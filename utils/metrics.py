@@ -0,0 +1,47 @@
+import time
+from collections import deque
+from contextlib import contextmanager
+from typing import Deque, Dict
+
+class LatencyStats:
+    """Per-name latency counters with a bounded window for percentiles"""
+
+    def __init__(self, window: int = 200):
+        self.window = window
+        self._stats: Dict[str, Dict] = {}
+
+    def record(self, name: str, seconds: float):
+        stats = self._stats.setdefault(name, {
+            "count": 0,
+            "total": 0.0,
+            "max": 0.0,
+            "recent": deque(maxlen=self.window)
+        })
+        stats["count"] += 1
+        stats["total"] += seconds
+        stats["max"] = max(stats["max"], seconds)
+        stats["recent"].append(seconds)
+
+    @contextmanager
+    def measure(self, name: str):
+        """Record wall time of the with-block under name"""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, time.perf_counter() - started)
+
+    def summary(self) -> Dict[str, Dict]:
+        """Count, average, p95 and max in milliseconds per name"""
+        result = {}
+        for name, stats in self._stats.items():
+            recent: Deque[float] = stats["recent"]
+            ordered = sorted(recent)
+            p95 = ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))] if ordered else 0.0
+            result[name] = {
+                "count": stats["count"],
+                "avg_ms": stats["total"] / stats["count"] * 1000,
+                "p95_ms": p95 * 1000,
+                "max_ms": stats["max"] * 1000
+            }
+        return result
\ No newline at end of file
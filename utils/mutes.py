@@ -0,0 +1,130 @@
+import asyncio
+import heapq
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Tuple
+
+import nextcord
+
+from database.db import db
+
+# Discord caps a single timeout at 28 days; longer mutes are re-applied in chunks
+TIMEOUT_CHUNK = timedelta(days=28) - timedelta(minutes=5)
+REAPPLY_MARGIN = timedelta(minutes=1)
+
+def timeout_until(muted_until: datetime, now: datetime = None) -> datetime:
+    """End of the Discord timeout that can be applied now for a mute"""
+    now = now or datetime.utcnow()
+    return min(muted_until, now + TIMEOUT_CHUNK)
+
+class MuteScheduler:
+    """Min-heap of mute deadlines served by one task that sleeps until the earliest"""
+
+    def __init__(self, bot):
+        self.bot = bot
+        self._heap: List[Tuple[datetime, int, datetime]] = []  # (action_at, user_id, muted_until)
+        self._muted_until: Dict[int, datetime] = {}
+        self._wakeup = asyncio.Event()
+        self._task = None
+
+    def __len__(self) -> int:
+        return len(self._muted_until)
+
+    @property
+    def started(self) -> bool:
+        return self._task is not None
+
+    async def load(self):
+        """Load pending mutes from the database and start the scheduler"""
+        pending = await db.get_pending_mutes()
+        now = datetime.utcnow()
+
+        for user_data in pending:
+            # Re-check every mute once at startup: long mutes may need their next chunk
+            self._push(now, user_data['user_id'], user_data['muted_until'])
+
+        self._task = asyncio.create_task(self._run())
+        print(f"✅ Mute scheduler loaded {len(pending)} pending mutes")
+
+    def stop(self):
+        if self._task:
+            self._task.cancel()
+            self._task = None
+
+    def schedule(self, user_id: int, muted_until: datetime, timeout_end: datetime = None):
+        """Track mute; timeout_end is when the applied Discord timeout runs out"""
+        timeout_end = timeout_end or timeout_until(muted_until)
+        action_at = muted_until if timeout_end >= muted_until else timeout_end - REAPPLY_MARGIN
+        self._push(action_at, user_id, muted_until)
+
+    def cancel(self, user_id: int):
+        """Forget mute; its heap entry is dropped lazily"""
+        self._muted_until.pop(user_id, None)
+
+    def _push(self, action_at: datetime, user_id: int, muted_until: datetime):
+        self._muted_until[user_id] = muted_until
+        heapq.heappush(self._heap, (action_at, user_id, muted_until))
+
+        # Drop stale entries once they dominate the heap
+        if len(self._heap) > 2 * len(self._muted_until) + 1024:
+            self._heap = [entry for entry in self._heap if self._muted_until.get(entry[1]) == entry[2]]
+            heapq.heapify(self._heap)
+
+        if self._heap[0][1] == user_id:
+            self._wakeup.set()
+
+    async def _run(self):
+        """Sleep until the next deadline instead of polling"""
+        while True:
+            self._wakeup.clear()
+
+            if not self._heap:
+                await self._wakeup.wait()
+                continue
+
+            action_at, user_id, muted_until = self._heap[0]
+            if self._muted_until.get(user_id) != muted_until:
+                heapq.heappop(self._heap)
+                continue
+
+            delay = (action_at - datetime.utcnow()).total_seconds()
+            if delay > 0:
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), timeout=delay)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+
+            heapq.heappop(self._heap)
+            try:
+                await self._process(user_id, muted_until)
+            except Exception as e:
+                print(f"❌ Failed to process mute for user {user_id}: {e}")
+
+    async def _process(self, user_id: int, muted_until: datetime):
+        """Expire mute or re-apply the next timeout chunk"""
+        now = datetime.utcnow()
+
+        if muted_until <= now:
+            self._muted_until.pop(user_id, None)
+            await db.clear_user_mute(user_id, muted_until)
+            print(f"✅ Mute expired for user {user_id}")
+            return
+
+        target = timeout_until(muted_until, now)
+        member = self._find_member(user_id)
+
+        if member:
+            current = member.communication_disabled_until
+            if current is not None:
+                current = current.replace(tzinfo=None)
+            if current is None or current < target - REAPPLY_MARGIN:
+                await member.timeout(target, reason="Продовження тривалого заглушення")
+
+        self.schedule(user_id, muted_until, target)
+
+    def _find_member(self, user_id: int) -> Optional[nextcord.Member]:
+        for guild in self.bot.guilds:
+            member = guild.get_member(user_id)
+            if member:
+                return member
+        return None
\ No newline at end of file
@@ -0,0 +1,177 @@
+from abc import ABC, abstractmethod
+from typing import Awaitable, Callable, List, Optional, Sequence, Tuple
+
+import nextcord
+
+from utils.embeds import error_embed
+
+class PageSource(ABC):
+    """Fetches one page of rows at a time"""
+
+    def __init__(self, page_size: int = 10):
+        self.page_size = page_size
+
+    @property
+    def total_pages(self) -> Optional[int]:
+        """Number of pages if known upfront"""
+        return None
+
+    @abstractmethod
+    async def fetch(self, page: int) -> Tuple[List, bool]:
+        """Rows of page and whether a next page exists"""
+
+class ListPageSource(PageSource):
+    """Pages over an in-memory sequence (e.g. an index); rows are sliced on demand"""
+
+    def __init__(self, items: Sequence, page_size: int = 10):
+        super().__init__(page_size)
+        self.items = items
+
+    @property
+    def total_pages(self) -> Optional[int]:
+        return max(1, -(-len(self.items) // self.page_size))
+
+    async def fetch(self, page: int) -> Tuple[List, bool]:
+        start = page * self.page_size
+        return list(self.items[start:start + self.page_size]), start + self.page_size < len(self.items)
+
+class KeysetPageSource(PageSource):
+    """
+    Pages over a keyset-paginated query: query(after, limit) returns rows after the cursor,
+    key(row) gives the cursor of a row. Only page start cursors are kept.
+    """
+
+    def __init__(self, query: Callable[[object, int], Awaitable[List]], key: Callable[[object], object],
+                 page_size: int = 10, total: int = None):
+        super().__init__(page_size)
+        self.query = query
+        self.key = key
+        self.total = total
+        self.cursors = [None]  # Cursor for the start of each reached page
+
+    @property
+    def total_pages(self) -> Optional[int]:
+        if self.total is None:
+            return None
+        return max(1, -(-self.total // self.page_size))
+
+    async def fetch(self, page: int) -> Tuple[List, bool]:
+        # Walk forward from the last known cursor when jumping past reached pages
+        while len(self.cursors) <= page:
+            _, has_next = await self._fetch_at(len(self.cursors) - 1)
+            if not has_next:
+                break
+
+        page = min(page, len(self.cursors) - 1)
+        return await self._fetch_at(page)
+
+    async def _fetch_at(self, page: int) -> Tuple[List, bool]:
+        # One extra row tells if there is a next page
+        rows = await self.query(self.cursors[page], self.page_size + 1)
+        has_next = len(rows) > self.page_size
+        rows = rows[:self.page_size]
+
+        if has_next and len(self.cursors) == page + 1:
+            self.cursors.append(self.key(rows[-1]))
+        return rows, has_next
+
+class JumpModal(nextcord.ui.Modal):
+    """Ask for a page number"""
+
+    def __init__(self, paginator: "Paginator"):
+        super().__init__(title="Перейти до сторінки")
+        self.paginator = paginator
+
+        total = paginator.source.total_pages
+        self.page_number = nextcord.ui.TextInput(
+            label=f"Номер сторінки (1-{total})" if total else "Номер сторінки",
+            min_length=1,
+            max_length=6,
+            required=True
+        )
+        self.add_item(self.page_number)
+
+    async def callback(self, interaction: nextcord.Interaction):
+        value = self.page_number.value.strip()
+        if not value.isdigit() or int(value) < 1:
+            await interaction.response.send_message(
+                embed=error_embed("Помилка", "Введіть номер сторінки."),
+                ephemeral=True
+            )
+            return
+
+        await self.paginator.show(interaction, int(value) - 1)
+
+class Paginator(nextcord.ui.View):
+    """
+    Prev/next/jump buttons over a PageSource; render(rows, page) builds the embed.
+    Only the rows of the current page are held.
+    """
+
+    def __init__(self, author_id: int, source: PageSource,
+                 render: Callable[[List, int], nextcord.Embed], timeout: float = 300):
+        super().__init__(timeout=timeout)
+        self.author_id = author_id
+        self.source = source
+        self.render = render
+        self.page = 0
+        self.message = None
+
+    async def send(self, messageable: nextcord.abc.Messageable) -> nextcord.Message:
+        """Send the first page"""
+        embed = await self._load(0)
+        self.message = await messageable.send(embed=embed, view=self)
+        return self.message
+
+    async def show(self, interaction: nextcord.Interaction, page: int):
+        """Switch to page in response to an interaction"""
+        embed = await self._load(page)
+        await interaction.response.edit_message(embed=embed, view=self)
+
+    async def _load(self, page: int) -> nextcord.Embed:
+        total = self.source.total_pages
+        if total is not None:
+            page = min(page, total - 1)
+        page = max(0, page)
+
+        rows, has_next = await self.source.fetch(page)
+        if isinstance(self.source, KeysetPageSource):
+            # Keyset source clamps jumps past the last page
+            page = min(page, len(self.source.cursors) - 1)
+        self.page = page
+
+        self.previous_page.disabled = page == 0
+        self.next_page.disabled = not has_next
+        self.jump.disabled = total == 1 or (page == 0 and not has_next)
+
+        embed = self.render(rows, page)
+        embed.set_footer(text=f"Сторінка {page + 1}/{total}" if total else f"Сторінка {page + 1}")
+        return embed
+
+    async def interaction_check(self, interaction: nextcord.Interaction) -> bool:
+        if interaction.user.id != self.author_id:
+            await interaction.response.send_message(
+                embed=error_embed("Помилка доступу", "Тільки автор запиту може гортати результати."),
+                ephemeral=True
+            )
+            return False
+        return True
+
+    async def on_timeout(self):
+        if self.message:
+            try:
+                await self.message.edit(view=None)
+            except nextcord.HTTPException:
+                pass
+
+    @nextcord.ui.button(label="Назад", style=nextcord.ButtonStyle.secondary, emoji="◀️")
+    async def previous_page(self, button: nextcord.ui.Button, interaction: nextcord.Interaction):
+        await self.show(interaction, self.page - 1)
+
+    @nextcord.ui.button(label="Перейти", style=nextcord.ButtonStyle.secondary, emoji="🔢")
+    async def jump(self, button: nextcord.ui.Button, interaction: nextcord.Interaction):
+        await interaction.response.send_modal(JumpModal(self))
+
+    @nextcord.ui.button(label="Далі", style=nextcord.ButtonStyle.secondary, emoji="▶️")
+    async def next_page(self, button: nextcord.ui.Button, interaction: nextcord.Interaction):
+        await self.show(interaction, self.page + 1)
\ No newline at end of file
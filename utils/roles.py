@@ -0,0 +1,68 @@
+import time
+from typing import Dict, List, Optional
+
+import nextcord
+
+from config import GROUP_ROLES, ROLES
+
+# Members whose group role the bot is changing and whose database row the caller writes:
+# user_id -> monotonic expiry. The resulting member update must not write it again.
+MANAGED_EDIT_TTL = 60.0
+_managed_edits: Dict[int, float] = {}
+
+def consume_managed_edit(user_id: int) -> bool:
+    """True once for a member update caused by set_group_role"""
+    expires = _managed_edits.pop(user_id, None)
+    return expires is not None and expires >= time.monotonic()
+
+def normalize_group_name(name: str) -> Optional[str]:
+    """'51', 'іп-51' or 'ІП-51' -> 'ІП-51'; None if no such group"""
+    name = name.strip().upper()
+    if not name.startswith("ІП-"):
+        name = f"ІП-{name}"
+    # Case-insensitive match keeps names like 'ІП-о51' reachable
+    for group in GROUP_ROLES:
+        if group.upper() == name:
+            return group
+    return None
+
+def group_role_set(member: nextcord.Member, group: Optional[str]) -> List[nextcord.Role]:
+    """
+    Final roles for member in group: every non-group role kept, one group role,
+    guest role only without a group. @everyone is never included.
+    """
+    guild = member.guild
+    replaced = set(GROUP_ROLES.values())
+    replaced.add(ROLES['GUEST'])
+
+    roles = [role for role in member.roles if not role.is_default() and role.id not in replaced]
+
+    target = guild.get_role(GROUP_ROLES[group] if group else ROLES['GUEST'])
+    if target:
+        roles.append(target)
+    return roles
+
+async def set_group_role(member: nextcord.Member, group: Optional[str], reason: str = None) -> bool:
+    """
+    Move member to group (None: back to guest) with a single member edit.
+    The caller persists the group; the member update it causes only refreshes the index.
+    Returns False without calling Discord when the roles are already in place.
+    """
+    roles = group_role_set(member, group)
+
+    current_ids = {role.id for role in member.roles if not role.is_default()}
+    if {role.id for role in roles} == current_ids:
+        return False
+
+    now = time.monotonic()
+    if len(_managed_edits) > 1000:
+        for user_id in [user_id for user_id, expires in _managed_edits.items() if expires < now]:
+            del _managed_edits[user_id]
+
+    _managed_edits[member.id] = now + MANAGED_EDIT_TTL
+    try:
+        await member.edit(roles=roles, reason=reason)
+    except Exception:
+        _managed_edits.pop(member.id, None)
+        raise
+    return True
\ No newline at end of file
@@ -0,0 +1,271 @@
+import asyncio
+import csv
+import io
+import re
+import time
+from typing import Dict, List, Optional, Tuple
+
+import nextcord
+
+from config import ROLLOVER
+from database.db import db
+from utils.embeds import info_embed, success_embed, warning_embed
+from utils.roles import normalize_group_name, set_group_role
+from utils.workers import RateLimiter, run_pool
+
+JOB_TYPE = "group_rollover"
+
+# Target group values that mean "no group" (graduates, expelled)
+ARCHIVE_VALUES = {"", "-", "none", "archive", "архів"}
+
+def parse_rollover_rules(rules: str) -> Optional[Dict[str, Optional[str]]]:
+    """Parse '51>52 56>archive' into {old group: new group or None}"""
+    mapping = {}
+    for token in rules.split():
+        old, sep, new = token.partition(">")
+        if not sep:
+            return None
+        old_group = normalize_group_name(old)
+        if not old_group:
+            return None
+        if new.strip().lower() in ARCHIVE_VALUES:
+            mapping[old_group] = None
+        else:
+            new_group = normalize_group_name(new)
+            if not new_group:
+                return None
+            mapping[old_group] = new_group
+    return mapping or None
+
+def parse_rollover_csv(data: bytes) -> Tuple[List[Dict], List[int]]:
+    """Parse 'user_id,group' rows; returns (items, numbers of invalid rows)"""
+    items = []
+    invalid = []
+    reader = csv.reader(io.StringIO(data.decode("utf-8-sig")))
+
+    for number, row in enumerate(reader, 1):
+        if not row or not any(cell.strip() for cell in row):
+            continue
+
+        match = re.search(r"\d{15,20}", row[0])
+        if not match:
+            # Header row
+            if number == 1:
+                continue
+            invalid.append(number)
+            continue
+
+        target = row[1] if len(row) > 1 else ""
+        if target.strip().lower() in ARCHIVE_VALUES:
+            group = None
+        else:
+            group = normalize_group_name(target)
+            if not group:
+                invalid.append(number)
+                continue
+        items.append({"user_id": int(match.group()), "group": group})
+
+    return items, invalid
+
+class RolloverRunner:
+    """
+    Runs group rollover jobs in batches: rate-limited role edits, one bulk_write per batch,
+    then a checkpoint in the jobs collection. A batch interrupted by a restart is redone;
+    role edits and group updates are idempotent.
+    """
+
+    def __init__(self, bot):
+        self.bot = bot
+        self._tasks: Dict[str, asyncio.Task] = {}
+        self._cancelled: Dict[str, asyncio.Event] = {}
+
+    @property
+    def running(self) -> List[str]:
+        return list(self._tasks)
+
+    async def create(self, guild: nextcord.Guild, channel: nextcord.abc.Messageable,
+                     author: nextcord.Member, items: List[Dict], source: str) -> Optional[str]:
+        """Store a new job and start it"""
+        message = await channel.send(
+            embed=info_embed("Перенесення груп", f"Підготовка завдання для **{len(items)}** користувачів...")
+        )
+        job_id = await db.create_job(JOB_TYPE, {
+            "guild_id": guild.id,
+            "channel_id": message.channel.id,
+            "message_id": message.id,
+            "created_by": author.id,
+            "source": source,
+            "items": items,
+            "total": len(items),
+            "succeeded": 0,
+            "missing": 0,
+            "failed": 0
+        })
+        if not job_id:
+            await message.edit(embed=warning_embed("Перенесення груп", "Не вдалося створити завдання."))
+            return None
+
+        job = await db.get_job(job_id)
+        self.start(job)
+        return job_id
+
+    async def resume_all(self):
+        """Resume jobs left running by a restart"""
+        jobs = await db.get_jobs(JOB_TYPE, "running")
+        for job in jobs:
+            self.start(job)
+        if jobs:
+            print(f"✅ Resumed {len(jobs)} rollover jobs")
+
+    def start(self, job: Dict):
+        job_id = str(job["_id"])
+        if job_id in self._tasks:
+            return
+        self._cancelled[job_id] = asyncio.Event()
+        task = asyncio.create_task(self._run(job))
+        self._tasks[job_id] = task
+        task.add_done_callback(lambda _: self._finish(job_id))
+
+    async def cancel(self, job_id: str) -> bool:
+        """Stop job after the current batch; False if no such job is running"""
+        event = self._cancelled.get(job_id)
+        if event:
+            event.set()
+            return True
+        # Not running here (e.g. interrupted before resume): completed and failed jobs stay as they are
+        return await db.update_job(job_id, {"status": "cancelled"}, status="running")
+
+    def stop(self):
+        """Stop tasks without changing job status, they resume on next start"""
+        for task in self._tasks.values():
+            task.cancel()
+
+    def _finish(self, job_id: str):
+        self._tasks.pop(job_id, None)
+        self._cancelled.pop(job_id, None)
+
+    async def _run(self, job: Dict):
+        job_id = str(job["_id"])
+        cancelled = self._cancelled[job_id]
+        guild = self.bot.get_guild(job["guild_id"])
+        if not guild:
+            # Otherwise the job stays running and is resumed on every start
+            print(f"❌ Rollover job {job_id}: guild not found")
+            await db.update_job(job_id, {"status": "failed", "error": "guild not found"})
+            return
+
+        message = await self._progress_message(job)
+        limiter = RateLimiter(ROLLOVER['RATE'], ROLLOVER['PER'])
+        items = job["items"]
+        cursor = job["cursor"]
+        counts = {key: job.get(key, 0) for key in ("succeeded", "missing", "failed")}
+        last_update = 0.0
+
+        try:
+            while cursor < len(items) and not cancelled.is_set():
+                batch = items[cursor:cursor + ROLLOVER['BATCH_SIZE']]
+                batch_counts, processed = await self._run_batch(guild, job_id, batch, limiter, cancelled)
+                # A cancel mid-batch leaves the rest of the batch for a resumed run
+                cursor += processed
+
+                # Checkpoint only after the batch is persisted
+                await db.update_job(job_id, {"cursor": cursor}, batch_counts)
+                for key, value in batch_counts.items():
+                    counts[key] += value
+
+                if time.monotonic() - last_update >= 3 or cursor >= len(items):
+                    last_update = time.monotonic()
+                    await self._report(message, cursor, len(items), counts)
+
+            status = "cancelled" if cancelled.is_set() else "completed"
+            await db.update_job(job_id, {"status": status})
+            await self._report(message, cursor, len(items), counts, status)
+            await db.log_action(f"{JOB_TYPE}_{status}", job["created_by"], job["created_by"], {
+                "job_id": job_id,
+                "source": job.get("source"),
+                **counts
+            })
+            print(f"✅ Rollover job {job_id} {status}: {counts}")
+
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            print(f"❌ Rollover job {job_id} failed: {e}")
+            await db.update_job(job_id, {"status": "failed", "error": str(e)})
+
+    async def _run_batch(self, guild: nextcord.Guild, job_id: str, batch: List[Dict],
+                         limiter: RateLimiter, cancelled: asyncio.Event) -> Tuple[Dict[str, int], int]:
+        """
+        Edit roles of members on the server, then persist the handled items with one bulk_write.
+        Returns (counters, number of leading batch items handled).
+        """
+        present = []
+        for item in batch:
+            member = guild.get_member(item["user_id"])
+            if member:
+                present.append((member, item["group"]))
+
+        async def worker(entry):
+            member, group = entry
+            await set_group_role(member, group, reason=f"Перенесення груп (завдання {job_id})")
+
+        succeeded, failed = await run_pool(
+            present,
+            worker,
+            concurrency=ROLLOVER['CONCURRENCY'],
+            limiter=limiter,
+            cancelled=cancelled
+        )
+        for (member, _), error in failed:
+            print(f"❌ Rollover failed for {member.name}: {error}")
+
+        failed_ids = {member.id for (member, _), _ in failed}
+        done_ids = {member.id for member, _ in succeeded}
+        present_ids = {member.id for member, _ in present}
+
+        # The pool takes members in order, so a cancel leaves an unreached suffix
+        handled_ids = done_ids | failed_ids
+        processed = next(
+            (index for index, item in enumerate(batch)
+             if item["user_id"] in present_ids and item["user_id"] not in handled_ids),
+            len(batch)
+        )
+        handled = batch[:processed]
+
+        # Database follows the roster even for members who left the server
+        await db.bulk_update_user_groups([
+            (item["user_id"], item["group"]) for item in handled
+            if item["user_id"] in done_ids or item["user_id"] not in present_ids
+        ])
+
+        missing = sum(1 for item in handled if item["user_id"] not in present_ids)
+        return {"succeeded": len(succeeded), "missing": missing, "failed": len(failed_ids)}, processed
+
+    async def _progress_message(self, job: Dict) -> Optional[nextcord.Message]:
+        channel = self.bot.get_channel(job["channel_id"])
+        if not channel:
+            return None
+        return channel.get_partial_message(job["message_id"])
+
+    async def _report(self, message: Optional[nextcord.Message], done: int, total: int,
+                      counts: Dict[str, int], status: str = None):
+        if not message:
+            return
+
+        description = (
+            f"**Оброблено:** {done}/{total}\n"
+            f"**Успішно:** {counts['succeeded']}\n"
+            f"**Немає на сервері:** {counts['missing']} (оновлено лише в базі)\n"
+            f"**Помилок:** {counts['failed']}"
+        )
+        if status == "completed":
+            embed = success_embed("Перенесення груп завершено", description)
+        elif status == "cancelled":
+            embed = warning_embed("Перенесення груп скасовано", description)
+        else:
+            embed = info_embed("Перенесення груп: виконується", description)
+
+        try:
+            await message.edit(embed=embed)
+        except nextcord.HTTPException as e:
+            print(f"❌ Failed to update rollover progress: {e}")
\ No newline at end of file
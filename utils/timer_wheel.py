@@ -0,0 +1,77 @@
+import asyncio
+import math
+from typing import Callable, Dict, Hashable, List
+
+class TimerWheel:
+    """Hashed timing wheel: O(1) schedule/cancel, one ticking task for all timers"""
+
+    def __init__(self, tick: float = 1.0, slots: int = 64):
+        self.tick = tick
+        self.slots: List[Dict[Hashable, list]] = [{} for _ in range(slots)]
+        self.position = 0
+        self._timers: Dict[Hashable, int] = {}  # key -> slot index
+        self._task = None
+        self._running = set()
+
+    def __len__(self) -> int:
+        return len(self._timers)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._timers
+
+    def schedule(self, key: Hashable, delay: float, callback: Callable):
+        """Fire callback after delay seconds, replacing any timer with the same key"""
+        self.cancel(key)
+
+        ticks = max(1, math.ceil(delay / self.tick))
+        slot = (self.position + ticks) % len(self.slots)
+        rounds = (ticks - 1) // len(self.slots)
+
+        self.slots[slot][key] = [rounds, callback]
+        self._timers[key] = slot
+
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    def cancel(self, key: Hashable) -> bool:
+        """Cancel pending timer, returns True if it existed"""
+        slot = self._timers.pop(key, None)
+        if slot is None:
+            return False
+        self.slots[slot].pop(key, None)
+        return True
+
+    async def _run(self):
+        """Advance the wheel while there are pending timers"""
+        loop = asyncio.get_running_loop()
+        next_tick = loop.time() + self.tick
+
+        while self._timers:
+            await asyncio.sleep(max(0, next_tick - loop.time()))
+
+            # Catch up on ticks missed while the loop was busy
+            while next_tick <= loop.time() and self._timers:
+                next_tick += self.tick
+                self.position = (self.position + 1) % len(self.slots)
+                self._expire(self.slots[self.position])
+
+    def _expire(self, bucket: Dict[Hashable, list]):
+        """Fire due timers of the current slot"""
+        due = []
+        for key, entry in list(bucket.items()):
+            if entry[0] > 0:
+                entry[0] -= 1
+                continue
+            del bucket[key]
+            del self._timers[key]
+            due.append(entry[1])
+
+        for callback in due:
+            try:
+                result = callback()
+                if asyncio.iscoroutine(result):
+                    task = asyncio.create_task(result)
+                    self._running.add(task)
+                    task.add_done_callback(self._running.discard)
+            except Exception as e:
+                print(f"❌ Timer callback failed: {e}")
\ No newline at end of file
@@ -0,0 +1,91 @@
+import asyncio
+from typing import Awaitable, Callable, Iterable, List, Optional, Tuple
+
+class RateLimiter:
+    """Token bucket: at most `rate` acquisitions per `per` seconds"""
+
+    def __init__(self, rate: int, per: float = 1.0):
+        self.rate = rate
+        self.per = per
+        self._tokens = float(rate)
+        self._updated = None
+        self._blocked_until = 0.0
+        self._lock = asyncio.Lock()
+
+    async def acquire(self):
+        """Wait for a token"""
+        loop = asyncio.get_running_loop()
+        async with self._lock:
+            while True:
+                now = loop.time()
+                if self._updated is None:
+                    self._updated = now
+
+                if now < self._blocked_until:
+                    await asyncio.sleep(self._blocked_until - now)
+                    continue
+
+                self._tokens = min(self.rate, self._tokens + (now - self._updated) * self.rate / self.per)
+                self._updated = now
+
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+
+                await asyncio.sleep((1 - self._tokens) * self.per / self.rate)
+
+    def penalize(self, retry_after: float):
+        """Pause the bucket after a 429 from Discord"""
+        loop = asyncio.get_running_loop()
+        self._blocked_until = max(self._blocked_until, loop.time() + retry_after)
+        self._tokens = 0
+
+async def run_pool(items: Iterable, worker: Callable[..., Awaitable], concurrency: int = 4,
+                   limiter: Optional[RateLimiter] = None, retries: int = 2,
+                   on_progress: Callable[[int, int], Awaitable] = None,
+                   cancelled: asyncio.Event = None) -> Tuple[List, List[Tuple[object, Exception]]]:
+    """
+    Run worker(item) for every item with bounded concurrency.
+    Returns (succeeded items, [(failed item, error)]).
+    """
+    items = list(items)
+    queue: asyncio.Queue = asyncio.Queue()
+    for item in items:
+        queue.put_nowait(item)
+
+    succeeded = []
+    failed = []
+    done = 0
+
+    async def run_worker():
+        nonlocal done
+        while not queue.empty():
+            if cancelled and cancelled.is_set():
+                return
+            item = queue.get_nowait()
+
+            for attempt in range(retries + 1):
+                if limiter:
+                    await limiter.acquire()
+                try:
+                    await worker(item)
+                    succeeded.append(item)
+                    break
+                except Exception as e:
+                    # Rate limited: pause the shared bucket and retry
+                    if getattr(e, "status", None) == 429 and attempt < retries:
+                        if limiter:
+                            limiter.penalize(getattr(e, "retry_after", None) or 1.0)
+                        continue
+                    failed.append((item, e))
+                    break
+
+            done += 1
+            if on_progress:
+                try:
+                    await on_progress(done, len(items))
+                except Exception as e:
+                    print(f"❌ Progress callback failed: {e}")
+
+    await asyncio.gather(*(run_worker() for _ in range(max(1, min(concurrency, len(items))))))
+    return succeeded, failed
\ No newline at end of file